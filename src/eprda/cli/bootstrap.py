@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from eprda.config.config import Config, load_config
+from eprda.logging import start_run
+from eprda.ui.routing import configure_routing
+from eprda.ui.timeouts import configure_timeouts
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+
+def bootstrap(env: str, run_log: bool = True) -> Config:
+    """
+    Shared start-up for the browser CLIs: load the `env` profile's config and
+    secrets, apply its routing and timeout settings and, with `run_log`, start
+    a run whose JSON spans go to output/spans_<run_id>.jsonl (see
+    current_run_id()). Data-setup entry points pass run_log=False because
+    run_dp_data_setup starts the run itself, possibly resuming an earlier one.
+    """
+    config = load_config(env)
+    configure_routing(config.env)
+    configure_timeouts(config.env)
+    if run_log:
+        start_run(OUTPUT_DIR)
+    return config
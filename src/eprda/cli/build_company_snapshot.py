@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+
+from eprda.clients.company_snapshot import (
+    SNAPSHOT_DIR,
+    CompanySnapshotSource,
+    build_snapshot_index,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Index the Companies House bulk company CSV for offline enrolment.",
+    )
+    parser.add_argument(
+        "--csv", required=True,
+        help="BasicCompanyDataAsOneFile-YYYY-MM-DD.csv (unzipped)",
+    )
+    parser.add_argument("--out", default=str(SNAPSHOT_DIR), help="Index directory")
+    args = parser.parse_args()
+
+    index_dir = build_snapshot_index(args.csv, args.out)
+    source = CompanySnapshotSource(index_dir, status=None, company_type=None)
+    print(f"✅ Indexed {len(source)} companies into {index_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from eprda.utils.org_pom_consistency import check_org_pom_consistency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check a POM file against its ORG file before uploading either.",
+    )
+    parser.add_argument("--org", required=True, help="ORG (registration) CSV")
+    parser.add_argument("--pom", required=True, help="POM (packaging data) CSV")
+    parser.add_argument(
+        "--period", default=None,
+        help="Expected submission_period (default: the POM file's first row)",
+    )
+    parser.add_argument(
+        "--max-errors", type=int, default=50,
+        help="Row-level errors to list",
+    )
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    report = check_org_pom_consistency(
+        args.org, args.pom, submission_period=args.period, max_errors=args.max_errors
+    )
+    elapsed = time.monotonic() - started
+
+    summary = (
+        f"{report.org_rows} ORG rows, {report.pom_rows} POM rows, "
+        f"{report.unreported} ORG entries without POM data ({elapsed:.2f}s)"
+    )
+    if report.ok:
+        print(f"✅ Consistent: {summary}")
+        return
+    print(f"❌ {report.total} issue(s): {summary}")
+    for error in report.errors:
+        print(f"  {error}")
+    if report.total > len(report.errors):
+        print(f"  ... and {report.total - len(report.errors)} more")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,89 @@ import argparse
 from pathlib import Path
 
 from eprda.utils.csv_factory import create_csv_from_template, TEMPLATES_DIR, OUTPUT_DIR
+from eprda.utils.batch_files import generate_files, org_and_pom_jobs, write_manifest
+from eprda.utils.results_file import successful_records
+from eprda.utils.org_generator import ParentOrg, hierarchy_paths, write_org_hierarchy
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate an ORG CSV from the template.")
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--org-id",
-        required=True,
         help="Organisation ID to populate (e.g., ORG-1001)",
     )
+    target.add_argument(
+        "--from", dest="from_results", metavar="RESULTS_JSONL",
+        help="One ORG file per enrolled org in a batch results file",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="With --from: worker processes (default CPU count)",
+    )
+    parser.add_argument(
+        "--organisation-name", default="AUTOMATION PARENT LTD",
+        help="Parent name (with --subsidiaries)",
+    )
+    parser.add_argument(
+        "--companies-house-number", default=None,
+        help="Parent company number (default keeps the template's)",
+    )
+    parser.add_argument(
+        "--subsidiaries", type=int, default=0, metavar="WIDTH",
+        help="Subsidiaries per organisation at each level",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=1,
+        help="Levels of subsidiaries under the parent",
+    )
+    parser.add_argument(
+        "--parents", type=int, default=1,
+        help="Parents to generate, with consecutive ids from --org-id (numeric)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Same seed gives the same subsidiaries",
+    )
     args = parser.parse_args()
 
+    if args.from_results:
+        records = successful_records(args.from_results)
+        jobs = org_and_pom_jobs(records, kinds=("org",))
+        manifest = generate_files(jobs, workers=args.workers)
+        stem = Path(args.from_results).stem
+        manifest_path = write_manifest(
+            manifest, OUTPUT_DIR / f"{stem}_org_manifest.json"
+        )
+        print(
+            f"✅ {len(manifest)} ORG CSVs created; "
+            f"manifest: {manifest_path.resolve()}"
+        )
+        return
+
+    if args.subsidiaries or args.parents > 1:
+        first = int(args.org_id) if args.parents > 1 else None
+        name = args.organisation_name
+        parents = [
+            ParentOrg(
+                organisation_id=str(first + i) if first is not None else args.org_id,
+                organisation_name=name if args.parents == 1 else f"{name} {i + 1}",
+                companies_house_number=args.companies_house_number,
+            )
+            for i in range(args.parents)
+        ]
+        shape = f"x{args.parents}_{args.subsidiaries}w{args.depth}d"
+        output = OUTPUT_DIR / f"org_{args.org_id}_{shape}.csv"
+        written = write_org_hierarchy(
+            output, parents, args.subsidiaries, args.depth, seed=args.seed
+        )
+        subs = len(hierarchy_paths(args.subsidiaries, args.depth))
+        print(
+            f"✅ ORG CSV created: {written.resolve()} "
+            f"({len(parents)} parents x {subs} subsidiaries)"
+        )
+        return
+
     template = TEMPLATES_DIR / "org-file-template.csv"   # keep your template here
     output = OUTPUT_DIR / f"org_{args.org_id}.csv"      # generated file
 
@@ -24,7 +96,9 @@ def main() -> None:
         }
     ]
 
-    written = create_csv_from_template(template_csv=template, output_csv=output, rows=rows)
+    written = create_csv_from_template(
+        template_csv=template, output_csv=output, rows=rows, cache=True
+    )
     print(f"✅ ORG CSV created: {written.resolve()}")
 
 
@@ -4,17 +4,71 @@ import argparse
 from pathlib import Path
 
 from eprda.utils.csv_factory import create_csv_from_template, TEMPLATES_DIR, OUTPUT_DIR
+from eprda.utils.batch_files import generate_files, org_and_pom_jobs, write_manifest
+from eprda.utils.results_file import successful_records
+from eprda.utils.pom_generator import sequential_org_ids, write_pom_dataset
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate a POM CSV from the template.")
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--org-id",
-        required=True,
         help="Organisation ID to populate (e.g., ORG-1001)",
     )
+    target.add_argument(
+        "--orgs",
+        type=int,
+        help="Generate a synthetic load-test file for this many orgs",
+    )
+    target.add_argument(
+        "--from", dest="from_results", metavar="RESULTS_JSONL",
+        help="One POM file per enrolled org in a batch results file",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="With --from: worker processes (default CPU count)",
+    )
+    parser.add_argument(
+        "--rows-per-org", type=int, default=20,
+        help="Synthetic mode: distinct POM lines per org",
+    )
+    parser.add_argument(
+        "--start-org-id", type=int, default=100000,
+        help="Synthetic mode: first organisation id",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Synthetic mode: same seed gives the same file",
+    )
     args = parser.parse_args()
 
+    if args.from_results:
+        records = successful_records(args.from_results)
+        jobs = org_and_pom_jobs(records, kinds=("pom",))
+        manifest = generate_files(jobs, workers=args.workers)
+        stem = Path(args.from_results).stem
+        manifest_path = write_manifest(
+            manifest, OUTPUT_DIR / f"{stem}_pom_manifest.json"
+        )
+        print(
+            f"✅ {len(manifest)} POM CSVs created; "
+            f"manifest: {manifest_path.resolve()}"
+        )
+        return
+
+    if args.orgs:
+        name = f"pom_synthetic_{args.orgs}x{args.rows_per_org}_seed{args.seed}.csv"
+        output = OUTPUT_DIR / name
+        row_count = write_pom_dataset(
+            output,
+            sequential_org_ids(args.orgs, args.start_org_id),
+            rows_per_org=args.rows_per_org,
+            seed=args.seed,
+        )
+        print(f"✅ POM CSV created: {output.resolve()} ({row_count} rows)")
+        return
+
     template = TEMPLATES_DIR / "pom-file-template.csv"   # keep your template here
     output = OUTPUT_DIR / f"pom_{args.org_id}.csv"      # generated file
 
@@ -24,7 +78,9 @@ def main() -> None:
         }
     ]
 
-    written = create_csv_from_template(template_csv=template, output_csv=output, rows=rows)
+    written = create_csv_from_template(
+        template_csv=template, output_csv=output, rows=rows, cache=True
+    )
     print(f"✅ POM CSV created: {written.resolve()}")
 
 
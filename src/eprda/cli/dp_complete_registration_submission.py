@@ -1,6 +1,7 @@
 import argparse
 import asyncio
-from eprda.config.config import load_config
+from eprda.cli.bootstrap import bootstrap
+from eprda.ui.session_cache import SessionCache
 from eprda.flows.dp_registration_submission_flow import dp_complete_registration_submission_flow, dp_submit_registration_data_flow, regulator_accept_registration_submission
 
 
@@ -10,8 +11,8 @@ async def main():
     args = parser.parse_args()
 
     # Load all config/secrets
-    config = load_config(args.env)
-    await dp_complete_registration_submission_flow(config.env.PRODUCER_BASE_URL, args.email, "Password123")   
+    config = bootstrap(args.env)
+    await dp_complete_registration_submission_flow(config.env.PRODUCER_BASE_URL, args.email, "Password123", sessions=SessionCache(config.profile))   
                                                    
 if __name__ == "__main__":
     asyncio.run(main())
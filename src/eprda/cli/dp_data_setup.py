@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from eprda.cli.bootstrap import bootstrap
+from eprda.clients.company_sources import build_company_source
+from eprda.clients.notifications_client import NotificationsClient, NotificationsConfig
+from eprda.flows.dp_data_setup_flow import STAGE_DEPENDENCIES, run_dp_data_setup
+
+
+def _stage_limit(value: str) -> tuple[str, int]:
+    stage, _, n = value.partition("=")
+    if stage not in STAGE_DEPENDENCIES or not n.isdigit():
+        raise argparse.ArgumentTypeError(
+            f"expected <stage>=<n> with stage in {list(STAGE_DEPENDENCIES)}, "
+            f"got {value!r}"
+        )
+    return stage, int(n)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the direct producer data setup pipeline for many orgs.",
+    )
+    parser.add_argument(
+        "--env", default="dev15",
+        help=(
+            "ENV_PROFILE; use Environment profile (dev15/tst1), defaults to 'dev15' "
+            "if not provided"
+        ),
+    )
+    parser.add_argument(
+        "--count", type=int, default=1,
+        help="Number of organisations to set up",
+    )
+    parser.add_argument(
+        "--stages", default=",".join(STAGE_DEPENDENCIES),
+        help="Comma separated stages to run (dependencies are added automatically)",
+    )
+    parser.add_argument(
+        "--concurrency", type=_stage_limit, action="append", default=[],
+        help="Per-stage limit, e.g. --concurrency enrol=8 (repeatable)",
+    )
+    parser.add_argument(
+        "--browsers", type=int, default=2,
+        help="Browser processes shared by all stages",
+    )
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument(
+        "--results", default=None,
+        help="JSONL results file (default output/data_setup_<run_id>.jsonl)",
+    )
+    parser.add_argument(
+        "--resume", default=None, metavar="RUN_ID",
+        help="Continue a previous run from each org's first incomplete stage",
+    )
+    args = parser.parse_args()
+
+    # Load all config/secrets
+    config = bootstrap(args.env, run_log=False)
+
+    # Build DI clients from secrets
+    # Company numbers come from the local pool, refilled from the stream API
+    # or an offline snapshot (COMPANY_SOURCE)
+    ch_client = build_company_source(config)
+
+    notifications_client = NotificationsClient(
+        NotificationsConfig(
+            issuer=config.secrets.ISSUER,
+            secret=config.secrets.SECRET,
+            api_base_url="https://api.notifications.service.gov.uk",
+            endpoint="v2/notifications",
+        )
+    )
+
+    try:
+        await run_dp_data_setup(
+            config,
+            ch=ch_client,
+            notifications=notifications_client,
+            stage_names=[s.strip() for s in args.stages.split(",") if s.strip()],
+            count=args.count,
+            concurrency=dict(args.concurrency),
+            browsers=args.browsers,
+            headed=args.headed,
+            resume_run_id=args.resume,
+            results_path=args.results,
+        )
+    finally:
+        await notifications_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,29 +3,65 @@ from __future__ import annotations
 import argparse
 import asyncio
 
-from eprda.config.config import load_config
-from eprda.utils.file_util import rand_suffix  # keep your existing utility
+from eprda.cli.bootstrap import bootstrap
+from eprda.clients.company_sources import build_company_source
+from eprda.clients.notifications_client import NotificationsClient, NotificationsConfig
+from eprda.flows.dp_batch_enrolment_flow import run_dp_batch_enrolment
 from eprda.flows.dp_enrolment_flow import (
     create_dp_enrolment_flow,
     regulator_accept_approved_person,
+    regulator_accept_approved_persons,
 )
-from eprda.clients.companies_house import CompaniesHouseClient, CompaniesHouseConfig
-from eprda.clients.notifications_client import NotificationsClient, NotificationsConfig
+from eprda.logging import current_run_id
+from eprda.tracing import stats as step_stats
+from eprda.ui.browser import BrowserPool
+from eprda.ui.session_cache import SessionCache
+from eprda.utils.csv_factory import OUTPUT_DIR
+from eprda.utils.file_util import rand_suffix  # keep your existing utility
 
 
 async def main() -> None:
   
     parser = argparse.ArgumentParser(description="Create an enrolment via UI and return enrolment result.")
     parser.add_argument("--env", default="dev15", help="ENV_PROFILE; use Environment profile (dev15/tst1), defaults to 'dev15' if not provided")
-    args = parser.parse_args()    
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1,
+        help="Number of producers to enrol (batch mode when > 1)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Batch mode: max enrolments in flight",
+    )
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=1,
+        help="Batch mode: browser processes shared by all contexts",
+    )
+    parser.add_argument(
+        "--headed", action="store_true", help="Batch mode: show the browsers"
+    )
+    parser.add_argument(
+        "--results",
+        default=None,
+        help=(
+            "Batch mode: JSONL results file "
+            "(default output/enrolments_<run_id>.jsonl)"
+        ),
+    )
+    args = parser.parse_args()
 
     # Load all config/secrets
-    config = load_config(args.env)
+    config = bootstrap(args.env)
 
     # Build DI clients from secrets
-    ch_client = CompaniesHouseClient(
-        CompaniesHouseConfig(api_token=config.secrets.COMPANY_HOUSE_TOKEN)
-    )
+    # Company numbers come from the local pool, refilled from the stream API or
+    # an offline snapshot (COMPANY_SOURCE)
+    ch_client = build_company_source(config)
 
     notifications_client = NotificationsClient(
         NotificationsConfig(
@@ -36,25 +72,59 @@ async def main() -> None:
         )
     )
 
-    email = f"Automation+{rand_suffix()}@example.test"
+    sessions = SessionCache(config.profile)
 
-    # Run the flow
-    result = await create_dp_enrolment_flow(
-        producer_base_url=config.env.PRODUCER_BASE_URL,
-        email=email,
-        ch=ch_client,
-        notifications=notifications_client,
-    )
+    try:
+        if args.count > 1:
+            run_id = current_run_id()
+            results_path = args.results or OUTPUT_DIR / f"enrolments_{run_id}.jsonl"
+            async with BrowserPool(size=args.browsers, headed=args.headed) as pool:
+                outcomes = await run_dp_batch_enrolment(
+                    producer_base_url=config.env.PRODUCER_BASE_URL,
+                    ch=ch_client,
+                    notifications=notifications_client,
+                    pool=pool,
+                    count=args.count,
+                    concurrency=args.concurrency,
+                    results_path=results_path,
+                )
+                # Regulator acceptance for the whole batch in one signed-in session
+                enrolled = [o.company_name for o in outcomes if o.status == "ok"]
+                if enrolled:
+                    async with pool.page() as page:
+                        await regulator_accept_approved_persons(
+                            regulator_base_url=config.env.REGULATOR_BASE_URL,
+                            email=config.env.REGULATOR_EMAIL,
+                            password=config.env.REGULATOR_PASSWORD,
+                            company_names=enrolled,
+                            page=page,
+                            sessions=sessions,
+                        )
+            print(step_stats.table(run_id))
+            return
 
-    # Regulator acceptance
-    await regulator_accept_approved_person(
-        regulator_base_url=config.env.REGULATOR_BASE_URL,
-        email=config.env.REGULATOR_EMAIL,
-        password=config.env.REGULATOR_PASSWORD,
-        company_name=result.company_name,
-    )
+        email = f"Automation+{rand_suffix()}@example.test"
+
+        # Run the flow
+        result = await create_dp_enrolment_flow(
+            producer_base_url=config.env.PRODUCER_BASE_URL,
+            email=email,
+            ch=ch_client,
+            notifications=notifications_client,
+        )
+
+        # Regulator acceptance
+        await regulator_accept_approved_person(
+            regulator_base_url=config.env.REGULATOR_BASE_URL,
+            email=config.env.REGULATOR_EMAIL,
+            password=config.env.REGULATOR_PASSWORD,
+            company_name=result.company_name,
+            sessions=sessions,
+        )
 
-    print("Enrolment completed:", result)
+        print("Enrolment completed:", result)
+    finally:
+        await notifications_client.aclose()
 
 
 if __name__ == "__main__":
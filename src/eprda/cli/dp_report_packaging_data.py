@@ -1,24 +1,22 @@
 import argparse
 import asyncio
-from eprda.clients.companies_house import CompaniesHouseClient, CompaniesHouseConfig
+from eprda.cli.bootstrap import bootstrap
+from eprda.clients.company_sources import build_company_source
 from eprda.clients.notifications_client import NotificationsClient, NotificationsConfig
-from eprda.config.config import load_config
-from eprda.utils.file_util import rand_suffix
-from src.eprda.flows.dp_enrolment_flow import create_dp_enrolment_flow, regulator_accept_approved_person
-from src.eprda.flows.dp_report_packaging_data_flow import dp_report_packaging_data_flow
+from eprda.flows.dp_data_setup_flow import run_dp_data_setup
 
 async def main():
     parser = argparse.ArgumentParser(description="Create an enrolment via UI and return enrolment result.")
     parser.add_argument("--env", default="dev15", help="ENV_PROFILE; use Environment profile (dev15/tst1), defaults to 'dev15' if not provided")
+    parser.add_argument("--resume", default=None, metavar="RUN_ID", help="Continue a failed run without enrolling a new org")
     args = parser.parse_args()    
 
     # Load all config/secrets
-    config = load_config(args.env)    
+    config = bootstrap(args.env, run_log=False)
 
     # Build DI clients from secrets
-    ch_client = CompaniesHouseClient(
-        CompaniesHouseConfig(api_token=config.secrets.COMPANY_HOUSE_TOKEN)
-    )
+    # Company numbers come from the local pool, refilled from the stream API or an offline snapshot (COMPANY_SOURCE)
+    ch_client = build_company_source(config)
 
     notifications_client = NotificationsClient(
         NotificationsConfig(
@@ -29,25 +27,18 @@ async def main():
         )
     )
 
-    email = f"Automation+{rand_suffix()}@example.test"
-
-    # Run the flow
-    result = await create_dp_enrolment_flow(
-        producer_base_url=config.env.PRODUCER_BASE_URL,
-        email=email,
-        ch=ch_client,
-        notifications=notifications_client,
-    )
-
-    # Regulator acceptance
-    await regulator_accept_approved_person(
-        regulator_base_url=config.env.REGULATOR_BASE_URL,
-        email=config.env.REGULATOR_EMAIL,
-        password=config.env.REGULATOR_PASSWORD,
-        company_name=result.company_name,
-    )
-
-    await dp_report_packaging_data_flow(config.env.PRODUCER_BASE_URL, result.email, "Password123", result.organisation_id)
+    # enrol -> regulator acceptance -> report packaging data, checkpointed per stage
+    try:
+        await run_dp_data_setup(
+            config,
+            ch=ch_client,
+            notifications=notifications_client,
+            stage_names=["pom"],
+            headed=True,
+            resume_run_id=args.resume,
+        )
+    finally:
+        await notifications_client.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
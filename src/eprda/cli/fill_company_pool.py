@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+
+from eprda.clients.company_sources import build_company_source
+from eprda.config.config import load_config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Pre-fill the local company-number pool.",
+    )
+    parser.add_argument(
+        "--env", default="dev15",
+        help=(
+            "ENV_PROFILE; use Environment profile (dev15/tst1), defaults to 'dev15' "
+            "if not provided"
+        ),
+    )
+    parser.add_argument(
+        "--count", type=int, default=5000,
+        help="Companies to add to the pool",
+    )
+    parser.add_argument(
+        "--source", choices=["stream", "snapshot"], default=None,
+        help="Where to read companies from (default COMPANY_SOURCE or 'stream')",
+    )
+    args = parser.parse_args()
+
+    config = load_config(args.env)
+    pool = build_company_source(config, args.source)
+    try:
+        added = pool.fill(args.count)
+        print(
+            f"✅ Added {added} companies to {pool.path}; "
+            f"{pool.available()} unused for {config.profile}"
+        )
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
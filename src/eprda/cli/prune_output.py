@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+
+from eprda.utils.csv_factory import OUTPUT_DIR
+from eprda.utils.output_cache import prune_output_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Evict old generated files and screenshots from the output directory."
+        ),
+    )
+    parser.add_argument(
+        "--max-mb", type=float, default=None,
+        help="Size budget (default EPRDA_OUTPUT_MAX_MB)",
+    )
+    parser.add_argument(
+        "--max-age-days", type=float, default=None,
+        help="Age budget (default EPRDA_OUTPUT_MAX_AGE_DAYS)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Only report what would be removed",
+    )
+    args = parser.parse_args()
+
+    result = prune_output_dir(
+        OUTPUT_DIR,
+        max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None,
+        max_age_s=args.max_age_days * 86400 if args.max_age_days is not None else None,
+        dry_run=args.dry_run,
+    )
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(
+        f"🧹 {verb} {result.removed} files ({result.freed_bytes / 1e6:.1f} MB); "
+        f"kept {result.kept} ({result.kept_bytes / 1e6:.1f} MB) in {OUTPUT_DIR}"
+    )
+
+
+if __name__ == "__main__":
+    main()
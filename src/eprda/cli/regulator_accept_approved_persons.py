@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from eprda.cli.bootstrap import bootstrap
+from eprda.flows.dp_enrolment_flow import regulator_accept_approved_persons
+from eprda.ui.browser import open_page
+from eprda.ui.session_cache import SessionCache
+from eprda.utils.results_file import append_jsonl, successful_records
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Accept approved persons for many organisations in one regulator session."
+        ),
+    )
+    parser.add_argument(
+        "--env", default="dev15",
+        help=(
+            "ENV_PROFILE; use Environment profile (dev15/tst1), defaults to 'dev15' "
+            "if not provided"
+        ),
+    )
+    parser.add_argument(
+        "--company_name", action="append", default=[],
+        help="Company name to accept (repeatable)",
+    )
+    parser.add_argument(
+        "--from", dest="from_file", default=None,
+        help="dp_enrolment batch results (JSONL); accepts every successful org",
+    )
+    parser.add_argument(
+        "--match", default=None,
+        help="Accept every application matching this search text, page by page",
+    )
+    parser.add_argument(
+        "--results", default=None,
+        help="Optional JSONL file for per-org outcomes",
+    )
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    args = parser.parse_args()
+
+    company_names = list(args.company_name)
+    if args.from_file:
+        company_names += [r["company_name"] for r in successful_records(args.from_file)]
+    if not company_names and not args.match:
+        parser.error("pass --company_name, --from or --match")
+    if company_names and args.match:
+        parser.error("--match cannot be combined with --company_name or --from")
+
+    # Load all config/secrets
+    config = bootstrap(args.env)
+
+    started = time.monotonic()
+    async with open_page(headed=args.headed) as page:
+        outcomes = await regulator_accept_approved_persons(
+            regulator_base_url=config.env.REGULATOR_BASE_URL,
+            email=config.env.REGULATOR_EMAIL,
+            password=config.env.REGULATOR_PASSWORD,
+            company_names=company_names or None,
+            match=args.match,
+            page=page,
+            sessions=SessionCache(config.profile),
+        )
+    elapsed = time.monotonic() - started
+
+    if args.results:
+        for outcome in outcomes:
+            append_jsonl(args.results, outcome)
+
+    ok = sum(1 for o in outcomes if o.status == "ok")
+    print(f"📊 Accepted {ok}/{len(outcomes)} approved persons in {elapsed:.1f}s")
+    for o in outcomes:
+        error = f"  ({o.error})" if o.error else ""
+        print(f"  {o.status:<7} {o.duration_s:>6.1f}s  {o.company_name}{error}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
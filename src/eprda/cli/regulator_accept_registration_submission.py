@@ -1,6 +1,7 @@
 import argparse
 import asyncio
-from eprda.config.config import load_config
+from eprda.cli.bootstrap import bootstrap
+from eprda.ui.session_cache import SessionCache
 from eprda.flows.dp_registration_submission_flow import regulator_accept_registration_submission
 
 
@@ -14,9 +15,9 @@ async def main():
     args = parser.parse_args()
     
     # Load all config/secrets
-    config = load_config(args.env)
+    config = bootstrap(args.env)
 
-    await regulator_accept_registration_submission(config.env.REGULATOR_BASE_URL, config.env.REGULATOR_EMAIL, config.env.REGULATOR_PASSWORD, args.company_name)
+    await regulator_accept_registration_submission(config.env.REGULATOR_BASE_URL, config.env.REGULATOR_EMAIL, config.env.REGULATOR_PASSWORD, args.company_name, sessions=SessionCache(config.profile))
 
 if __name__ == "__main__":
     asyncio.run(main())
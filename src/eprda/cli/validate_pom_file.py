@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from eprda.utils.pom_validator import validate_pom_file
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Check a POM CSV against the portal's upload rules before uploading it."
+        ),
+    )
+    parser.add_argument("path", nargs="+", help="POM CSV file(s)")
+    parser.add_argument(
+        "--max-errors", type=int, default=50,
+        help="Row-level errors to list per file",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.path:
+        started = time.monotonic()
+        errors, total = validate_pom_file(path, max_errors=args.max_errors)
+        elapsed_ms = (time.monotonic() - started) * 1000
+        if not total:
+            print(f"✅ {path}: valid ({elapsed_ms:.0f} ms)")
+            continue
+        failed = True
+        print(f"❌ {path}: {total} error(s) ({elapsed_ms:.0f} ms)")
+        for error in errors:
+            print(f"  {error}")
+        if total > len(errors):
+            print(f"  ... and {total - len(errors)} more")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
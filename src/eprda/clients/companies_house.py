@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Optional, Protocol
 import json
 import requests
 
@@ -13,6 +13,14 @@ class CompaniesHouseConfig:
     def auth_header(self) -> str:
         return f"Basic {self.api_token}"
 
+class CompanySource(Protocol):
+    """
+    Anything that hands out {"company_number", "company_name"} dicts
+    (CompaniesHouseClient, CompanyNumberPool, CompanySnapshotSource).
+    """
+
+    def fetch_companies(self, max_records: int = 10) -> list[Dict[str, str]]: ...
+
 class CompaniesHouseClient:
     def __init__(self, cfg: CompaniesHouseConfig, session: Optional[requests.Session] = None):
         self._cfg = cfg
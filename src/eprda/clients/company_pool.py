@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from eprda.clients.companies_house import CompanySource
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+COMPANY_POOL_DB = OUTPUT_DIR / "company_pool.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    company_number TEXT PRIMARY KEY,
+    company_name   TEXT NOT NULL,
+    added_at       REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS company_usage (
+    profile        TEXT NOT NULL,
+    company_number TEXT NOT NULL,
+    state          TEXT NOT NULL,   -- leased | used
+    owner          TEXT,
+    updated_at     REAL NOT NULL,
+    PRIMARY KEY (profile, company_number)
+);
+"""
+
+
+class CompanyNumberPool:
+    """
+    Local pool of Companies House company numbers, shared by every run on this machine.
+
+    `fill()` reads the streaming API once and stores thousands of
+    company_number/company_name pairs. `lease()` then hands out numbers under
+    an exclusive SQLite write lock, so parallel processes never get the same
+    company, and `mark_used()` retires them for the environment profile
+    (a number used on dev15 can still be handed out on tst1).
+
+    `fetch_companies()` matches CompaniesHouseClient, so the pool can be passed
+    wherever a `ch` client is expected: it leases numbers and only calls
+    Companies House (via `ch`) when the pool runs dry. Callers settle each
+    lease with `settle_companies()` once they know whether the enrolment
+    worked; unsettled leases expire after lease_ttl_s. A lease can only be
+    released by its owner (this process by default), so a run whose lease
+    expired and was handed to someone else cannot free it again.
+    """
+
+    def __init__(
+        self,
+        profile: str,
+        ch: Optional[CompanySource] = None,
+        path: str | Path = COMPANY_POOL_DB,
+        refill: int = 1000,
+        lease_ttl_s: int = 3600,
+        owner: Optional[str] = None,
+    ):
+        self.profile = profile
+        self.owner = owner or f"pid:{os.getpid()}"
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._ch = ch
+        self._refill = refill
+        self._lease_ttl_s = lease_ttl_s
+        # autocommit mode; write transactions are opened explicitly with
+        # BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        # the connection is shared with asyncio.to_thread workers; one write
+        # transaction at a time
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ---------- filling ----------
+    def add(self, companies: Iterable[Dict[str, str]]) -> int:
+        """Store company_number/company_name pairs; returns how many were new."""
+        now = time.time()
+        rows = [(c["company_number"], c["company_name"], now) for c in companies]
+        with self._write():
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO companies"
+                " (company_number, company_name, added_at) VALUES (?, ?, ?)",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def fill(self, count: int, ch: Optional[CompanySource] = None) -> int:
+        """
+        Read up to `count` companies from the upstream source (one stream read
+        or snapshot picks) into the pool.
+        """
+        ch = ch or self._ch
+        if ch is None:
+            raise RuntimeError("CompanyNumberPool needs a company source to fill from")
+        return self.add(ch.fetch_companies(max_records=count))
+
+    def available(self) -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM companies c WHERE NOT EXISTS ("
+            " SELECT 1 FROM company_usage u"
+            " WHERE u.profile = ? AND u.company_number = c.company_number"
+            " AND (u.state = 'used' OR u.updated_at > ?))",
+            (self.profile, time.time() - self._lease_ttl_s),
+        ).fetchone()
+        return row[0]
+
+    # ---------- leasing ----------
+    def lease(
+        self,
+        count: int = 1,
+        owner: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Exclusively lease up to `count` unused companies for this profile.
+        Leases older than lease_ttl_s (a crashed run) become available again.
+        """
+        owner = owner or self.owner
+        now = time.time()
+        with self._write():
+            rows = self._conn.execute(
+                "SELECT c.company_number, c.company_name FROM companies c"
+                " LEFT JOIN company_usage u"
+                " ON u.company_number = c.company_number AND u.profile = ?"
+                " WHERE u.company_number IS NULL"
+                " OR (u.state = 'leased' AND u.updated_at <= ?)"
+                " ORDER BY c.added_at LIMIT ?",
+                (self.profile, now - self._lease_ttl_s, count),
+            ).fetchall()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO company_usage"
+                " (profile, company_number, state, owner, updated_at)"
+                " VALUES (?, ?, 'leased', ?, ?)",
+                [(self.profile, r["company_number"], owner, now) for r in rows],
+            )
+        return [
+            {"company_number": r["company_number"], "company_name": r["company_name"]}
+            for r in rows
+        ]
+
+    def mark_used(self, company_numbers: Iterable[str]) -> None:
+        with self._write():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO company_usage"
+                " (profile, company_number, state, owner, updated_at)"
+                " VALUES (?, ?, 'used', NULL, ?)",
+                [(self.profile, n, time.time()) for n in company_numbers],
+            )
+
+    def release(
+        self,
+        company_numbers: Iterable[str],
+        owner: Optional[str] = None,
+    ) -> None:
+        """Return numbers leased (not used) by `owner` to the pool."""
+        owner = owner or self.owner
+        with self._write():
+            self._conn.executemany(
+                "DELETE FROM company_usage"
+                " WHERE profile = ? AND company_number = ?"
+                " AND state = 'leased' AND owner = ?",
+                [(self.profile, n, owner) for n in company_numbers],
+            )
+
+    def _write(self) -> "_Transaction":
+        return _Transaction(self._conn, self._lock)
+
+    # ---------- CompaniesHouseClient compatible ----------
+    def fetch_companies(self, max_records: int = 10) -> list[Dict[str, str]]:
+        """
+        Lease `max_records` companies, topping the pool up from Companies House
+        first if it cannot cover the request. They stay leased until
+        `mark_used()` / `release()` (see settle_companies) or the lease expires.
+        """
+        companies = self.lease(max_records)
+        if len(companies) < max_records and self._ch is not None:
+            self.fill(max(self._refill, max_records - len(companies)))
+            companies += self.lease(max_records - len(companies))
+        if len(companies) < max_records:
+            self.release(c["company_number"] for c in companies)
+            raise RuntimeError(
+                f"Company pool {self.path} has only {len(companies)} unused "
+                f"companies for {self.profile!r}; "
+                f"run `python -m eprda.cli.fill_company_pool`"
+            )
+        return companies
+
+
+def settle_companies(
+    ch: CompanySource,
+    company_numbers: Iterable[str],
+    used: bool,
+) -> None:
+    """
+    Retire leased company numbers once their enrolment succeeded (`used=True`)
+    or hand them back to the pool after a failure. A no-op for sources without
+    leases (CompaniesHouseClient, CompanySnapshotSource). Blocking: async
+    callers run it with asyncio.to_thread.
+    """
+    if isinstance(ch, CompanyNumberPool):
+        numbers = list(company_numbers)
+        if used:
+            ch.mark_used(numbers)
+        else:
+            ch.release(numbers)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK for a connection in autocommit mode."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+SNAPSHOT_DIR = OUTPUT_DIR / "companies_snapshot"
+
+# Columns we keep from BasicCompanyDataAsOneFile-YYYY-MM-DD.csv
+# (headers have stray spaces)
+_NAME = "CompanyName"
+_NUMBER = "CompanyNumber"
+_STATUS = "CompanyStatus"
+_CATEGORY = "CompanyCategory"
+_SIC = [f"SICCode.SicText_{i}" for i in range(1, 5)]
+_WANTED = {_NAME, _NUMBER, _STATUS, _CATEGORY, *_SIC}
+
+# One fixed-width file per column, so filters only touch the columns they need
+_COLUMNS = {
+    "number": "S8",
+    "name_offset": "u8",
+    "name_length": "u2",
+    "status": "u1",
+    "category": "u1",
+    "sic": "u4",  # 4 SIC codes per row, row-major
+}
+
+
+def _encode_codes(values: pd.Series, vocab: List[str]) -> np.ndarray:
+    # vocab grows across chunks in first-seen order, so codes stay stable
+    values = values.fillna("").astype(str).str.strip()
+    known = set(vocab)
+    new = [v for v in pd.unique(values) if v not in known]
+    if len(vocab) + len(new) > 255:
+        at = new[255 - len(vocab)]
+        raise ValueError(f"Too many distinct values for a u1 column (at {at!r})")
+    vocab.extend(new)
+    return pd.Index(vocab).get_indexer(values).astype("u1")
+
+
+def _sic_codes(frame: pd.DataFrame) -> np.ndarray:
+    # "62020 - Information technology consultancy activities" -> 62020;
+    # "None Supplied" -> 0
+    cols = [
+        pd.to_numeric(
+            frame[c].astype(str).str.extract(r"^\s*(\d+)")[0], errors="coerce"
+        ).fillna(0)
+        for c in _SIC
+    ]
+    return np.stack([c.to_numpy(dtype="u4") for c in cols], axis=1)
+
+
+def build_snapshot_index(
+    csv_path: str | Path,
+    index_dir: str | Path = SNAPSHOT_DIR,
+    chunksize: int = 200_000,
+) -> Path:
+    """
+    Convert the Companies House bulk company CSV into a columnar on-disk index.
+
+    The CSV is streamed in chunks, so the multi-GB file is never held in
+    memory. Each column is appended to its own fixed-width .bin file, names go
+    to names.bin, and a sorted copy of the company numbers (with row ids) is
+    written for lookups. Status and category are stored as u1 codes whose
+    vocabularies live in meta.json.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    files = {name: open(index_dir / f"{name}.bin", "wb") for name in _COLUMNS}
+    names = open(index_dir / "names.bin", "wb")
+    vocab: Dict[str, List[str]] = {"status": [], "category": []}
+    rows = 0
+    name_offset = 0
+    try:
+        reader = pd.read_csv(
+            csv_path,
+            usecols=lambda c: c.strip() in _WANTED,
+            dtype=str,
+            chunksize=chunksize,
+            keep_default_na=False,
+        )
+        for chunk in reader:
+            chunk.columns = [c.strip() for c in chunk.columns]
+            encoded = [n.encode("utf-8")[:65535] for n in chunk[_NAME].str.strip()]
+            lengths = np.fromiter(
+                (len(n) for n in encoded), dtype="u2", count=len(encoded)
+            )
+            starts = np.concatenate(([0], np.cumsum(lengths, dtype="u8")[:-1]))
+            offsets = name_offset + starts.astype("u8")
+            names.write(b"".join(encoded))
+            name_offset += int(lengths.sum(dtype="u8"))
+
+            numbers = chunk[_NUMBER].str.strip().str.upper()
+            np.asarray(numbers, dtype="S8").tofile(files["number"])
+            offsets.tofile(files["name_offset"])
+            lengths.tofile(files["name_length"])
+            _encode_codes(chunk[_STATUS], vocab["status"]).tofile(files["status"])
+            _encode_codes(chunk[_CATEGORY], vocab["category"]).tofile(files["category"])
+            _sic_codes(chunk).tofile(files["sic"])
+            rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+        names.close()
+
+    numbers = np.memmap(index_dir / "number.bin", dtype="S8", mode="r", shape=(rows,))
+    order = np.argsort(numbers, kind="stable").astype("u4")
+    order.tofile(index_dir / "number_order.bin")
+    np.asarray(numbers[order]).tofile(index_dir / "number_sorted.bin")
+    del numbers
+
+    meta = {"rows": rows, "source": str(csv_path), "vocab": vocab}
+    (index_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return index_dir
+
+
+class CompanySnapshotSource:
+    """
+    Offline company source backed by an index from `build_snapshot_index`.
+
+    Every column is memory-mapped, so opening a 5M-row snapshot costs a few
+    page faults rather than a multi-GB read. Filters (status, SIC code,
+    company type) are applied once, as a vectorised scan over the relevant
+    u1/u4 columns, into an array of candidate row ids; random picks are then
+    an O(1) step of a lazy shuffle of those ids and `lookup()` is a binary
+    search over the sorted number column.
+
+    `fetch_companies()` matches CompaniesHouseClient, so it can be used
+    directly or to fill a CompanyNumberPool (which tracks used numbers).
+    """
+
+    def __init__(
+        self,
+        index_dir: str | Path = SNAPSHOT_DIR,
+        status: Optional[Sequence[str]] = ("Active",),
+        sic: Optional[Iterable[int]] = None,
+        company_type: Optional[Sequence[str]] = ("Private Limited Company",),
+        seed: Optional[int] = None,
+    ):
+        self.index_dir = Path(index_dir)
+        meta_path = self.index_dir / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(
+                f"No company snapshot index in {self.index_dir}; "
+                "run `python -m eprda.cli.build_company_snapshot`"
+            )
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        self._rows = meta["rows"]
+        self._vocab: Dict[str, List[str]] = meta["vocab"]
+        self._cols = {name: self._map(name, dtype) for name, dtype in _COLUMNS.items()}
+        self._names = np.memmap(self.index_dir / "names.bin", dtype="u1", mode="r")
+        self._sorted = self._map("number_sorted", "S8")
+        self._order = self._map("number_order", "u4")
+        self._rng = random.Random(seed)
+        # partial Fisher-Yates over candidate positions: positions below
+        # _picked are handed out, _swapped holds the moved ones
+        self._picked = 0
+        self._swapped: Dict[int, int] = {}
+        self._candidates = self._filter(status, sic, company_type)
+
+    def _map(self, name: str, dtype) -> np.memmap:
+        return np.memmap(self.index_dir / f"{name}.bin", dtype=dtype, mode="r")
+
+    def _codes(self, column: str, values: Sequence[str]) -> List[int]:
+        vocab = self._vocab[column]
+        unknown = [v for v in values if v not in vocab]
+        if unknown:
+            raise ValueError(f"Unknown {column} {unknown}; snapshot has {vocab}")
+        return [vocab.index(v) for v in values]
+
+    def _filter(self, status, sic, company_type) -> Optional[np.ndarray]:
+        mask: Optional[np.ndarray] = None
+
+        def narrow(m: np.ndarray) -> None:
+            nonlocal mask
+            mask = m if mask is None else mask & m
+
+        if status:
+            narrow(np.isin(self._cols["status"], self._codes("status", status)))
+        if company_type:
+            categories = self._codes("category", company_type)
+            narrow(np.isin(self._cols["category"], categories))
+        if sic:
+            narrow(np.isin(self._cols["sic"].reshape(-1, 4), list(sic)).any(axis=1))
+        if mask is None:
+            return None  # every row is a candidate
+        return np.flatnonzero(mask).astype("u4")
+
+    def __len__(self) -> int:
+        return self._rows if self._candidates is None else len(self._candidates)
+
+    def _record(self, row: int) -> Dict[str, str]:
+        offset = int(self._cols["name_offset"][row])
+        length = int(self._cols["name_length"][row])
+        return {
+            "company_number": self._cols["number"][row].decode("ascii"),
+            "company_name": bytes(self._names[offset:offset + length]).decode("utf-8"),
+        }
+
+    def lookup(self, company_number: str) -> Optional[Dict[str, str]]:
+        key = company_number.strip().upper().encode("ascii")
+        i = int(np.searchsorted(self._sorted, key))
+        if i < len(self._sorted) and self._sorted[i] == key:
+            return self._record(int(self._order[i]))
+        return None
+
+    def pick(self) -> Dict[str, str]:
+        """
+        One random company matching the filters, never the same row twice per
+        instance.
+        """
+        total = len(self)
+        if self._picked >= total:
+            raise RuntimeError("Company snapshot exhausted for the current filters")
+        # swap a random remaining position into slot _picked and take it
+        i = self._rng.randrange(self._picked, total)
+        head = self._swapped.pop(self._picked, self._picked)
+        position = head
+        if i != self._picked:
+            position = self._swapped.get(i, i)
+            self._swapped[i] = head
+        self._picked += 1
+        row = position if self._candidates is None else int(self._candidates[position])
+        return self._record(row)
+
+    def fetch_companies(self, max_records: int = 10) -> list[Dict[str, str]]:
+        remaining = len(self) - self._picked
+        return [self.pick() for _ in range(min(max_records, remaining))]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from eprda.clients.companies_house import (
+    CompaniesHouseClient,
+    CompaniesHouseConfig,
+    CompanySource,
+)
+from eprda.clients.company_pool import CompanyNumberPool
+from eprda.clients.company_snapshot import SNAPSHOT_DIR, CompanySnapshotSource
+from eprda.config.config import Config
+
+
+def build_company_source(
+    config: Config,
+    source: Optional[str] = None,
+) -> CompanyNumberPool:
+    """
+    Company numbers for enrolment: always a CompanyNumberPool (exclusive leases,
+    used numbers retired per profile), refilled from either
+
+      - "stream":   the Companies House streaming API (needs
+                    COMPANY_HOUSE_TOKEN), or
+      - "snapshot": an offline bulk-CSV index (see build_company_snapshot).
+
+    `source` defaults to the COMPANY_SOURCE env key, then "stream".
+    Snapshot filters come from COMPANY_SNAPSHOT_DIR / _STATUS / _TYPE / _SIC.
+    """
+    source = (source or config.env.get("COMPANY_SOURCE") or "stream").strip().lower()
+    upstream: CompanySource
+    if source == "stream":
+        token = config.secrets.COMPANY_HOUSE_TOKEN
+        if not token:
+            raise ValueError(
+                "COMPANY_HOUSE_TOKEN is not set; add it to the secrets "
+                "or use COMPANY_SOURCE=snapshot"
+            )
+        upstream = CompaniesHouseClient(CompaniesHouseConfig(api_token=token))
+    elif source == "snapshot":
+        sic = config.env.get("COMPANY_SNAPSHOT_SIC")
+        upstream = CompanySnapshotSource(
+            index_dir=config.env.get("COMPANY_SNAPSHOT_DIR") or SNAPSHOT_DIR,
+            status=_split(config.env.get("COMPANY_SNAPSHOT_STATUS", "Active")),
+            company_type=_split(
+                config.env.get("COMPANY_SNAPSHOT_TYPE", "Private Limited Company")
+            ),
+            sic=[int(s) for s in _split(sic)] if sic else None,
+        )
+    else:
+        raise ValueError(
+            f"Unknown company source {source!r}. Allowed: ['stream', 'snapshot']"
+        )
+    return CompanyNumberPool(config.profile, ch=upstream)
+
+
+def _split(raw: Optional[str]) -> list[str]:
+    return [v.strip() for v in (raw or "").split(",") if v.strip()]
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+import asyncio
 import time
+import httpx
 import jwt
-from playwright.async_api import async_playwright
 
 
 @dataclass(frozen=True)
@@ -21,6 +23,18 @@ class NotificationsConfig:
     endpoint: str = "v2/notifications"
     algorithm: str = "HS256"
     timeout_s: int = 30
+    # Notify rejects tokens whose iat is more than 30s old; re-sign a little earlier
+    jwt_ttl_s: int = 20
+    max_connections: int = 10
+    # polling for verification codes: first retry delay, backoff cap and
+    # tolerance for clock drift between this machine and Notify
+    poll_initial_s: float = 0.5
+    poll_max_s: float = 5.0
+    clock_skew_s: int = 5
+    # how many older_than pages a single lookup may walk back through
+    max_pages: int = 5
+    # notifications older than this are dropped from the per-email index
+    index_max_age_s: int = 600
 
     def build_jwt(self) -> str:
         payload = {"iss": self.issuer, "iat": int(time.time())}
@@ -29,40 +43,234 @@ class NotificationsConfig:
         return jwt.encode(payload, self.secret, algorithm=self.algorithm, headers=headers)
 
 
+def _parse_created_at(raw: str) -> Optional[datetime]:
+    # Notify timestamps look like 2024-05-01T10:15:30.123456Z
+    try:
+        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _matches(
+    notification: Dict[str, Any],
+    email: str,
+    cutoff: Optional[datetime],
+) -> bool:
+    if (notification.get("email_address") or "").lower() != email.lower():
+        return False
+    if cutoff is None:
+        return True
+    created = _parse_created_at(notification.get("created_at", ""))
+    return created is not None and created >= cutoff
+
+
+def _is_retryable(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
 class NotificationsClient:
     """
-    Minimal async client to fetch notifications and extract verification codes.
+    Async client to fetch notifications and extract verification codes.
+
+    Uses one keep-alive httpx.AsyncClient for its lifetime and reuses the
+    signed JWT while it is still valid. Close it with `aclose()` or use it as
+    an async context manager.
     """
 
-    def __init__(self, cfg: NotificationsConfig):
+    def __init__(
+        self,
+        cfg: NotificationsConfig,
+        http: Optional[httpx.AsyncClient] = None,
+    ):
         self._cfg = cfg
+        self._http = http
+        self._token: Optional[str] = None
+        self._token_issued_at = 0.0
+        # newest notification seen per (lower-cased) email address
+        self._by_email: Dict[str, Dict[str, Any]] = {}
+        self._watcher: Optional[InboxWatcher] = None
+
+    # ---------- lifecycle ----------
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self._cfg.api_base_url,
+                timeout=self._cfg.timeout_s,
+                limits=httpx.Limits(
+                    max_connections=self._cfg.max_connections,
+                    max_keepalive_connections=self._cfg.max_connections,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._watcher is not None:
+            await self._watcher.stop()
+            self._watcher = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def __aenter__(self) -> "NotificationsClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def _auth_header(self) -> str:
+        now = time.time()
+        if self._token is None or now - self._token_issued_at >= self._cfg.jwt_ttl_s:
+            self._token = self._cfg.build_jwt()
+            self._token_issued_at = now
+        return f"Bearer {self._token}"
+
+    # ---------- API ----------
+    async def list_notifications(
+        self,
+        template_type: Optional[str] = "email",
+        status: Optional[str] = None,
+        reference: Optional[str] = None,
+        older_than: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of `v2/notifications` (newest first), filtered server-side.
+        `older_than` is a notification id; pass the last id of a page to get the
+        next one.
+        """
+        params = {
+            k: v
+            for k, v in {
+                "template_type": template_type,
+                "status": status,
+                "reference": reference,
+                "older_than": older_than,
+            }.items()
+            if v
+        }
+        resp = await self._client().get(
+            self._cfg.endpoint,
+            params=params,
+            headers={"Authorization": self._auth_header()},
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        for n in data.get("notifications", []):
+            key = (n.get("email_address") or "").lower()
+            if not key:
+                continue
+            known = self._by_email.get(key)
+            if known is None or n.get("created_at", "") > known.get("created_at", ""):
+                self._by_email[key] = n
+        self._prune_index()
+        return data
+
+    def _prune_index(self) -> None:
+        """Drop indexed notifications older than index_max_age_s (or unparseable)."""
+        max_age = timedelta(seconds=self._cfg.index_max_age_s)
+        horizon = datetime.now(timezone.utc) - max_age
+        for key, n in list(self._by_email.items()):
+            created = _parse_created_at(n.get("created_at", ""))
+            if created is None or created < horizon:
+                del self._by_email[key]
+
+    def _consume(self, email: str) -> None:
+        """Forget the indexed notification for `email` once it has been used."""
+        self._by_email.pop(email.lower(), None)
+
+    async def iter_notifications(
+        self,
+        newer_than: Optional[datetime] = None,
+        max_pages: Optional[int] = None,
+        **filters: Optional[str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield notifications newest first, paging back with `older_than` only
+        while notifications are still newer than `newer_than` (if given).
+        """
+        older_than: Optional[str] = None
+        for _ in range(max_pages or self._cfg.max_pages):
+            page = await self.list_notifications(older_than=older_than, **filters)
+            notifications = page.get("notifications", [])
+            if not notifications:
+                return
+            for n in notifications:
+                yield n
+            oldest = _parse_created_at(notifications[-1].get("created_at", ""))
+            if newer_than is not None and oldest is not None and oldest < newer_than:
+                return
+            older_than = notifications[-1].get("id")
+            if not older_than:
+                return
+
+    async def find_latest_for_email(
+        self, email: str, since: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Newest email notification for `email` created at/after `since`.
+        Without `since` only the first page is searched.
+        """
+        cached = self._by_email.get(email.lower())
+        async for n in self.iter_notifications(
+            newer_than=since, max_pages=None if since else 1, template_type="email"
+        ):
+            if _matches(n, email, since):
+                self._consume(email)
+                return n
+            if since is not None:
+                created = _parse_created_at(n.get("created_at", ""))
+                if created is not None and created < since:
+                    break
+        # fall back to anything seen by earlier lookups
+        self._consume(email)
+        if cached is not None and _matches(cached, email, since):
+            return cached
+        return None
+
+    async def fetch_notifications(self) -> List[Dict[str, Any]]:
+        """
+        Returns the latest page of email notifications (newest first).
+        If the request fails, returns [].
+        """
+        try:
+            page = await self.list_notifications()
+        except httpx.HTTPError:
+            return []
+        return page.get("notifications", [])
 
     async def fetch_notification_body(self, target_email: str) -> str:
         """
         Returns the 'body' of the first notification whose email_address == target_email.
         If none found or request fails, returns "".
         """
-        token = self._cfg.build_jwt()
-        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            n = await self.find_latest_for_email(target_email)
+        except httpx.HTTPError:
+            return ""
+        return n.get("body", "") if n else ""
 
-        async with async_playwright() as pw:
-            ctx = await pw.request.new_context(
-                base_url=self._cfg.api_base_url,
-                extra_http_headers=headers,
-                timeout=self._cfg.timeout_s * 1000,
-            )
-            try:
-                resp = await ctx.get(self._cfg.endpoint)
-                if not resp.ok:
-                    return ""
-                data = await resp.json()
-            finally:
-                await ctx.dispose()
+    async def wait_for_verification_code(
+        self,
+        email: str,
+        deadline: float,
+        since: Optional[datetime] = None,
+    ) -> str:
+        """
+        Wait until a verification code for `email` arrives, and return it.
 
-        for n in data.get("notifications", []):
-            if n.get("email_address") == target_email:
-                return n.get("body", "")
-        return ""
+        - deadline: absolute time.monotonic() value after which TimeoutError is raised
+        - since: only notifications created at/after this (UTC) moment count,
+          so a code from an earlier send is never picked up
+
+        All concurrent waiters share one InboxWatcher, so Notify is polled once per
+        interval however many enrolments are in flight.
+        """
+        if self._watcher is None:
+            self._watcher = InboxWatcher(self)
+        cutoff = since - timedelta(seconds=self._cfg.clock_skew_s) if since else None
+        return await self._watcher.wait_for_code(email, deadline, cutoff)
 
     @staticmethod
     def extract_verification_code(notification_body: str) -> str:
@@ -86,3 +294,136 @@ class NotificationsClient:
         if code.startswith("#"):
             code = code[1:].strip()
         return code
+
+
+@dataclass
+class _Waiter:
+    email: str
+    cutoff: Optional[datetime]
+    future: "asyncio.Future[str]"
+
+
+class InboxWatcher:
+    """
+    One background poller per NotificationsClient that fans verification codes
+    out to every enrolment waiting for one.
+
+    Each `wait_for_code` call registers a future for its email; while any are
+    pending, the watcher reads the email feed (newest first, back to the oldest
+    pending cutoff), resolves the futures whose code has arrived and sleeps.
+    The poll interval starts at poll_initial_s, backs off to poll_max_s while
+    nothing new turns up and resets when a new waiter registers. The task
+    exits when there is nobody left to wait for.
+    """
+
+    def __init__(self, client: NotificationsClient):
+        self._client = client
+        self._cfg = client._cfg
+        self._waiters: List[_Waiter] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    async def wait_for_code(
+        self, email: str, deadline: float, cutoff: Optional[datetime] = None
+    ) -> str:
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(email.lower(), cutoff, future)
+        self._waiters.append(waiter)
+        self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            remaining = max(0.0, deadline - time.monotonic())
+            return await asyncio.wait_for(
+                asyncio.shield(waiter.future), timeout=remaining
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"No verification code for {email} before the deadline"
+            ) from None
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await self._poll_loop()
+        finally:
+            # the next wait_for_code starts a fresh poller
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def _poll_loop(self) -> None:
+        delay = self._cfg.poll_initial_s
+        while self._waiters:
+            self._wake.clear()
+            try:
+                resolved = await self._poll_once()
+            except Exception as exc:
+                if not (isinstance(exc, httpx.HTTPError) and _is_retryable(exc)):
+                    # a malformed payload or a hard API error: fail every waiter
+                    # now rather than leave them hanging until their deadlines
+                    for w in self._waiters:
+                        if not w.future.done():
+                            w.future.set_exception(exc)
+                    return
+                resolved = 0
+
+            if resolved:
+                delay = self._cfg.poll_initial_s
+            else:
+                delay = min(delay * 1.6, self._cfg.poll_max_s)
+            if not self._waiters:
+                return
+            try:
+                # a new waiter resets the backoff so its code is picked up promptly
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                delay = self._cfg.poll_initial_s
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll_once(self) -> int:
+        pending = {w.email: w for w in self._waiters if not w.future.done()}
+        if not pending:
+            return 0
+        cutoffs = [w.cutoff for w in self._waiters if not w.future.done()]
+        known = [c for c in cutoffs if c is not None]
+        # a waiter without a cutoff accepts any age, so only the first page is read
+        oldest = min(known) if len(known) == len(cutoffs) else None
+
+        resolved = 0
+        seen: set[str] = set()
+        # newest first, so the first notification per email is its latest one
+        async for n in self._client.iter_notifications(
+            newer_than=oldest, max_pages=None if oldest else 1, template_type="email"
+        ):
+            key = (n.get("email_address") or "").lower()
+            if key in seen or key not in pending:
+                continue
+            waiters = [
+                w for w in self._waiters if w.email == key and not w.future.done()
+            ]
+            if not waiters or not _matches(n, key, waiters[0].cutoff):
+                continue
+            code = NotificationsClient.extract_verification_code(n.get("body", ""))
+            if not code:
+                # e.g. a newer non-code email; keep reading back for the code
+                continue
+            seen.add(key)
+            for w in waiters:
+                if _matches(n, key, w.cutoff):
+                    w.future.set_result(code)
+                    resolved += 1
+            self._client._consume(key)
+            if len(seen) == len(pending):
+                break
+        return resolved
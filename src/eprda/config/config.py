@@ -73,7 +73,8 @@ class Config:
 def load_config(profile: Optional[str] = None) -> Config:
     parser = argparse.ArgumentParser(description="Create an enrolment via UI and return credentials.")
     parser.add_argument("--env", default="dev15", help="ENV_PROFILE; default uses ENV_PROFILE or 'dev15'")
-    args = parser.parse_args()    
+    # parse_known_args: CLIs define their own flags (--count, --company_name, ...)
+    args, _ = parser.parse_known_args()
 
     resolved_profile = _resolve_profile(profile)
     env_file = ENV_DIR / f".env.{resolved_profile}"
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from eprda.clients.companies_house import CompanySource
+from eprda.clients.company_pool import settle_companies
+from eprda.clients.notifications_client import NotificationsClient
+from eprda.flows.dp_enrolment_flow import create_dp_enrolment_flow
+from eprda.ui.browser import BrowserPool
+from eprda.utils.file_util import rand_suffix
+from eprda.utils.results_file import append_jsonl
+
+
+@dataclass
+class BatchEnrolmentOutcome:
+    index: int
+    status: str  # "ok" | "failed"
+    email: str
+    company_number: str
+    company_name: str
+    organisation_id: Optional[str] = None
+    error: Optional[str] = None
+    duration_s: float = 0.0
+
+
+def unique_emails(count: int) -> List[str]:
+    emails: set[str] = set()
+    while len(emails) < count:
+        emails.add(f"Automation+{rand_suffix()}@example.test")
+    return sorted(emails)
+
+
+def fetch_unique_companies(
+    ch: CompanySource, count: int, max_attempts: int = 5
+) -> List[Dict[str, str]]:
+    """
+    Pull `count` distinct companies from the client. The stream repeats a
+    company for every update it publishes, so keep reading until we have enough.
+    If that fails part-way, the companies already leased go back to the pool.
+    """
+    seen: Dict[str, Dict[str, str]] = {}
+    try:
+        for _ in range(max_attempts):
+            missing = count - len(seen)
+            if missing <= 0:
+                break
+            for company in ch.fetch_companies(max_records=missing):
+                seen.setdefault(company["company_number"], company)
+        if len(seen) < count:
+            raise RuntimeError(
+                f"Only found {len(seen)} distinct companies, needed {count}"
+            )
+    except BaseException:
+        settle_companies(ch, list(seen), used=False)
+        raise
+    return list(seen.values())[:count]
+
+
+async def run_dp_batch_enrolment(
+    producer_base_url: str,
+    ch: CompanySource,
+    notifications: NotificationsClient,
+    pool: BrowserPool,
+    count: int,
+    concurrency: int,
+    results_path: str | Path,
+) -> List[BatchEnrolmentOutcome]:
+    """
+    Enrol `count` direct producers with at most `concurrency` browser contexts
+    in flight. Each org gets its own email and company number; every outcome
+    is appended to `results_path` (JSONL) as soon as it finishes, and a failed
+    org is recorded rather than aborting the rest of the batch. If the batch
+    stops early (e.g. it is cancelled), companies whose enrolment never started
+    are released; one cut off mid-enrolment may already be on the portal, so
+    its lease is left to expire.
+    """
+    emails = unique_emails(count)
+    companies = await asyncio.to_thread(fetch_unique_companies, ch, count)
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes: List[BatchEnrolmentOutcome] = []
+    started: set[str] = set()
+
+    async def enrol_one(index: int) -> None:
+        email, company = emails[index], companies[index]
+        async with semaphore:
+            started.add(company["company_number"])
+            started_at = time.monotonic()
+            outcome = BatchEnrolmentOutcome(
+                index=index,
+                status="ok",
+                email=email,
+                company_number=company["company_number"],
+                company_name=company["company_name"],
+            )
+            try:
+                async with pool.page() as page:
+                    result = await create_dp_enrolment_flow(
+                        producer_base_url=producer_base_url,
+                        email=email,
+                        ch=ch,
+                        notifications=notifications,
+                        page=page,
+                        company=company,
+                    )
+                outcome.organisation_id = result.organisation_id
+            except Exception as exc:
+                outcome.status = "failed"
+                outcome.error = f"{type(exc).__name__}: {exc}"
+            # retire the company only if it was enrolled, otherwise return it
+            await asyncio.to_thread(
+                settle_companies,
+                ch,
+                [outcome.company_number],
+                outcome.status == "ok",
+            )
+            outcome.duration_s = round(time.monotonic() - started_at, 2)
+
+        append_jsonl(results_path, outcome)
+        outcomes.append(outcome)
+        mark = "✅" if outcome.status == "ok" else "❌"
+        print(
+            f"{mark} [{len(outcomes)}/{count}] {email} "
+            f"{outcome.company_name} ({outcome.duration_s}s)"
+        )
+
+    batch_started = time.monotonic()
+    try:
+        await asyncio.gather(*(enrol_one(i) for i in range(count)))
+    finally:
+        unused = [
+            c["company_number"]
+            for c in companies
+            if c["company_number"] not in started
+        ]
+        if unused:
+            await asyncio.to_thread(settle_companies, ch, unused, False)
+    elapsed = time.monotonic() - batch_started
+
+    ok = sum(1 for o in outcomes if o.status == "ok")
+    rate = ok / elapsed * 60 if elapsed else 0.0
+    print(
+        f"📊 Enrolled {ok}/{count} orgs in {elapsed:.1f}s "
+        f"({rate:.1f} orgs/min, concurrency={concurrency}) -> {results_path}"
+    )
+    return sorted(outcomes, key=lambda o: o.index)
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from playwright.async_api import Page
+
+from eprda.clients.companies_house import CompanySource
+from eprda.clients.company_pool import settle_companies
+from eprda.clients.notifications_client import NotificationsClient
+from eprda.config.config import Config
+from eprda.flows.dp_batch_enrolment_flow import fetch_unique_companies, unique_emails
+from eprda.flows.dp_enrolment_flow import (
+    EnrolmentResult,
+    create_dp_enrolment_flow,
+    regulator_accept_approved_person,
+)
+from eprda.flows.dp_registration_submission_flow import (
+    dp_complete_registration_submission_flow,
+    dp_submit_registration_data_flow,
+    regulator_accept_registration_submission,
+)
+from eprda.flows.dp_report_packaging_data_flow import dp_report_packaging_data_flow
+from eprda.flows.pipeline import OrgJob, Pipeline, Stage
+from eprda.flows.run_store import RunStore
+from eprda.logging import new_run_id, start_run
+from eprda.tracing import stats as step_stats
+from eprda.ui.browser import BrowserPool
+from eprda.ui.session_cache import SessionCache
+from eprda.utils.csv_factory import OUTPUT_DIR
+from eprda.utils.output_cache import prune_output_dir
+from eprda.utils.results_file import upsert_jsonl
+
+# Password set by CreateAccountPage.create_producer_account
+PRODUCER_PASSWORD = "Password123"
+
+# Stage name -> stages it needs, in the order they run for a single org.
+# POM reporting only needs an approved account, so it runs alongside registration.
+STAGE_DEPENDENCIES: Dict[str, tuple[str, ...]] = {
+    "enrol": (),
+    "approve": ("enrol",),
+    "register": ("approve",),
+    "submit": ("register",),
+    "grant": ("submit",),
+    "pom": ("approve",),
+}
+
+DEFAULT_CONCURRENCY: Dict[str, int] = {
+    "enrol": 4,
+    "approve": 2,
+    "register": 4,
+    "submit": 4,
+    "grant": 2,
+    "pom": 4,
+}
+
+
+def with_dependencies(names: Iterable[str]) -> List[str]:
+    """Requested stage names plus everything they depend on, in pipeline order."""
+    wanted: set[str] = set()
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        if name not in STAGE_DEPENDENCIES:
+            raise ValueError(
+                f"Unknown stage {name!r}. Allowed: {list(STAGE_DEPENDENCIES)}"
+            )
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(STAGE_DEPENDENCIES[name])
+    return [n for n in STAGE_DEPENDENCIES if n in wanted]
+
+
+def dp_data_setup_stages(
+    config: Config,
+    ch: CompanySource,
+    notifications: NotificationsClient,
+    sessions: SessionCache,
+    names: Iterable[str] = tuple(STAGE_DEPENDENCIES),
+    concurrency: Optional[Mapping[str, int]] = None,
+) -> List[Stage]:
+    """
+    Direct producer data setup as pipeline stages:
+    enrol -> approve -> register -> submit -> grant, and approve -> pom.
+    Each OrgJob needs data["email"]; data["company"] is optional.
+    """
+    env = config.env
+    limits = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+
+    async def enrol(job: OrgJob, page: Page) -> EnrolmentResult:
+        company = job.data.get("company")
+        numbers = [company["company_number"]] if company else []
+        try:
+            result = await create_dp_enrolment_flow(
+                producer_base_url=env.PRODUCER_BASE_URL,
+                email=job.data["email"],
+                ch=ch,
+                notifications=notifications,
+                page=page,
+                company=company,
+            )
+        except Exception:
+            if company:
+                await asyncio.to_thread(settle_companies, ch, numbers, False)
+                # released: another worker may lease it before this org resumes
+                job.data.pop("company", None)
+            raise
+        if company:
+            await asyncio.to_thread(settle_companies, ch, numbers, True)
+        return result
+
+    async def approve(job: OrgJob, page: Page) -> None:
+        await regulator_accept_approved_person(
+            regulator_base_url=env.REGULATOR_BASE_URL,
+            email=env.REGULATOR_EMAIL,
+            password=env.REGULATOR_PASSWORD,
+            company_name=job.outputs["enrol"].company_name,
+            page=page,
+            sessions=sessions,
+        )
+
+    async def register(job: OrgJob, page: Page) -> Any:
+        enrolment: EnrolmentResult = job.outputs["enrol"]
+        return await dp_submit_registration_data_flow(
+            env.PRODUCER_BASE_URL, enrolment.email, PRODUCER_PASSWORD,
+            enrolment.organisation_id, enrolment.company_name, enrolment.company_number,
+            page=page, sessions=sessions,
+        )
+
+    async def submit(job: OrgJob, page: Page) -> Any:
+        enrolment: EnrolmentResult = job.outputs["enrol"]
+        return await dp_complete_registration_submission_flow(
+            env.PRODUCER_BASE_URL, enrolment.email, PRODUCER_PASSWORD,
+            page=page, sessions=sessions,
+        )
+
+    async def grant(job: OrgJob, page: Page) -> Any:
+        return await regulator_accept_registration_submission(
+            env.REGULATOR_BASE_URL, env.REGULATOR_EMAIL, env.REGULATOR_PASSWORD,
+            job.outputs["enrol"].company_name,
+            page=page, sessions=sessions,
+        )
+
+    async def pom(job: OrgJob, page: Page) -> Any:
+        enrolment: EnrolmentResult = job.outputs["enrol"]
+        return await dp_report_packaging_data_flow(
+            env.PRODUCER_BASE_URL, enrolment.email, PRODUCER_PASSWORD,
+            enrolment.organisation_id, page=page, sessions=sessions,
+        )
+
+    runners = {
+        "enrol": enrol,
+        "approve": approve,
+        "register": register,
+        "submit": submit,
+        "grant": grant,
+        "pom": pom,
+    }
+    decoders = {"enrol": lambda d: EnrolmentResult(**d)}
+    return [
+        Stage(
+            name=n,
+            run=runners[n],
+            depends_on=STAGE_DEPENDENCIES[n],
+            concurrency=limits[n],
+            decode=decoders.get(n),
+        )
+        for n in with_dependencies(names)
+    ]
+
+
+def job_summary(job: OrgJob) -> Dict[str, Any]:
+    """JSON-friendly view of a finished OrgJob for the results file."""
+    enrolment = job.outputs.get("enrol")
+    if isinstance(enrolment, EnrolmentResult):
+        identity = asdict(enrolment)
+    else:
+        identity = {"email": job.data.get("email")}
+    return {
+        "key": job.key,
+        "status": "ok" if job.ok else "failed",
+        **identity,
+        "stages": job.status,
+        "errors": job.errors,
+        "durations": job.durations,
+    }
+
+
+async def run_dp_data_setup(
+    config: Config,
+    ch: CompanySource,
+    notifications: NotificationsClient,
+    stage_names: Sequence[str] = tuple(STAGE_DEPENDENCIES),
+    count: int = 1,
+    concurrency: Optional[Mapping[str, int]] = None,
+    browsers: int = 1,
+    headed: bool = False,
+    resume_run_id: Optional[str] = None,
+    store: Optional[RunStore] = None,
+    results_path: Optional[str | Path] = None,
+) -> List[OrgJob]:
+    """
+    Run (or resume) a checkpointed data-setup run.
+
+    New runs get a run id, seed data (emails + companies) and a row per stage
+    outcome in the RunStore. Passing `resume_run_id` reloads that run's orgs
+    with their completed stages and continues each from its first incomplete
+    stage, reusing the already enrolled organisations.
+    """
+    store = store or RunStore()
+    # keep OUTPUT_DIR within EPRDA_OUTPUT_MAX_MB / EPRDA_OUTPUT_MAX_AGE_DAYS
+    # (no-op when unset)
+    prune_output_dir()
+    if resume_run_id:
+        run = store.get_run(resume_run_id)
+        if run["profile"] != config.profile:
+            raise ValueError(
+                f"Run {resume_run_id} was created for profile {run['profile']!r}, "
+                f"not {config.profile!r}"
+            )
+        run_id = resume_run_id
+        stage_names = run["stages"]
+    else:
+        run_id = new_run_id()
+        stage_names = with_dependencies(stage_names)
+
+    stages = dp_data_setup_stages(
+        config, ch, notifications, SessionCache(config.profile),
+        names=stage_names, concurrency=concurrency,
+    )
+
+    if resume_run_id:
+        decoders = {s.name: s.decode for s in stages if s.decode}
+        jobs = store.load_jobs(run_id, decoders=decoders)
+        for job in jobs:
+            if job.status.get("enrol") != "ok":
+                # its company lease was released (or has expired) since it was
+                # seeded, so the enrolment leases a fresh one
+                job.data.pop("company", None)
+        names = [s.name for s in stages]
+        print(f"🔁 Resuming run {run_id}: {len(jobs)} orgs through {names}")
+    else:
+        companies = await asyncio.to_thread(fetch_unique_companies, ch, count)
+        jobs = [
+            OrgJob(key=f"{run_id}-{i:04d}", data={"email": email, "company": company})
+            for i, (email, company) in enumerate(zip(unique_emails(count), companies))
+        ]
+        params = {"stages": list(stage_names), "count": count}
+        store.create_run(run_id, config.profile, params)
+        print(f"🧭 Run {run_id}: {count} orgs through {[s.name for s in stages]}")
+
+    # every page action / stage is logged as a JSON span tagged with the run id
+    start_run(OUTPUT_DIR, run_id)
+    spans_path = OUTPUT_DIR / f"spans_{run_id}.jsonl"
+
+    results = results_path or OUTPUT_DIR / f"data_setup_{run_id}.jsonl"
+    async with BrowserPool(size=browsers, headed=headed) as pool:
+        pipeline = Pipeline(
+            stages,
+            pool,
+            # one line per org: a resumed run replaces the org's earlier record
+            on_job_done=lambda job: upsert_jsonl(results, job_summary(job)),
+            store=store,
+            run_id=run_id,
+        )
+        await pipeline.run(jobs)
+
+    print(step_stats.table(run_id))
+    print(f"📄 Results: {results} (step spans: {spans_path})")
+    if not all(job.ok for job in jobs):
+        print(f"↩️  Some stages did not complete; continue with --resume {run_id}")
+    return jobs
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from contextlib import aclosing
 from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
 
-from eprda.ui.browser import launch_browser  
-from eprda.clients.companies_house import CompaniesHouseClient
+from playwright.async_api import Page
+
+from eprda.ui.browser import open_page
+from eprda.ui.session_cache import SessionCache
+from eprda.clients.companies_house import CompanySource
+from eprda.clients.company_pool import settle_companies
 from eprda.clients.notifications_client import NotificationsClient
+from eprda.tracing import step
+from eprda.utils.screenshots import failure_screenshot_path
 
 from eprda.ui.pages.signin_page import SigninPage
 from eprda.ui.pages.create_account_page import CreateAccountPage
@@ -24,64 +34,88 @@ class EnrolmentResult:
     company_number: str
 
 
+@dataclass
+class ApprovalOutcome:
+    company_name: str
+    status: str  # "ok" | "failed"
+    error: Optional[str] = None
+    duration_s: float = 0.0
+
+
 async def create_dp_enrolment_flow(
     producer_base_url: str,
     email: str,
-    ch: CompaniesHouseClient,
+    ch: CompanySource,
     notifications: NotificationsClient,
+    page: Optional[Page] = None,
+    company: Optional[Dict[str, str]] = None,
 ) -> EnrolmentResult:
     """
     Producer enrolment flow:
       - create account (email verification via notifications client)
       - look up company via companies house client
       - complete enrolment and return org metadata
-    """
-    page, ctx, br = await launch_browser(headed=True)
-    try:
-        await page.goto(producer_base_url)
 
-        signin_page = SigninPage(page)
-        create_account_page: CreateAccountPage = await signin_page.click_create_new_account()
-        # Inject notifications client
-        create_account_page.set_notifications_client(notifications)
-
-        registered_charity_page = await create_account_page.create_producer_account(email)
-        registered_with_companies_house_page = await registered_charity_page.select_is_organisation_registered_charity(YesNo.NO)
-        companies_house_number_page = await registered_with_companies_house_page.select_is_organisation_registered_with_company_house(YesNo.YES)
-
-        # Companies House lookup (DI client)
-        companies = ch.fetch_companies(max_records=1)
-        company_number = companies[0]["company_number"]
-        company_name = companies[0]["company_name"]
-
-        confirm_company_details_page = await companies_house_number_page.enter_companies_house_number(company_number)
-        organisation_nation_page = await confirm_company_details_page.confirm_company_details()
-        role_in_organisation_page = await organisation_nation_page.select_organisation_nation(OrganisationNationPage.UKNations.ENGLAND)
-        full_name_page = await role_in_organisation_page.select_role_in_organisation(RoleInOrganisationPage.ROLES.DIRECTOR)
-
-        telephone_number_page = await full_name_page.enter_full_name("Automation", "Testing")
-        check_your_details_page = await telephone_number_page.enter_telephone_number("07777777777")
-        declaration_page = await check_your_details_page.check_your_details()
-
-        landing_page = await declaration_page.click_confirm_details_and_create_account()
-        using_compliance_page = await landing_page.verify_account_creation()
-        direct_producer_dashboard_page = await using_compliance_page.select_is_organisation_registered_charity(using_compliance_page.UsingCompliance.NO)
-
-        organisation_id = await direct_producer_dashboard_page.get_organisation_id(company_name)
-        await direct_producer_dashboard_page.logout()
-
-        return EnrolmentResult(
-            organisation_id=organisation_id,
-            email=email,
-            company_name=company_name,
-            company_number=company_number,
-        )
-    except Exception:
-        await page.screenshot(path="output/create_enrolment_flow.png")
-        raise
-    finally:
-        await ctx.close()
-        await br.close()
+    Pass `page` (e.g. from a BrowserPool) to drive an existing browser context
+    instead of launching a new browser, and `company` ({"company_number",
+    "company_name"}) to skip the Companies House lookup; the caller then owns
+    that company's pool lease. A company leased here is marked used on success
+    and released back to the pool on failure.
+    """
+    leased: Optional[str] = None
+    async with open_page(page) as page:
+        try:
+            await page.goto(producer_base_url)
+
+            signin_page = SigninPage(page)
+            create_account_page: CreateAccountPage = await signin_page.click_create_new_account()
+            # Inject notifications client
+            create_account_page.set_notifications_client(notifications)
+
+            registered_charity_page = await create_account_page.create_producer_account(email)
+            registered_with_companies_house_page = await registered_charity_page.select_is_organisation_registered_charity(YesNo.NO)
+            companies_house_number_page = await registered_with_companies_house_page.select_is_organisation_registered_with_company_house(YesNo.YES)
+
+            # Companies House lookup (DI client), unless the caller already picked one
+            if company is None:
+                async with step("companies_house.fetch_companies"):
+                    companies = await asyncio.to_thread(ch.fetch_companies, 1)
+                company = companies[0]
+                leased = company["company_number"]
+            company_number = company["company_number"]
+            company_name = company["company_name"]
+
+            confirm_company_details_page = await companies_house_number_page.enter_companies_house_number(company_number)
+            organisation_nation_page = await confirm_company_details_page.confirm_company_details()
+            role_in_organisation_page = await organisation_nation_page.select_organisation_nation(OrganisationNationPage.UKNations.ENGLAND)
+            full_name_page = await role_in_organisation_page.select_role_in_organisation(RoleInOrganisationPage.ROLES.DIRECTOR)
+
+            telephone_number_page = await full_name_page.enter_full_name("Automation", "Testing")
+            check_your_details_page = await telephone_number_page.enter_telephone_number("07777777777")
+            declaration_page = await check_your_details_page.check_your_details()
+
+            landing_page = await declaration_page.click_confirm_details_and_create_account()
+            using_compliance_page = await landing_page.verify_account_creation()
+            direct_producer_dashboard_page = await using_compliance_page.select_is_organisation_registered_charity(using_compliance_page.UsingCompliance.NO)
+
+            organisation_id = await direct_producer_dashboard_page.get_organisation_id(company_name)
+            await direct_producer_dashboard_page.logout()
+
+            if leased:
+                await asyncio.to_thread(settle_companies, ch, [leased], True)
+            return EnrolmentResult(
+                organisation_id=organisation_id,
+                email=email,
+                company_name=company_name,
+                company_number=company_number,
+            )
+        except Exception:
+            if leased:
+                await asyncio.to_thread(settle_companies, ch, [leased], False)
+            await page.screenshot(
+                path=failure_screenshot_path("create_enrolment_flow", email)
+            )
+            raise
 
 
 async def regulator_accept_approved_person(
@@ -89,23 +123,108 @@ async def regulator_accept_approved_person(
     email: str,
     password: str,
     company_name: str,
+    page: Optional[Page] = None,
+    sessions: Optional[SessionCache] = None,
 ) -> None:
     """
     Regulator: accept 'approved person' for the created organisation.
     """
-    page, ctx, br = await launch_browser(headed=True)
-    try:
-        await page.goto(regulator_base_url)
-        signin_page = SigninPage(page)
-        await signin_page.login(email, password)
+    async with open_page(page) as page:
+        try:
+            signin_page = SigninPage(page)
+            await signin_page.login_with_session(regulator_base_url, email, password, sessions)
+
+            regulator_home_page = RegulatorHomePage(page)
+            regulator_applications_page = await regulator_home_page.click_manage_applications_for_approved_and_delegated_people_link()
+            await regulator_applications_page.search_organisation_name(company_name)
+            await regulator_applications_page.accept_approved_person(company_name)
+        except Exception:
+            await page.screenshot(
+                path=failure_screenshot_path(
+                    "regulator_accept_approved_failed", company_name
+                )
+            )
+            raise
+
+
+async def regulator_accept_approved_persons(
+    regulator_base_url: str,
+    email: str,
+    password: str,
+    company_names: Optional[Iterable[str]] = None,
+    match: Optional[str] = None,
+    page: Optional[Page] = None,
+    sessions: Optional[SessionCache] = None,
+) -> List[ApprovalOutcome]:
+    """
+    Regulator: accept 'approved person' for many organisations in one signed-in session.
 
+      - company_names: search for and accept each organisation in turn
+      - match: accept every application whose row matches the search text,
+        walking the results page by page
+
+    A failure on one organisation is recorded and the loop moves on.
+    """
+    if company_names is None and match is None:
+        raise ValueError("Pass company_names or match")
+    if company_names is not None and match is not None:
+        raise ValueError("Pass company_names or match, not both")
+
+    outcomes: List[ApprovalOutcome] = []
+    async with open_page(page) as page:
+        signin_page = SigninPage(page)
+        await signin_page.login_with_session(regulator_base_url, email, password, sessions)
         regulator_home_page = RegulatorHomePage(page)
         regulator_applications_page = await regulator_home_page.click_manage_applications_for_approved_and_delegated_people_link()
-        await regulator_applications_page.search_organisation_name(company_name)
-        await regulator_applications_page.accept_approved_person(company_name)
-    except Exception:
-        await page.screenshot(path="output/regulator_accept_approved_failed.png")
-        raise
-    finally:
-        await ctx.close()
-        await br.close()
+        applications_url = page.url
+
+        async def accept(company_name: str, search: Optional[str]) -> None:
+            started = time.monotonic()
+            outcome = ApprovalOutcome(company_name=company_name, status="ok")
+            try:
+                if search is not None:
+                    await regulator_applications_page.search_organisation_name(search)
+                await regulator_applications_page.accept_approved_person(company_name)
+                await page.goto(applications_url)
+            except Exception as exc:
+                outcome.status = "failed"
+                outcome.error = f"{type(exc).__name__}: {exc}"
+                await page.screenshot(
+                    path=failure_screenshot_path(
+                        "regulator_accept_approved_failed", company_name
+                    )
+                )
+                try:
+                    # back to the list for the next organisation
+                    await page.goto(applications_url)
+                except Exception as nav_exc:
+                    outcome.error += f" (return to list failed: {nav_exc})"
+            outcome.duration_s = round(time.monotonic() - started, 2)
+            outcomes.append(outcome)
+            mark = "✅" if outcome.status == "ok" else "❌"
+            print(f"{mark} Approved person: {company_name} ({outcome.duration_s}s)")
+
+        if company_names is not None:
+            for company_name in company_names:
+                await accept(company_name, company_name)
+            return outcomes
+
+        # match mode: accepted rows drop out of the list, so rescan from page 1
+        # after every acceptance and only move on once a page has nothing new
+        assert match is not None
+        handled: set[str] = set()
+        while True:
+            await regulator_applications_page.search_organisation_name(match)
+            pending: Optional[str] = None
+            # one table read per results page; stop paging at the first new row,
+            # closing the generator rather than leaving its cleanup to the GC
+            pages = regulator_applications_page.iter_organisation_names()
+            async with aclosing(pages):
+                async for names in pages:
+                    pending = next((n for n in names if n not in handled), None)
+                    if pending is not None:
+                        break
+            if pending is None:
+                return outcomes
+            handled.add(pending)
+            await accept(pending, None)
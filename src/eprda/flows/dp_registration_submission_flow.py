@@ -1,9 +1,15 @@
 from dataclasses import dataclass
-from eprda.ui.browser import launch_browser
+from typing import Optional
+from playwright.async_api import Page
+from eprda.ui.browser import open_page
+from eprda.ui.session_cache import SessionCache
 from eprda.ui.pages.registration_page import RegistrationTaskListPage
 from eprda.ui.pages.regulator_home_page import RegulatorHomePage, YesNoOption
 from eprda.ui.pages.signin_page import SigninPage
 from eprda.utils.csv_factory import create_csv_from_template, TEMPLATES_DIR, OUTPUT_DIR
+from eprda.utils.file_executor import run_file_task
+from eprda.utils.org_pom_consistency import ensure_org_pom_consistent
+from eprda.utils.screenshots import failure_screenshot_path
 from anyio import Path
 from src.eprda.ui.pages.direct_producer_dashboard_page import DirectProducerDashboardPage
 
@@ -26,94 +32,104 @@ async def create_org_file(org_id: str, organisation_name: str, companies_house_n
         }
     ]
 
-    written = create_csv_from_template(template_csv=template, output_csv=output, rows=rows)
+    # off the event loop: concurrent flows keep driving their pages meanwhile
+    written = await run_file_task(
+        create_csv_from_template,
+        template_csv=template,
+        output_csv=output,
+        rows=rows,
+        cache=True,
+    )
     print(f"✅ ORG CSV created: {written.resolve()}")
     return output
 
-async def dp_submit_registration_data_flow(producer_base_url: str, email: str, password: str, org_id: str, organisation_name: str, companies_house_number: str):
-    page, ctx, br = await launch_browser(headed=True)
-    try:
-        await page.goto(producer_base_url)
-        signin_page = SigninPage(page)
-        await signin_page.login(email, password)
-        direct_producer_dashboard_page = DirectProducerDashboardPage(page)
-        registration_guidance_page = await direct_producer_dashboard_page.click_registration_for_year_link("2026")
-        registration_task_list_page = await registration_guidance_page.click_continue_button()
-        upload_organisation_details_page = await registration_task_list_page.click_submit_registration_data_link()
+async def dp_submit_registration_data_flow(producer_base_url: str, email: str, password: str, org_id: str, organisation_name: str, companies_house_number: str, page: Optional[Page] = None, sessions: Optional[SessionCache] = None):
+    async with open_page(page) as page:
+        try:
+            # build and cross-check the ORG file before driving the portal, so a
+            # mismatch with this org's POM file fails in milliseconds
+            org_file_path = await create_org_file(org_id, organisation_name, companies_house_number)
+            pom_file_path = OUTPUT_DIR / f"pom_{org_id}.csv"
+            if pom_file_path.exists():
+                await run_file_task(ensure_org_pom_consistent, org_file_path, pom_file_path)
 
-        org_file_path = await create_org_file(org_id, organisation_name, companies_house_number)
-        organisation_details_uploaded_page = await upload_organisation_details_page.upload_organisation_details_file(org_file_path)
+            signin_page = SigninPage(page)
+            await signin_page.login_with_session(producer_base_url, email, password, sessions)
+            direct_producer_dashboard_page = DirectProducerDashboardPage(page)
+            registration_guidance_page = await direct_producer_dashboard_page.click_registration_for_year_link("2026")
+            registration_task_list_page = await registration_guidance_page.click_continue_button()
+            upload_organisation_details_page = await registration_task_list_page.click_submit_registration_data_link()
+
+            organisation_details_uploaded_page = await upload_organisation_details_page.upload_organisation_details_file(org_file_path)
                                                                                                                      
-        await organisation_details_uploaded_page.verify_organisation_details_uploaded()
-        review_organisation_data_page = await organisation_details_uploaded_page.click_continue_button()
-        await review_organisation_data_page.review_organisation_data()
-        declaration_page = await review_organisation_data_page.select_and_confirm_submit_org_details()
-        organisation_details_confirmation_page = await declaration_page.enter_full_name_and_click_submit_button("Automation Tester")        
-        await organisation_details_confirmation_page.verify_org_details_submission_status()
+            await organisation_details_uploaded_page.verify_organisation_details_uploaded()
+            review_organisation_data_page = await organisation_details_uploaded_page.click_continue_button()
+            await review_organisation_data_page.review_organisation_data()
+            declaration_page = await review_organisation_data_page.select_and_confirm_submit_org_details()
+            organisation_details_confirmation_page = await declaration_page.enter_full_name_and_click_submit_button("Automation Tester")        
+            await organisation_details_confirmation_page.verify_org_details_submission_status()
+            return org_file_path
 
-    except Exception as e:
-        print(f"Test failed: {e}")
-        await page.screenshot(path="output/submit_regisration_data.png")
-        raise Exception(f"Test failed: {e}")
-    finally:
-        await ctx.close()
-        await br.close()
+        except Exception as e:
+            print(f"Test failed: {e}")
+            await page.screenshot(
+                path=failure_screenshot_path("submit_registration_data", org_id)
+            )
+            raise Exception(f"Test failed: {e}")
         
-async def dp_complete_registration_submission_flow(producer_base_url: str, email: str, password: str):
-    page, ctx, br = await launch_browser(headed=True)
-    try:
-        await page.goto(producer_base_url)
-        signin_page = SigninPage(page)
-        await signin_page.login(email, password)
-        direct_producer_dashboard_page = DirectProducerDashboardPage(page)
-        await direct_producer_dashboard_page.click_registration_for_year_link("2026")
-        registration_task_list_page = RegistrationTaskListPage(page)
-        registration_fee_calculations_page = await registration_task_list_page.click_view_registration_fee_link()
-        await registration_fee_calculations_page.verify_registration_fee_text()
-        select_payment_options_page = await registration_fee_calculations_page.click_continue_button()
-        await select_payment_options_page.verify_how_to_pay_your_registration_fee_heading_text()
-        await select_payment_options_page.choose_pay_by_bank_transfer()
-        pay_by_bank_transfer_page = await select_payment_options_page.click_continue_button()
+async def dp_complete_registration_submission_flow(producer_base_url: str, email: str, password: str, page: Optional[Page] = None, sessions: Optional[SessionCache] = None):
+    async with open_page(page) as page:
+        try:
+            signin_page = SigninPage(page)
+            await signin_page.login_with_session(producer_base_url, email, password, sessions)
+            direct_producer_dashboard_page = DirectProducerDashboardPage(page)
+            await direct_producer_dashboard_page.click_registration_for_year_link("2026")
+            registration_task_list_page = RegistrationTaskListPage(page)
+            registration_fee_calculations_page = await registration_task_list_page.click_view_registration_fee_link()
+            await registration_fee_calculations_page.verify_registration_fee_text()
+            select_payment_options_page = await registration_fee_calculations_page.click_continue_button()
+            await select_payment_options_page.verify_how_to_pay_your_registration_fee_heading_text()
+            await select_payment_options_page.choose_pay_by_bank_transfer()
+            pay_by_bank_transfer_page = await select_payment_options_page.click_continue_button()
         
-        await pay_by_bank_transfer_page.verify_registration_fee_due_text()
-        direct_producer_dashboard_page = await pay_by_bank_transfer_page.click_continue_button()
+            await pay_by_bank_transfer_page.verify_registration_fee_due_text()
+            direct_producer_dashboard_page = await pay_by_bank_transfer_page.click_continue_button()
 
-        await direct_producer_dashboard_page.click_registration_for_year_link("2026")
-        registration_task_list_page = RegistrationTaskListPage(page)
-        additional_information_page = await registration_task_list_page.click_submit_registration_application_link()
-        submit_registration_request_page = await additional_information_page.click_submit_registration_application_button()
-        await submit_registration_request_page.verify_registration_submitted_for_approval_heading_text()
-        await submit_registration_request_page.get_application_reference_number()
-        registration_task_list_page = await submit_registration_request_page.click_back_button()
+            await direct_producer_dashboard_page.click_registration_for_year_link("2026")
+            registration_task_list_page = RegistrationTaskListPage(page)
+            additional_information_page = await registration_task_list_page.click_submit_registration_application_link()
+            submit_registration_request_page = await additional_information_page.click_submit_registration_application_button()
+            await submit_registration_request_page.verify_registration_submitted_for_approval_heading_text()
+            application_reference = await submit_registration_request_page.get_application_reference_number()
+            registration_task_list_page = await submit_registration_request_page.click_back_button()
+            return application_reference
     
-    except Exception as e:
-        print(f"Test failed: {e}")
-        await page.screenshot(path="output/submit_regisration_data.png")
-        raise Exception(f"Test failed: {e}")
-    finally:
-        await ctx.close()
-        await br.close()
+        except Exception as e:
+            print(f"Test failed: {e}")
+            await page.screenshot(
+                path=failure_screenshot_path("complete_registration_submission", email)
+            )
+            raise Exception(f"Test failed: {e}")
         
-async def regulator_accept_registration_submission(regulator_base_url: str, email: str, password: str, company_name: str):
-    page, ctx, br = await launch_browser(headed=True)
-    try:
-        await page.goto(regulator_base_url)
-        signin_page = SigninPage(page)
-        await signin_page.login(email, password)
-        regulator_home_page = RegulatorHomePage(page)
-        manage_registration_submissions_page = await regulator_home_page.click_manage_registration_submissions_link()
-        await manage_registration_submissions_page.search_organisation_name(company_name)
-        registration_submission_details_page = await manage_registration_submissions_page.select_organisation(company_name)
-        manage_registration_submissions_grant_page = await registration_submission_details_page.click_grant_registration_button()        
-        registration_submission_details_page = await manage_registration_submissions_grant_page.select_grant_registration_confirmation(YesNoOption.YES) 
-        await registration_submission_details_page.click_back_button()
-        await manage_registration_submissions_page.search_organisation_name(company_name)
-        await manage_registration_submissions_page.get_reference_number()
+async def regulator_accept_registration_submission(regulator_base_url: str, email: str, password: str, company_name: str, page: Optional[Page] = None, sessions: Optional[SessionCache] = None):
+    async with open_page(page) as page:
+        try:
+            signin_page = SigninPage(page)
+            await signin_page.login_with_session(regulator_base_url, email, password, sessions)
+            regulator_home_page = RegulatorHomePage(page)
+            manage_registration_submissions_page = await regulator_home_page.click_manage_registration_submissions_link()
+            await manage_registration_submissions_page.search_organisation_name(company_name)
+            registration_submission_details_page = await manage_registration_submissions_page.select_organisation(company_name)
+            manage_registration_submissions_grant_page = await registration_submission_details_page.click_grant_registration_button()        
+            registration_submission_details_page = await manage_registration_submissions_grant_page.select_grant_registration_confirmation(YesNoOption.YES) 
+            await registration_submission_details_page.click_back_button()
+            await manage_registration_submissions_page.search_organisation_name(company_name)
+            return await manage_registration_submissions_page.get_reference_number()
         
-    except Exception as e:
-        print(f"Test failed: {e}")
-        await page.screenshot(path="output/regulator_accept_approved_failed.png")
-        raise Exception(f"Test failed: {e}")
-    finally:
-        await ctx.close()
-        await br.close()
+        except Exception as e:
+            print(f"Test failed: {e}")
+            screenshot = failure_screenshot_path(
+                "regulator_accept_registration", company_name
+            )
+            await page.screenshot(path=screenshot)
+            raise Exception(f"Test failed: {e}")
@@ -1,6 +1,13 @@
-from eprda.ui.browser import launch_browser
+from typing import Optional
+from playwright.async_api import Page
+from eprda.ui.browser import open_page
+from eprda.ui.session_cache import SessionCache
 from eprda.ui.pages.signin_page import SigninPage
 from eprda.utils.csv_factory import create_csv_from_template, TEMPLATES_DIR, OUTPUT_DIR
+from eprda.utils.file_executor import run_file_task
+from eprda.utils.org_pom_consistency import ensure_org_pom_consistent
+from eprda.utils.pom_validator import ensure_valid_pom_file
+from eprda.utils.screenshots import failure_screenshot_path
 from anyio import Path
 from src.eprda.ui.pages.direct_producer_dashboard_page import DirectProducerDashboardPage
 
@@ -14,10 +21,13 @@ async def create_pom_file(org_id: str) -> Path:
         }
     ]
 
-    written = create_csv_from_template(
-        template_csv=template, 
-        output_csv=output, 
-        rows=rows
+    # off the event loop: concurrent flows keep driving their pages meanwhile
+    written = await run_file_task(
+        create_csv_from_template,
+        template_csv=template,
+        output_csv=output,
+        rows=rows,
+        cache=True,
     )
 
     print(f"✅ POM CSV created: {written.resolve()}")
@@ -28,45 +38,51 @@ async def dp_report_packaging_data_flow(
     producer_base_url: str,
     email: str,
     password: str,
-    org_id: str
+    org_id: str,
+    page: Optional[Page] = None,
+    sessions: Optional[SessionCache] = None,
 ):
-    page, ctx, br = await launch_browser(headed=True)
-    try:
-        # Navigate to the Producer Portal
-        await page.goto(producer_base_url)
+    async with open_page(page) as page:
+        try:
+            # Create the file and reject a bad one locally, before driving the
+            # portal: rule errors, or a mismatch with this org's ORG file
+            pom_file_path = await create_pom_file(org_id)
+            await run_file_task(ensure_valid_pom_file, pom_file_path)
+            org_file_path = OUTPUT_DIR / f"org_{org_id}.csv"
+            if org_file_path.exists():
+                await run_file_task(ensure_org_pom_consistent, org_file_path, pom_file_path)
 
-        # Login
-        signin_page = SigninPage(page)
-        await signin_page.login(email, password)
+            # Navigate to the Producer Portal and login
+            signin_page = SigninPage(page)
+            await signin_page.login_with_session(producer_base_url, email, password, sessions)
 
-        # Navigate through dashboard and report flow
-        direct_producer_dashboard_page = DirectProducerDashboardPage(page)
-        report_packaging_data_page = await direct_producer_dashboard_page.click_report_packaging_data_link()
-        report_data_file_upload_page = await report_packaging_data_page.click_report_packaging_data_for_year_link(
-            "January to June 2025 (large producers)"
-        )
+            # Navigate through dashboard and report flow
+            direct_producer_dashboard_page = DirectProducerDashboardPage(page)
+            report_packaging_data_page = await direct_producer_dashboard_page.click_report_packaging_data_link()
+            report_data_file_upload_page = await report_packaging_data_page.click_report_packaging_data_for_year_link(
+                "January to June 2025 (large producers)"
+            )
 
-        # Create and upload the file
-        pom_file_path = await create_pom_file(org_id)
-        check_warnings_page = await report_data_file_upload_page.upload_report_packaging_data_file(pom_file_path)
+            # Upload the file
+            check_warnings_page = await report_data_file_upload_page.upload_report_packaging_data_file(pom_file_path)
         
-        # Handle subsequent pages
-        await check_warnings_page.click_keep_the_same_file_radio_button()
-        file_upload_check_file_and_submit_page = await check_warnings_page.click_continue_button()
-        await file_upload_check_file_and_submit_page.verify_packaging_data_uploaded_check_and_submit_text()
+            # Handle subsequent pages
+            await check_warnings_page.click_keep_the_same_file_radio_button()
+            file_upload_check_file_and_submit_page = await check_warnings_page.click_continue_button()
+            await file_upload_check_file_and_submit_page.verify_packaging_data_uploaded_check_and_submit_text()
 
-        # Submit and verify
-        file_upload_submission_declaration_page = await file_upload_check_file_and_submit_page.click_continue_button()
-        await file_upload_submission_declaration_page.enter_full_name("Automation Tester")
-        file_upload_submission_confirmation_page = await file_upload_submission_declaration_page.click_submit_file_button()
-        await file_upload_submission_confirmation_page.verify_packaging_data_submitted_to_regulator_text()
+            # Submit and verify
+            file_upload_submission_declaration_page = await file_upload_check_file_and_submit_page.click_continue_button()
+            await file_upload_submission_declaration_page.enter_full_name("Automation Tester")
+            file_upload_submission_confirmation_page = await file_upload_submission_declaration_page.click_submit_file_button()
+            await file_upload_submission_confirmation_page.verify_packaging_data_submitted_to_regulator_text()
 
-        print("✅ Packaging data submission flow completed successfully.")
+            print("✅ Packaging data submission flow completed successfully.")
+            return pom_file_path
 
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        await page.screenshot(path="output/pom_data_submission_data.png")
-        raise
-    finally:
-        await ctx.close()
-        await br.close()
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            await page.screenshot(
+                path=failure_screenshot_path("pom_data_submission", org_id)
+            )
+            raise
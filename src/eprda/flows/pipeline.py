@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from playwright.async_api import Page
+
+from eprda.tracing import step
+from eprda.ui.browser import BrowserPool
+
+if TYPE_CHECKING:
+    from eprda.flows.run_store import RunStore
+
+
+@dataclass
+class OrgJob:
+    """One organisation travelling through the pipeline."""
+    key: str
+    # seed inputs (email, company, ...)
+    data: Dict[str, Any] = field(default_factory=dict)
+    # stage name -> stage return value
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    # stage name -> ok | failed | skipped
+    status: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    durations: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return all(s == "ok" for s in self.status.values())
+
+
+StageFn = Callable[[OrgJob, Page], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A pipeline step wrapping one of the flow functions.
+    `run(job, page)` gets a fresh pooled page and returns the stage output;
+    `decode` rebuilds that output from its checkpointed JSON form on resume.
+    """
+    name: str
+    run: StageFn
+    depends_on: Tuple[str, ...] = ()
+    concurrency: int = 1
+    decode: Optional[Callable[[Any], Any]] = None
+
+
+def _topological_order(stages: Sequence[Stage]) -> List[Stage]:
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique")
+    for s in stages:
+        unknown = set(s.depends_on) - set(by_name)
+        if unknown:
+            raise ValueError(
+                f"Stage {s.name!r} depends on unknown stages: {sorted(unknown)}"
+            )
+
+    ordered: List[Stage] = []
+    state: Dict[str, str] = {}
+
+    def visit(s: Stage) -> None:
+        if state.get(s.name) == "done":
+            return
+        if state.get(s.name) == "visiting":
+            raise ValueError(f"Stage dependency cycle through {s.name!r}")
+        state[s.name] = "visiting"
+        for dep in s.depends_on:
+            visit(by_name[dep])
+        state[s.name] = "done"
+        ordered.append(s)
+
+    for s in stages:
+        visit(s)
+    return ordered
+
+
+class Pipeline:
+    """
+    Runs many OrgJobs through a DAG of stages at once.
+
+    Every (job, stage) pair is its own task: it waits only for the same job's
+    dependencies, then for a slot in that stage's semaphore. So stages overlap
+    across orgs (org 2 enrols while org 1 is being approved), each stage keeps
+    its own concurrency limit, and an org moves on as soon as its own
+    dependencies are done rather than when the whole batch is.
+    A failed stage marks its dependants as skipped for that org only.
+
+    With a RunStore, every stage outcome is checkpointed under `run_id`, and
+    stages already marked ok on a job (see RunStore.load_jobs) are not re-run.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        pool: BrowserPool,
+        on_job_done: Optional[Callable[[OrgJob], None]] = None,
+        store: Optional["RunStore"] = None,
+        run_id: Optional[str] = None,
+    ):
+        if store is not None and run_id is None:
+            raise ValueError("run_id is required when a RunStore is given")
+        self.stages = _topological_order(stages)
+        self.pool = pool
+        self.on_job_done = on_job_done
+        self.store = store
+        self.run_id = run_id
+        self._limits = {
+            s.name: asyncio.Semaphore(max(1, s.concurrency)) for s in self.stages
+        }
+
+    async def run(self, jobs: Iterable[OrgJob]) -> List[OrgJob]:
+        jobs = list(jobs)
+        if self.store is not None:
+            assert self.run_id is not None
+            self.store.save_jobs(self.run_id, jobs)
+        started = time.monotonic()
+        await asyncio.gather(*(self._run_job(job) for job in jobs))
+        elapsed = time.monotonic() - started
+
+        done = sum(1 for j in jobs if j.ok)
+        print(
+            f"📊 Pipeline: {done}/{len(jobs)} orgs completed all stages "
+            f"in {elapsed:.1f}s"
+        )
+        for s in self.stages:
+            runs = [
+                j.durations[s.name]
+                for j in jobs
+                if j.status.get(s.name) == "ok" and s.name in j.durations
+            ]
+            failed = sum(1 for j in jobs if j.status.get(s.name) == "failed")
+            avg = sum(runs) / len(runs) if runs else 0.0
+            print(
+                f"  {s.name:<10} ok={len(runs):<4} failed={failed:<4} "
+                f"avg={avg:.1f}s (concurrency={s.concurrency})"
+            )
+        return jobs
+
+    async def _run_job(self, job: OrgJob) -> None:
+        finished: Dict[str, asyncio.Event] = {
+            s.name: asyncio.Event() for s in self.stages
+        }
+        await asyncio.gather(*(self._run_stage(job, s, finished) for s in self.stages))
+        if self.on_job_done is not None:
+            self.on_job_done(job)
+
+    async def _run_stage(
+        self,
+        job: OrgJob,
+        stage: Stage,
+        finished: Dict[str, asyncio.Event],
+    ) -> None:
+        try:
+            if job.status.get(stage.name) == "ok":
+                # completed in an earlier attempt of this run
+                return
+            for dep in stage.depends_on:
+                await finished[dep].wait()
+            blocked = [d for d in stage.depends_on if job.status.get(d) != "ok"]
+            if blocked:
+                job.status[stage.name] = "skipped"
+                missing = ", ".join(blocked)
+                job.errors[stage.name] = f"dependency not completed: {missing}"
+                return
+
+            async with self._limits[stage.name]:
+                t0 = time.monotonic()
+                try:
+                    async with step(f"stage.{stage.name}"), self.pool.page() as page:
+                        job.outputs[stage.name] = await stage.run(job, page)
+                    job.status[stage.name] = "ok"
+                    print(f"✅ {job.key}: {stage.name}")
+                except Exception as exc:
+                    job.status[stage.name] = "failed"
+                    job.errors[stage.name] = f"{type(exc).__name__}: {exc}"
+                    print(f"❌ {job.key}: {stage.name} failed: {exc}")
+                finally:
+                    job.durations[stage.name] = round(time.monotonic() - t0, 2)
+                    if self.store is not None:
+                        assert self.run_id is not None
+                        self.store.record_stage(self.run_id, job, stage.name)
+        finally:
+            finished[stage.name].set()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from eprda.flows.pipeline import OrgJob
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+RUNS_DB = OUTPUT_DIR / "runs.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id     TEXT PRIMARY KEY,
+    profile    TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    params     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id  TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    data    TEXT NOT NULL,
+    PRIMARY KEY (run_id, job_key)
+);
+CREATE TABLE IF NOT EXISTS stage_results (
+    run_id     TEXT NOT NULL,
+    job_key    TEXT NOT NULL,
+    stage      TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    output     TEXT,
+    error      TEXT,
+    duration_s REAL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, job_key, stage)
+);
+"""
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _encode(value: Any) -> str:
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    # Paths (pathlib / anyio) and anything else non-JSON are stored as strings
+    return json.dumps(value, default=str)
+
+
+class RunStore:
+    """
+    Local SQLite checkpoint store for data-setup runs.
+
+    Records each run's parameters, each org's seed data and every stage
+    outcome with its output (EnrolmentResult, uploaded file paths, reference
+    numbers, ...), so a failed run can be resumed from the first incomplete
+    stage of each org instead of enrolling brand-new organisations.
+    """
+
+    def __init__(self, path: str | Path = RUNS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ---------- runs ----------
+    def create_run(self, run_id: str, profile: str, params: Mapping[str, Any]) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, profile, created_at, params) "
+                "VALUES (?, ?, ?, ?)",
+                (run_id, profile, _now(), json.dumps(params)),
+            )
+
+    def get_run(self, run_id: str) -> Dict[str, Any]:
+        row = self._conn.execute(
+            "SELECT * FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Run {run_id!r} not found in {self.path}")
+        return {
+            "run_id": run_id,
+            "profile": row["profile"],
+            "created_at": row["created_at"],
+            **json.loads(row["params"]),
+        }
+
+    # ---------- jobs ----------
+    def save_jobs(self, run_id: str, jobs: List[OrgJob]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, job_key, data) VALUES (?, ?, ?)",
+                [(run_id, job.key, _encode(job.data)) for job in jobs],
+            )
+
+    def load_jobs(
+        self,
+        run_id: str,
+        decoders: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    ) -> List[OrgJob]:
+        """
+        Rebuild a run's OrgJobs with every completed ('ok') stage pre-filled,
+        so the pipeline skips them. `decoders` turn stored JSON back into the
+        stage's output type (e.g. a dict back into an EnrolmentResult).
+        """
+        decoders = decoders or {}
+        jobs: Dict[str, OrgJob] = {}
+        rows = self._conn.execute(
+            "SELECT job_key, data FROM jobs WHERE run_id = ? ORDER BY job_key",
+            (run_id,),
+        )
+        for row in rows:
+            key = row["job_key"]
+            jobs[key] = OrgJob(key=key, data=json.loads(row["data"]))
+
+        rows = self._conn.execute(
+            "SELECT job_key, stage, output, duration_s FROM stage_results "
+            "WHERE run_id = ? AND status = 'ok'",
+            (run_id,),
+        )
+        for row in rows:
+            job = jobs.get(row["job_key"])
+            if job is None:
+                continue
+            output = json.loads(row["output"]) if row["output"] is not None else None
+            decode = decoders.get(row["stage"])
+            if decode and output is not None:
+                output = decode(output)
+            job.outputs[row["stage"]] = output
+            job.status[row["stage"]] = "ok"
+            job.durations[row["stage"]] = row["duration_s"] or 0.0
+        return list(jobs.values())
+
+    # ---------- stage results ----------
+    def record_stage(self, run_id: str, job: OrgJob, stage: str) -> None:
+        status = job.status.get(stage, "failed")
+        output = _encode(job.outputs.get(stage)) if status == "ok" else None
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stage_results "
+                "(run_id, job_key, stage, status, output, error, duration_s, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, job.key, stage, status, output,
+                    job.errors.get(stage), job.durations.get(stage), _now(),
+                ),
+            )
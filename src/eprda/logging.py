@@ -1,6 +1,11 @@
 import logging, sys, json, time, uuid
+from contextvars import ContextVar
+from pathlib import Path
 from typing import Optional
 
+# run id of the data-setup run the current task belongs to; added to every JSON record
+_run_id: ContextVar[Optional[str]] = ContextVar("eprda_run_id", default=None)
+
 def _json_formatter(record: logging.LogRecord) -> str:
     payload = {
         "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
@@ -8,23 +13,63 @@ def _json_formatter(record: logging.LogRecord) -> str:
         "name": record.name,
         "msg": record.getMessage(),
     }
+    run_id = getattr(record, "run_id", None) or _run_id.get()
+    if run_id:
+        payload["run_id"] = run_id
+    # structured fields passed as logger.info(msg, extra={"fields": {...}})
+    payload.update(getattr(record, "fields", None) or {})
     if record.exc_info:
         payload["exc_info"] = logging.Formatter().formatException(record.exc_info)
-    return json.dumps(payload)
+    return json.dumps(payload, default=str)
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         return _json_formatter(record)
 
-def configure_logging(level: int = logging.INFO) -> logging.Logger:
+def configure_logging(
+    level: int = logging.INFO,
+    path: Optional[str | Path] = None,
+) -> logging.Logger:
+    """
+    JSON logging for the `eprda` logger, to stdout or (with `path`) appended to a
+    JSON-lines file. Calling it again with a new path adds that file.
+    """
     logger = logging.getLogger("eprda")
-    if logger.handlers:
+    logger.setLevel(level)
+    if path is not None:
+        path = Path(path)
+        target = str(path.resolve())
+        if any(getattr(h, "baseFilename", None) == target for h in logger.handlers):
+            return logger
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+    elif logger.handlers:
         return logger
-    handler = logging.StreamHandler(sys.stdout)
+    else:
+        handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(JsonFormatter())
     logger.addHandler(handler)
-    logger.setLevel(level)
     return logger
 
 def new_run_id() -> str:
     return uuid.uuid4().hex[:12]
+
+def set_run_id(run_id: Optional[str]) -> None:
+    """
+    Tag log records (and tracing spans) from this task and the tasks it starts
+    with `run_id`.
+    """
+    _run_id.set(run_id)
+
+def current_run_id() -> Optional[str]:
+    return _run_id.get()
+
+def start_run(log_dir: str | Path, run_id: Optional[str] = None) -> str:
+    """
+    Tag this task's log records and spans with `run_id` (a new one by default)
+    and append them to `log_dir`/spans_<run_id>.jsonl. Returns the run id.
+    """
+    run_id = run_id or new_run_id()
+    set_run_id(run_id)
+    configure_logging(path=Path(log_dir) / f"spans_{run_id}.jsonl")
+    return run_id
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from eprda.logging import current_run_id
+
+logger = logging.getLogger("eprda.spans")
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+@dataclass
+class Span:
+    """One timed step: a page-object action or an explicit `step()` block."""
+    name: str
+    page_class: Optional[str] = None
+    method: Optional[str] = None
+    url: Optional[str] = None
+    parent: Optional[str] = None
+    run_id: Optional[str] = None
+    duration_s: float = 0.0
+    # duration_s minus the time spent in nested spans; while the span is open
+    # its children subtract their durations here
+    self_s: float = 0.0
+    status: str = "ok"
+    retries: int = 0
+    error: Optional[str] = None
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("eprda_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span of this task, e.g. to count retries on it."""
+    return _current.get()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+# (run id, step name)
+_StepKey = Tuple[Optional[str], str]
+
+
+class SpanStats:
+    """
+    Durations of finished spans per (run id, step name), for the end-of-run
+    table. Percentiles use each span's full duration; `self_s` sums only the
+    time not spent in nested spans, so it adds up across steps without
+    counting a page action again inside the stage that ran it.
+    """
+
+    def __init__(self):
+        self._durations: Dict[_StepKey, List[float]] = defaultdict(list)
+        self._self: Dict[_StepKey, float] = defaultdict(float)
+        self._failed: Dict[_StepKey, int] = defaultdict(int)
+
+    def add(self, span: Span) -> None:
+        key = (span.run_id, span.name)
+        self._durations[key].append(span.duration_s)
+        self._self[key] += span.self_s
+        if span.status != "ok":
+            self._failed[key] += 1
+
+    def rows(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Per-step count/p50/p95/max/total/self for `run_id` (default: all runs),
+        most self time first.
+        """
+        merged: Dict[str, List[float]] = defaultdict(list)
+        self_s: Dict[str, float] = defaultdict(float)
+        failed: Dict[str, int] = defaultdict(int)
+        for (rid, name), durations in self._durations.items():
+            if run_id is None or rid == run_id:
+                merged[name].extend(durations)
+                self_s[name] += self._self[(rid, name)]
+                failed[name] += self._failed.get((rid, name), 0)
+        rows = []
+        for name, durations in merged.items():
+            durations.sort()
+            rows.append({
+                "step": name,
+                "count": len(durations),
+                "failed": failed[name],
+                "p50_s": round(_percentile(durations, 0.50), 3),
+                "p95_s": round(_percentile(durations, 0.95), 3),
+                "max_s": round(durations[-1], 3),
+                "total_s": round(sum(durations), 3),
+                "self_s": round(self_s[name], 3),
+            })
+        return sorted(rows, key=lambda r: r["self_s"], reverse=True)
+
+    def table(self, run_id: Optional[str] = None, limit: int = 25) -> str:
+        rows = self.rows(run_id)[:limit]
+        if not rows:
+            return "⏱️  No steps recorded"
+        width = max(len(r["step"]) for r in rows)
+        lines = [f"⏱️  Step timings{f' for run {run_id}' if run_id else ''}:"]
+        lines.append(
+            f"  {'step':<{width}}  {'count':>6} {'failed':>6} "
+            f"{'p50':>8} {'p95':>8} {'max':>8} {'total':>9} {'self':>9}"
+        )
+        for r in rows:
+            lines.append(
+                f"  {r['step']:<{width}}  {r['count']:>6} {r['failed']:>6} "
+                f"{r['p50_s']:>7.2f}s {r['p95_s']:>7.2f}s {r['max_s']:>7.2f}s "
+                f"{r['total_s']:>8.1f}s {r['self_s']:>8.1f}s"
+            )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        self._durations.clear()
+        self._self.clear()
+        self._failed.clear()
+
+
+# Process-wide aggregate; flows print stats.table(run_id) at the end of a run
+stats = SpanStats()
+
+
+@asynccontextmanager
+async def step(
+    name: str,
+    url: Optional[str] = None,
+    **fields: Any,
+) -> AsyncIterator[Span]:
+    """
+    Time a block as a span, e.g. `async with step("companies_house.fetch"):`.
+    Bump `span.retries` inside the block when it retries something. The span
+    is logged to the `eprda.spans` JSON logger and added to `stats` on exit.
+    """
+    parent = _current.get()
+    span = Span(
+        name=name,
+        url=url,
+        parent=parent.name if parent is not None else None,
+        run_id=current_run_id(),
+        **fields,
+    )
+    token = _current.set(span)
+    started = time.monotonic()
+    try:
+        yield span
+    except BaseException as exc:
+        span.status = "failed"
+        span.error = f"{type(exc).__name__}: {exc}"[:500]
+        raise
+    finally:
+        duration = time.monotonic() - started
+        span.duration_s = round(duration, 3)
+        # concurrent children can overlap, so their sum may exceed the span
+        span.self_s = round(max(0.0, span.self_s + duration), 3)
+        _current.reset(token)
+        if parent is not None:
+            parent.self_s -= duration
+        stats.add(span)
+        logger.info(span.name, extra={"fields": {"span": asdict(span)}})
+
+
+def traced(fn: F) -> F:
+    """Wrap a page-object coroutine method in a `PageClass.method` span."""
+    if getattr(fn, "__traced__", False):
+        return fn
+
+    @functools.wraps(fn)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        page = getattr(self, "page", None)
+        cls = type(self).__name__
+        async with step(
+            f"{cls}.{fn.__name__}",
+            url=getattr(page, "url", None),
+            page_class=cls,
+            method=fn.__name__,
+        ):
+            return await fn(self, *args, **kwargs)
+
+    wrapper.__traced__ = True  # type: ignore[attr-defined]
+    return wrapper  # type: ignore[return-value]
+
+
+def trace_public_coroutines(cls: type) -> None:
+    """Apply `traced` to every public `async def` defined directly on `cls`."""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+            setattr(cls, attr, traced(value))
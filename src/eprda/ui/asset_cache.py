@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Set
+
+from playwright.async_api import BrowserContext, Route
+
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+ASSET_CACHE_DIR = OUTPUT_DIR / "asset_cache"
+CACHEABLE_TYPES = frozenset({"stylesheet", "script", "font", "image"})
+# Not replayed from disk: hop-by-hop headers, headers describing the encoded
+# transfer (bodies are stored decoded) and cookies (the cache is shared by
+# every context)
+_UNREPLAYED_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+    "content-length", "content-encoding", "set-cookie",
+})
+
+
+@dataclass
+class _Entry:
+    url: str
+    etag: str
+    last_modified: str
+    content_type: str
+    size: int
+    stored_at: float
+    last_used: float
+    body_file: str
+    # original response headers minus _UNREPLAYED_HEADERS (CORS, caching, ...)
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _key(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class AssetCache:
+    """
+    Disk cache for static portal assets (CSS/JS/fonts/images), shared by every
+    context and browser in the process, and by later runs through the cache dir.
+
+    Bodies are stored per URL + ETag. Within `ttl_s` a cached asset is served
+    without touching the network; after that it is revalidated with
+    If-None-Match / If-Modified-Since and only re-downloaded if it changed.
+    Concurrent requests for the same URL wait for the first download instead
+    of all fetching it. Hits are served with the original response headers,
+    and least recently used bodies are evicted beyond `max_bytes`. If the
+    network fetch fails, a stale copy is served (or the request continues
+    uncached). Last-use times are written back by `flush()`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = ASSET_CACHE_DIR,
+        max_bytes: int = 200 * 1024 * 1024,
+        ttl_s: float = 300,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stale = 0
+        self.bytes_served = 0
+        self._entries: Dict[str, _Entry] = {}
+        # urls whose metadata changed in memory since the last flush()
+        self._dirty: Set[str] = set()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._load_index()
+
+    # ---------- index ----------
+    def _meta_path(self, url: str) -> Path:
+        return self.cache_dir / f"{_key(url)}.json"
+
+    def _load_index(self) -> None:
+        for meta in self.cache_dir.glob("*.json"):
+            try:
+                entry = _Entry(**json.loads(meta.read_text(encoding="utf-8")))
+            except (ValueError, TypeError):
+                meta.unlink(missing_ok=True)
+                continue
+            if (self.cache_dir / entry.body_file).exists():
+                self._entries[entry.url] = entry
+
+    def _store(self, url: str, headers: Mapping[str, str], body: bytes) -> _Entry:
+        etag = headers.get("etag", "")
+        body_file = f"{_key(url, etag)}.body"
+        tmp = self.cache_dir / f".{body_file}.{os.getpid()}.tmp"
+        tmp.write_bytes(body)
+        os.replace(tmp, self.cache_dir / body_file)
+
+        old = self._entries.get(url)
+        if old is not None and old.body_file != body_file:
+            (self.cache_dir / old.body_file).unlink(missing_ok=True)
+        now = time.time()
+        entry = _Entry(
+            url=url,
+            etag=etag,
+            last_modified=headers.get("last-modified", ""),
+            content_type=headers.get("content-type", "application/octet-stream"),
+            size=len(body),
+            stored_at=now,
+            last_used=now,
+            body_file=body_file,
+            headers={
+                k: v for k, v in headers.items()
+                if k.lower() not in _UNREPLAYED_HEADERS
+            },
+        )
+        self._entries[url] = entry
+        self._dirty.discard(url)
+        self._write_meta(entry)
+        self._evict()
+        return entry
+
+    def _write_meta(self, entry: _Entry) -> None:
+        meta = self._meta_path(entry.url)
+        tmp = meta.with_name(f".{meta.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+        os.replace(tmp, meta)
+
+    def flush(self) -> None:
+        """Persist metadata updated by hits and revalidations."""
+        for url in sorted(self._dirty):
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._write_meta(entry)
+        self._dirty.clear()
+
+    def _evict(self) -> None:
+        total = sum(e.size for e in self._entries.values())
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_used):
+            if total <= self.max_bytes:
+                break
+            (self.cache_dir / entry.body_file).unlink(missing_ok=True)
+            self._meta_path(entry.url).unlink(missing_ok=True)
+            del self._entries[entry.url]
+            self._dirty.discard(entry.url)
+            total -= entry.size
+
+    # ---------- routing ----------
+    def cacheable(self, route: Route) -> bool:
+        request = route.request
+        return (
+            request.method == "GET" and request.resource_type in CACHEABLE_TYPES
+        )
+
+    async def handle(self, route: Route) -> None:
+        if not self.cacheable(route):
+            await route.fallback()
+            return
+        url = route.request.url
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(url)
+            if entry is not None and time.time() - entry.stored_at < self.ttl_s:
+                self.hits += 1
+                await self._fulfill_from_disk(route, entry)
+                return
+
+            headers = dict(route.request.headers)
+            if entry is not None:
+                if entry.etag:
+                    headers["if-none-match"] = entry.etag
+                if entry.last_modified:
+                    headers["if-modified-since"] = entry.last_modified
+            try:
+                response = await route.fetch(headers=headers)
+                body = await response.body()
+            except Exception:
+                # network error or page gone: never leave the request hanging
+                await self._fetch_failed(route, entry)
+                return
+
+            if entry is not None and response.status == 304:
+                self.revalidated += 1
+                entry.stored_at = time.time()
+                self._dirty.add(url)
+                await self._fulfill_from_disk(route, entry)
+                return
+
+            self.misses += 1
+            cache_control = response.headers.get("cache-control", "")
+            if response.status == 200 and "no-store" not in cache_control:
+                self._store(url, response.headers, body)
+            await route.fulfill(response=response, body=body)
+
+    async def _fetch_failed(self, route: Route, entry: Optional[_Entry]) -> None:
+        try:
+            if entry is not None:
+                self.stale += 1
+                await self._fulfill_from_disk(route, entry)
+            else:
+                await route.continue_()
+        except Exception:
+            # the page closed in the meantime; nothing is waiting for it
+            pass
+
+    async def _fulfill_from_disk(self, route: Route, entry: _Entry) -> None:
+        body = await asyncio.to_thread((self.cache_dir / entry.body_file).read_bytes)
+        # flushed so eviction in later runs is by last use, not by download
+        entry.last_used = time.time()
+        self._dirty.add(entry.url)
+        self.bytes_served += len(body)
+        headers = dict(entry.headers)
+        if not headers:  # entries cached before headers were kept
+            headers["content-type"] = entry.content_type
+            if entry.etag:
+                headers["etag"] = entry.etag
+        await route.fulfill(status=200, headers=headers, body=body)
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.route("**/*", self.handle)
+
+    def summary(self) -> str:
+        return (
+            f"📦 Asset cache: {self.hits} hits, {self.revalidated} revalidated, "
+            f"{self.misses} downloads, {self.stale} stale, "
+            f"{self.bytes_served / 1e6:.1f} MB served from {self.cache_dir}"
+        )
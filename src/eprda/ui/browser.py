@@ -1,9 +1,34 @@
-import os
-from playwright.async_api import async_playwright
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple, TypedDict
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from eprda.ui.routing import (
+    RouteRules,
+    flush_routes,
+    install_routes,
+    route_summary,
+)
+from eprda.ui.timeouts import apply_timeouts
 
 DEFAULT_BROWSER = "chrome"
 
-BROWSERS = {
+
+class BrowserSpec(TypedDict):
+    type: str
+    channel: Optional[str]
+
+
+BROWSERS: Dict[str, BrowserSpec] = {
     "chrome": {"type": "chromium", "channel": "chrome"},
     "edge": {"type": "chromium", "channel": "msedge"},
     "chromium": {"type": "chromium", "channel": None},
@@ -11,10 +36,227 @@ BROWSERS = {
     "webkit": {"type": "webkit", "channel": None},
 }
 
-async def launch_browser(headed=False):
+
+async def _launch_one_off(headed: bool) -> Tuple[Playwright, Browser, BrowserContext]:
+    """A driver, browser and routed context for a single flow or test."""
     print(f"🚀 Launching browser: chrome (headed={headed})")
     playwright = await async_playwright().start()
-    browser = await playwright.chromium.launch(headless=not headed, args=["--start-maximized"])
+    browser = await playwright.chromium.launch(
+        headless=not headed, args=["--start-maximized"]
+    )
     context = await browser.new_context()
+    apply_timeouts(context)
+    await install_routes(context)
+    return playwright, browser, context
+
+
+async def launch_browser(headed=False):
+    _, browser, context = await _launch_one_off(headed)
     page = await context.new_page()
-    return page, context, browser
\ No newline at end of file
+    return page, context, browser
+
+
+@asynccontextmanager
+async def open_page(
+    page: Optional[Page] = None,
+    headed: bool = True,
+) -> AsyncIterator[Page]:
+    """
+    Yield the page a flow should drive.
+
+    - If a page is supplied (e.g. from a BrowserPool), it is yielded as-is and
+      left open; the owner of the page is responsible for closing it.
+    - Otherwise a one-off driver + browser is launched and fully torn down
+      (context, browser and the Playwright driver) on exit.
+    """
+    if page is not None:
+        yield page
+        return
+
+    playwright, browser, context = await _launch_one_off(headed)
+    try:
+        yield await context.new_page()
+    finally:
+        await context.close()
+        await browser.close()
+        await playwright.stop()
+        flush_routes()
+        print(route_summary())
+
+
+class BrowserPool:
+    """
+    A fixed set of long-lived browsers behind a single Playwright driver.
+
+    Flows borrow an isolated BrowserContext (or a Page inside one) via the
+    async context managers `context()` / `page()`. Each context is closed when
+    it is handed back, and a browser is relaunched after `max_contexts_per_browser`
+    contexts (or if it has crashed) so long runs don't accumulate memory.
+    Every context gets the request-blocking rules from eprda.ui.routing
+    (`route_rules`, default: the configured profile's rules) and the
+    profile's default timeouts from eprda.ui.timeouts.
+
+        async with BrowserPool(size=4) as pool:
+            async with pool.page() as page:
+                await create_dp_enrolment_flow(..., page=page)
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        headed: bool = False,
+        browser: str = "chromium",
+        max_contexts_per_browser: int = 50,
+        launch_args: Optional[List[str]] = None,
+        route_rules: Optional[RouteRules] = None,
+    ):
+        if size < 1:
+            raise ValueError("BrowserPool size must be >= 1")
+        if browser not in BROWSERS:
+            raise ValueError(
+                f"Unknown browser {browser!r}. Allowed: {sorted(BROWSERS)}"
+            )
+        self.size = size
+        self.headed = headed
+        self.browser_name = browser
+        self.max_contexts_per_browser = max_contexts_per_browser
+        if launch_args is None:
+            launch_args = ["--start-maximized"]
+        self.launch_args = launch_args
+        self.route_rules = route_rules
+
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[Optional[Browser]] = []
+        self._active: List[int] = []
+        self._uses: List[int] = []
+        self._lock = asyncio.Lock()
+        self._released = asyncio.Condition(self._lock)
+
+    # ---------- lifecycle ----------
+    async def start(self) -> "BrowserPool":
+        if self._playwright is not None:
+            return self
+        print(
+            f"🚀 Starting browser pool: {self.size} x {self.browser_name} "
+            f"(headed={self.headed})"
+        )
+        self._playwright = await async_playwright().start()
+        self._browsers = [None] * self.size
+        self._active = [0] * self.size
+        self._uses = [0] * self.size
+        for slot in range(self.size):
+            self._browsers[slot] = await self._launch()
+        return self
+
+    async def close(self) -> None:
+        if self._playwright is None:
+            return
+        for browser in self._browsers:
+            if browser is not None and browser.is_connected():
+                await browser.close()
+        self._browsers = []
+        await self._playwright.stop()
+        self._playwright = None
+        flush_routes()
+        print(route_summary())
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    # ---------- borrowing ----------
+    @asynccontextmanager
+    async def context(self, **context_kwargs) -> AsyncIterator[BrowserContext]:
+        """Borrow a fresh, isolated BrowserContext on the least busy browser."""
+        slot = await self._acquire_slot()
+        context: Optional[BrowserContext] = None
+        try:
+            browser = self._browsers[slot]
+            assert browser is not None
+            context = await browser.new_context(**context_kwargs)
+            apply_timeouts(context)
+            await install_routes(context, self.route_rules)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    # browser may already be gone; the slot is recycled below
+                    pass
+            await self._release_slot(slot)
+
+    @asynccontextmanager
+    async def page(self, **context_kwargs) -> AsyncIterator[Page]:
+        """Borrow a Page inside its own fresh BrowserContext."""
+        async with self.context(**context_kwargs) as context:
+            yield await context.new_page()
+
+    # ---------- internals ----------
+    async def _launch(self) -> Browser:
+        assert self._playwright is not None
+        spec = BROWSERS[self.browser_name]
+        browser_type = getattr(self._playwright, spec["type"])
+        kwargs: Dict[str, object] = {
+            "headless": not self.headed,
+            "args": self.launch_args,
+        }
+        if spec["channel"]:
+            kwargs["channel"] = spec["channel"]
+        return await browser_type.launch(**kwargs)
+
+    def _needs_recycle(self, slot: int) -> bool:
+        browser = self._browsers[slot]
+        return (
+            browser is None
+            or not browser.is_connected()
+            or self._uses[slot] >= self.max_contexts_per_browser
+        )
+
+    async def _acquire_slot(self) -> int:
+        if self._playwright is None:
+            raise RuntimeError(
+                "BrowserPool is not started; use 'async with BrowserPool(...)'"
+            )
+        async with self._lock:
+            while True:
+                # a slot due for recycling is only usable once it has drained,
+                # so one draining browser never blocks the healthy ones
+                usable = [
+                    i
+                    for i in range(self.size)
+                    if self._active[i] == 0 or not self._needs_recycle(i)
+                ]
+                if usable:
+                    break
+                await self._released.wait()
+            slot = min(usable, key=lambda i: (self._active[i], self._needs_recycle(i)))
+            recycle = self._needs_recycle(slot)
+            stale = self._browsers[slot]
+            if recycle:
+                # reserve the slot: with no browser and an active count it is
+                # skipped by everyone else while it relaunches outside the lock
+                self._browsers[slot] = None
+                self._uses[slot] = 0
+            self._active[slot] += 1
+            self._uses[slot] += 1
+        if not recycle:
+            return slot
+
+        try:
+            if stale is not None and stale.is_connected():
+                await stale.close()
+            browser = await self._launch()
+        except BaseException:
+            await self._release_slot(slot)
+            raise
+        async with self._lock:
+            self._browsers[slot] = browser
+        return slot
+
+    async def _release_slot(self, slot: int) -> None:
+        async with self._lock:
+            self._active[slot] -= 1
+            self._released.notify_all()
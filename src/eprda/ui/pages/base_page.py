@@ -1,11 +1,225 @@
-from playwright.async_api import Page, expect
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Pattern, Union
+
+from playwright.async_api import Locator, Page, Response, expect
+
+from eprda.tracing import current_span, trace_public_coroutines
+from eprda.ui.timeouts import timeouts
+
+UrlMatcher = Union[str, Pattern[str], Callable[[str], bool]]
+ResponseMatcher = Union[str, Pattern[str], Callable[[Response], bool]]
+
+TableRow = Dict[str, Any]
+GOVUK_TABLE = "table.govuk-table"
+GOVUK_NEXT_PAGE = ".govuk-pagination__next a"
+
+# Runs in the page: the whole table (and the next-page link) in one round trip.
+# Each row maps header text -> cell text, plus _index (position in the body),
+# _id, _cells (texts in column order), _links and _buttons.
+_EXTRACT_TABLE_JS = """
+([selector, nextSelector]) => {
+  const clean = (s) => (s || "").replace(/\\s+/g, " ").trim();
+  const next = nextSelector ? document.querySelector(nextSelector) : null;
+  const result = { rows: [], next: next ? next.href : null };
+  const table = document.querySelector(selector);
+  if (!table) return result;
+  const headers = Array.from(table.querySelectorAll("thead th"))
+    .map((th) => clean(th.innerText));
+  const rows = Array.from(table.tBodies).flatMap((body) => Array.from(body.rows));
+  rows.forEach((tr, index) => {
+    const cells = Array.from(tr.cells).map((cell) => clean(cell.innerText));
+    const row = { _index: index, _id: tr.id || null, _cells: cells };
+    cells.forEach((text, i) => { row[headers[i] || `column_${i + 1}`] = text; });
+    row._links = Array.from(tr.querySelectorAll("a[href]")).map((a) => ({
+      text: clean(a.innerText), href: a.href, id: a.id || null,
+    }));
+    const buttons = tr.querySelectorAll("button, input[type=submit], [role=button]");
+    row._buttons = Array.from(buttons).map((b) => ({
+      text: clean(b.innerText || b.value), id: b.id || null, href: b.href || null,
+    }));
+    result.rows.push(row);
+  });
+  return result;
+}
+"""
+
+
+def is_form_post(response: Response) -> bool:
+    """The response to a submitted form (e.g. a file upload), not an XHR or asset."""
+    request = response.request
+    return request.method == "POST" and request.resource_type == "document"
+
 
 class BasePage:
+    """
+    Every public async method of a page object (here and in subclasses) is
+    recorded as a `PageClass.method` timing span, see eprda.tracing.
+
+    Waits take their limits from the profile's TimeoutBudget (eprda.ui.timeouts)
+    instead of fixed timeouts, and return as soon as the portal answers.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        trace_public_coroutines(cls)
+
     def __init__(self, page: Page):
         self.page = page
+        self.error_summary = page.locator(".govuk-error-summary")
 
     async def goto(self, url: str):
         await self.page.goto(url)
 
     async def assert_heading(self, name: str):
-        await expect(self.page.get_by_role("heading", name=name)).to_be_visible()
\ No newline at end of file
+        await expect(self.page.get_by_role("heading", name=name)).to_be_visible()
+
+    # ---------- tables ----------
+    async def _read_table(
+        self,
+        selector: str,
+        next_selector: Optional[str],
+    ) -> Dict[str, Any]:
+        # tables are server rendered; once the document is parsed they are complete
+        await self.page.wait_for_load_state("domcontentloaded")
+        return await self.page.evaluate(_EXTRACT_TABLE_JS, [selector, next_selector])
+
+    async def extract_table(self, selector: str = GOVUK_TABLE) -> List[TableRow]:
+        """
+        Rows of the first table matching `selector` on the current page, read
+        in a single evaluate call (no per-cell locators); [] if there is no table.
+        Each row maps header text to cell text, plus `_index`, `_id`, `_cells`,
+        `_links` ({text, href, id}) and `_buttons` ({text, id, href}).
+        """
+        return (await self._read_table(selector, None))["rows"]
+
+    async def iter_table_pages(
+        self,
+        selector: str = GOVUK_TABLE,
+        next_selector: str = GOVUK_NEXT_PAGE,
+        max_pages: Optional[int] = None,
+    ) -> AsyncIterator[List[TableRow]]:
+        """
+        Yield the table rows of this page and of each following results page,
+        following the GOV.UK pagination "Next" link only when the caller asks
+        for more. One evaluate call plus one navigation per page.
+        """
+        pages = 0
+        while True:
+            table = await self._read_table(selector, next_selector)
+            yield table["rows"]
+            pages += 1
+            if not table["next"] or (max_pages is not None and pages >= max_pages):
+                return
+            await self.page.goto(table["next"], wait_until="domcontentloaded")
+
+    def table_row(self, row: TableRow, selector: str = GOVUK_TABLE) -> Locator:
+        """Locator for an extracted row, e.g. to click one of its buttons."""
+        rows = self.page.locator(selector).first.locator("tbody tr")
+        return rows.nth(row["_index"])
+
+    # ---------- waits ----------
+    async def click_and_wait_for_url(
+        self,
+        target: Locator,
+        url: UrlMatcher,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """
+        Click `target` and return once the page has navigated to `url` (glob,
+        regex or predicate).
+        """
+        await target.click()
+        await self.page.wait_for_url(
+            url,
+            wait_until="domcontentloaded",
+            timeout=timeout_ms or timeouts().navigation,
+        )
+
+    async def click_and_wait_for_navigation(
+        self,
+        target: Locator,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """
+        Click `target` (e.g. a form's submit button) and return once the new
+        document has loaded, even when it is served at the same URL.
+        """
+        async with self.page.expect_navigation(
+            wait_until="domcontentloaded",
+            timeout=timeout_ms or timeouts().navigation,
+        ):
+            await target.click()
+
+    async def click_and_wait_for_response(
+        self,
+        target: Locator,
+        response: ResponseMatcher,
+        timeout_ms: Optional[int] = None,
+    ) -> Response:
+        """
+        Click `target` and return the first response matching `response` (URL
+        glob, regex or predicate such as `is_form_post`). Raises RuntimeError on
+        a 4xx/5xx.
+        """
+        timeout = timeout_ms or timeouts().navigation
+        async with self.page.expect_response(response, timeout=timeout) as info:
+            await target.click()
+        resp = await info.value
+        if resp.status >= 400:
+            raise RuntimeError(
+                f"{resp.request.method} {resp.url} returned {resp.status}"
+            )
+        return resp
+
+    async def wait_for_status(
+        self,
+        status: Locator,
+        done: Optional[Union[str, Pattern[str]]] = None,
+        failed: Optional[Locator] = None,
+        reload: bool = False,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """
+        Wait for server-side processing to finish: until `status` shows `done`
+        (or, without `done`, is visible). Each check waits up to the current poll
+        interval and returns the moment the element matches; between checks the
+        page is optionally reloaded and the interval backs off from
+        poll_initial to poll_max. Raises RuntimeError if `failed` (default: the
+        GOV.UK error summary) appears, TimeoutError after timeout_ms (default:
+        the processing budget).
+        """
+        budget = timeouts()
+        failed = failed if failed is not None else self.error_summary
+        timeout_ms = timeout_ms or budget.processing
+        deadline = time.monotonic() + timeout_ms / 1000
+        interval = budget.poll_initial
+        while True:
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"{type(self).__name__}: status not reached within {timeout_ms} ms"
+                )
+            check = min(interval, remaining)
+            try:
+                if done is None:
+                    await expect(status).to_be_visible(timeout=check)
+                else:
+                    await expect(status).to_have_text(done, timeout=check)
+                return
+            except AssertionError:
+                pass
+            if await failed.count() and await failed.first.is_visible():
+                message = re.sub(r"\s+", " ", await failed.first.inner_text()).strip()
+                raise RuntimeError(f"{type(self).__name__}: {message}")
+            span = current_span()
+            if span is not None:
+                span.retries += 1
+            if reload:
+                await self.page.reload(wait_until="domcontentloaded")
+            interval = min(interval * 2, budget.poll_max)
+
+
+trace_public_coroutines(BasePage)
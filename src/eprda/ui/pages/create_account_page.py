@@ -1,10 +1,13 @@
 from __future__ import annotations
-import asyncio
+import time
+from datetime import datetime, timezone
 from typing import Optional
 
 from playwright.async_api import Page, expect
 from sqlalchemy import Enum
 from eprda.clients.notifications_client import NotificationsClient
+from eprda.tracing import step
+from eprda.ui.timeouts import timeouts
 from .base_page import BasePage
 
 # ==========================================================
@@ -34,25 +37,32 @@ class CreateAccountPage(BasePage):
         self._notifications = notifications
 
     async def create_producer_account(self, email: str) -> RegisteredCharityPage:
+        if not self._notifications:
+            raise RuntimeError("NotificationsClient is not set on CreateAccountPage")
+
         await self.email_input.fill(email)
+        sent_at = datetime.now(timezone.utc)
         await self.send_verification_code_button.click()
-        await asyncio.sleep(1)
-        if not self._notifications:
-            raise RuntimeError("NotificationsClient is not set on CreateAccountPage")    
+        await expect(self.verification_code_input).to_be_visible()
 
-        body = await self._notifications.fetch_notification_body(email)
-        verification_code = self._notifications.extract_verification_code(body)
+        async with step("notify.wait_for_verification_code"):
+            verification_code = await self._notifications.wait_for_verification_code(
+                email,
+                deadline=time.monotonic() + timeouts().verification_code / 1000,
+                since=sent_at,
+            )
 
         print(f"Email: {email}")
         print(f"Verification code retrieved: {verification_code}")
-        
+
         await self.verification_code_input.fill(verification_code)
-        await asyncio.sleep(1)
         await self.verify_code_button.click()
+        # B2C hides the verify button once the code has been accepted
+        await expect(self.verify_code_button).to_be_hidden()
 
         await self.new_password_input.fill("Password123")
         await self.retype_password_input.fill("Password123")
-        await asyncio.sleep(1)
+        await expect(self.create_button).to_be_enabled()
         await self.create_button.click()
         return RegisteredCharityPage(self.page)
 
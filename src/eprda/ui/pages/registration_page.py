@@ -1,7 +1,7 @@
 from __future__ import annotations
 import re
 from playwright.async_api import Page, expect
-from .base_page import BasePage
+from .base_page import BasePage, is_form_post
 
 # ==========================================================
 # RegistrationGuidancePage
@@ -50,7 +50,7 @@ class UploadOrganisationDetailsPage(BasePage):
 
     async def upload_organisation_details_file(self, csvFilePath) -> OrganisationDetailsUploadedPage:
         await self.choose_file_input.set_input_files(csvFilePath)
-        await self.upload_file_button.click()
+        await self.click_and_wait_for_response(self.upload_file_button, is_form_post)
         return OrganisationDetailsUploadedPage(self.page)
 
 # ==========================================================
@@ -61,10 +61,13 @@ class OrganisationDetailsUploadedPage(BasePage):
     def __init__(self, page: Page):
         super().__init__(page)
         self.continue_button = page.get_by_role("link", name="Continue")
+        self.banner_title = page.locator("#govuk-notification-banner-title")
+        self.banner_heading = page.locator("h3.govuk-notification-banner__heading")
 
     async def verify_organisation_details_uploaded(self):
-        await expect(self.page.locator("#govuk-notification-banner-title")).to_have_text("Success", timeout=30000)
-        await expect(self.page.locator("h3.govuk-notification-banner__heading")).to_have_text("Organisation details uploaded")
+        # the portal checks the file server-side; move on as soon as it reports back
+        await self.wait_for_status(self.banner_title, "Success")
+        await expect(self.banner_heading).to_have_text("Organisation details uploaded")
     
     async def click_continue_button(self) -> ReviewOrganisationDataPage:
         await self.continue_button.click()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from enum import Enum
 import re
+from typing import Any, AsyncGenerator, Dict, List, Optional
 from playwright.async_api import Page, expect
-from .base_page import BasePage
+from .base_page import BasePage, TableRow
 
 # ==========================================================
 # RegulatorHomePage
@@ -52,16 +53,54 @@ class RegulatorApplicationsPage(BasePage):
         self.apply_filters_button = page.get_by_role("button", name="Apply filters")
         self.accept_approved_person_button = page.locator("#acceptApprovedPersonButton")
         self.approved_person_accepted_banner = page.locator("#govuk-notification-banner-title")
-        
+
     async def search_organisation_name(self, company_name: str):
         await self.search_organisation_name_input.fill(company_name)
-        await self.apply_filters_button.click()
-    
+        # the results table is read straight after, so wait for the filtered page
+        await self.click_and_wait_for_navigation(self.apply_filters_button)
+
+    @staticmethod
+    def _view_button(row: TableRow) -> Optional[Dict[str, Any]]:
+        return next((b for b in row["_buttons"] if b["text"] == "View"), None)
+
+    async def application_rows(self) -> List[TableRow]:
+        """Application rows (those with a View button) on the current results page."""
+        return [row for row in await self.extract_table() if self._view_button(row)]
+
     async def accept_approved_person(self, company_name: str):
-        row = self.page.locator("tr", has_text=company_name)
-        await row.get_by_role("button", name="View").click()
+        rows = await self.application_rows()
+        row = next(
+            (r for r in rows if r["_cells"] and r["_cells"][0] == company_name), None
+        )
+        if row is None:
+            # partial match, as the portal may append details to the name
+            row = next(
+                (r for r in rows if any(company_name in c for c in r["_cells"])), None
+            )
+        if row is None:
+            raise ValueError(f"No application row for {company_name!r}")
+        view = self._view_button(row)
+        if view is not None and view["href"]:
+            await self.page.goto(view["href"])
+        else:
+            await self.table_row(row).get_by_role("button", name="View").click()
         await self.accept_approved_person_button.click()
         await expect(self.approved_person_accepted_banner).to_have_text("Accepted")
+
+    async def iter_organisation_names(
+        self,
+        max_pages: Optional[int] = None,
+    ) -> AsyncGenerator[List[str], None]:
+        """
+        Organisation names of the application rows, one list per results page,
+        paging lazily.
+        """
+        async for rows in self.iter_table_pages(max_pages=max_pages):
+            yield [
+                row["_cells"][0]
+                for row in rows
+                if self._view_button(row) and row["_cells"]
+            ]
         
 # ==========================================================
 # ManageRegistrationSubmissionsPage
@@ -71,26 +110,26 @@ class ManageRegistrationSubmissionsPage(BasePage):
         super().__init__(page)       
         self.search_organisation_name_input = page.locator("#OrganisationName")
         self.apply_filters_button = page.get_by_role("button", name="Apply filters")
-        self.organisation_id_and_reference_number = page.locator("td.govuk-table__cell", has_text="Organisation ID and reference number")
 
     async def search_organisation_name(self, company_name: str):
         await self.search_organisation_name_input.fill(company_name)
-        await self.apply_filters_button.click()
+        # get_reference_number reads the table next, so wait for the filtered page
+        await self.click_and_wait_for_navigation(self.apply_filters_button)
         
     async def select_organisation(self, company_name: str) -> RegistrationSubmissionDetailsPage:
         await self.page.get_by_role("link", name=company_name).click()
         return RegistrationSubmissionDetailsPage(self.page)
     
     async def get_reference_number(self) -> str:
-        element_text = await self.reference_cell.inner_text()
-        # Extract the reference number using regex
-        match = re.search(r"R\d{2}[A-Z]{2}\d{10,}", element_text.strip())
-        if match:
-            reference_number = match.group(0)
-            print(f"Reference Number: {reference_number}")
-            return reference_number
-        else:
-            raise ValueError("Reference number not found in table cell text.")
+        # one read of the results table instead of a locator per cell
+        for row in await self.extract_table():
+            for cell in row["_cells"]:
+                match = re.search(r"R\d{2}[A-Z]{2}\d{10,}", cell)
+                if match:
+                    reference_number = match.group(0)
+                    print(f"Reference Number: {reference_number}")
+                    return reference_number
+        raise ValueError("Reference number not found in table cell text.")
 
 # ==========================================================
 # RegistrationSubmissionDetailsPage
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from playwright.async_api import Page, expect
-from .base_page import BasePage
+from .base_page import BasePage, is_form_post
 
 # ==========================================================
 # ReportPackagingDataPage
@@ -28,7 +28,7 @@ class ReportDataFileUploadPage(BasePage):
 
     async def upload_report_packaging_data_file(self, csvFilePath) -> CheckWarningsPage:
         await self.choose_file_input.set_input_files(csvFilePath)
-        await self.upload_file_button.click()
+        await self.click_and_wait_for_response(self.upload_file_button, is_form_post)
         return CheckWarningsPage(self.page)
 
 # ==========================================================
@@ -41,6 +41,8 @@ class CheckWarningsPage(BasePage):
         self.continue_button = page.get_by_role("button", name="Continue")
 
     async def click_keep_the_same_file_radio_button(self):
+        # shown once the portal has finished checking the uploaded file
+        await self.wait_for_status(self.keep_the_same_file_radio_button)
         await self.keep_the_same_file_radio_button.click()
 
     async def click_continue_button(self) -> FileUploadCheckFileAndSubmitPage:
@@ -1,6 +1,8 @@
 from __future__ import annotations
+from typing import Optional
 from playwright.async_api import Page
 from .base_page import BasePage
+from eprda.ui.session_cache import SessionCache, restore_storage_state
 
 class SigninPage(BasePage):
     # -------------------------
@@ -18,7 +20,46 @@ class SigninPage(BasePage):
         await self.page.locator(self.EMAIL_INPUT).fill(email)
         await self.page.locator(self.PASSWORD_INPUT).fill(password)
         await self.page.locator(self.NEXT_BUTTON).click()
-        
+
+    async def is_displayed(self, base_url: str) -> bool:
+        """True when the portal has redirected us to the sign-in page."""
+        if not self.page.url.startswith(base_url):
+            return True
+        return await self.page.locator(self.PASSWORD_INPUT).is_visible()
+
+    async def login_with_session(
+        self,
+        base_url: str,
+        email: str,
+        password: str,
+        sessions: Optional[SessionCache] = None,
+    ):
+        """
+        Open `base_url` signed in as `email`.
+
+        With a SessionCache, a saved storage state is replayed first; if the
+        portal still redirects to the sign-in page the session has expired, so
+        the snapshot is dropped and we fall back to a normal login, saving the
+        fresh session for the next caller.
+        """
+        state = None
+        if sessions is not None:
+            state = sessions.load(base_url, email)
+            if state:
+                await restore_storage_state(self.page.context, state)
+        await self.page.goto(base_url)
+
+        if sessions is not None and state:
+            if not await self.is_displayed(base_url):
+                print(f"🔑 Reusing saved session for {email}")
+                return
+            sessions.invalidate(base_url, email)
+
+        await self.login(email, password)
+        if sessions is not None:
+            await self.page.wait_for_url(lambda url: url.startswith(base_url))
+            await sessions.save(self.page.context, base_url, email)
+
     async def click_create_new_account(self):
         from src.eprda.ui.pages.create_account_page import CreateAccountPage
         await self.page.locator(self.CREATE_NEW_ACCOUNT_LINK).click()
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, FrozenSet, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Route
+
+from eprda.ui.asset_cache import AssetCache
+
+if TYPE_CHECKING:
+    from eprda.config.config import EnvConfig
+
+# The flows only need GOV.UK Design System HTML, CSS and JS
+DEFAULT_BLOCK_RESOURCE_TYPES = ("image", "media", "font")
+DEFAULT_BLOCK_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "clarity.ms",
+    "hotjar.com",
+    "applicationinsights.azure.com",
+)
+
+# Resource types can only be told apart once a request is intercepted, so the
+# route pattern picks candidate URLs by file extension; a font or image served
+# without one of these extensions is not blocked by type
+_TYPE_EXTENSIONS: Dict[str, Tuple[str, ...]] = {
+    "image": ("apng", "avif", "bmp", "gif", "ico", "jpeg", "jpg", "png", "svg", "webp"),
+    "font": ("eot", "otf", "ttf", "woff", "woff2"),
+    "media": ("m4a", "mov", "mp3", "mp4", "ogg", "wav", "webm"),
+    "stylesheet": ("css",),
+    "script": ("js", "mjs"),
+}
+
+# Rough transfer sizes used to estimate bytes saved (blocked requests are never fetched)
+_TYPICAL_BYTES = {
+    "image": 25_000,
+    "media": 250_000,
+    "font": 40_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+}
+_DEFAULT_BYTES = 5_000
+
+
+def _split(raw: Optional[str]) -> Tuple[str, ...]:
+    return tuple(v.strip().lower() for v in (raw or "").split(",") if v.strip())
+
+
+def _domain_matches(host: str, domains: FrozenSet[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def _escape(text: str) -> str:
+    # the pattern is matched by the Playwright driver, so it must also be a
+    # valid JavaScript regex: escape only what both dialects treat as special
+    return re.sub(r"[.*+?^${}()|[\]\\/]", r"\\\g<0>", text)
+
+
+def _glob_regex(pattern: str) -> str:
+    """An fnmatch-style pattern ("*" and "?") as an anchored regex."""
+    return "^" + _escape(pattern).replace(r"\*", ".*").replace(r"\?", ".") + "$"
+
+
+@dataclass(frozen=True)
+class RouteRules:
+    """
+    What a context may load. A request is blocked when its resource type,
+    domain or URL pattern (fnmatch, e.g. "*/assets/images/*") is on a block
+    list, unless its domain or URL pattern is allowlisted.
+    """
+    enabled: bool = True
+    block_resource_types: FrozenSet[str] = frozenset(DEFAULT_BLOCK_RESOURCE_TYPES)
+    block_domains: FrozenSet[str] = frozenset(DEFAULT_BLOCK_DOMAINS)
+    block_patterns: Tuple[str, ...] = ()
+    allow_domains: FrozenSet[str] = frozenset()
+    allow_patterns: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls, env: "EnvConfig") -> "RouteRules":
+        """
+        Rules for an environment profile. Every key is optional:
+          ROUTE_BLOCKING=false              turn blocking off
+          ROUTE_BLOCK_RESOURCE_TYPES=image,font,media
+          ROUTE_BLOCK_DOMAINS=...           added to the analytics defaults
+          ROUTE_BLOCK_PATTERNS=*/beacon*    fnmatch patterns on the full URL
+          ROUTE_ALLOW_DOMAINS=... / ROUTE_ALLOW_PATTERNS=...  always let through
+        """
+        types = env.get("ROUTE_BLOCK_RESOURCE_TYPES")
+        if types is None:
+            block_types = frozenset(DEFAULT_BLOCK_RESOURCE_TYPES)
+        else:
+            block_types = frozenset(_split(types))
+        domains = DEFAULT_BLOCK_DOMAINS + _split(env.get("ROUTE_BLOCK_DOMAINS"))
+        return cls(
+            enabled=env.get_bool("ROUTE_BLOCKING", default=True),
+            block_resource_types=block_types,
+            block_domains=frozenset(domains),
+            block_patterns=_split(env.get("ROUTE_BLOCK_PATTERNS")),
+            allow_domains=frozenset(_split(env.get("ROUTE_ALLOW_DOMAINS"))),
+            allow_patterns=_split(env.get("ROUTE_ALLOW_PATTERNS")),
+        )
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Why a request should be blocked, or None to let it through."""
+        if not self.enabled:
+            return None
+        host = (urlsplit(url).hostname or "").lower()
+        lowered = url.lower()
+        if _domain_matches(host, self.allow_domains):
+            return None
+        if any(fnmatch.fnmatch(lowered, p) for p in self.allow_patterns):
+            return None
+        if resource_type in self.block_resource_types:
+            return f"type:{resource_type}"
+        if _domain_matches(host, self.block_domains):
+            return f"domain:{host}"
+        for pattern in self.block_patterns:
+            if fnmatch.fnmatch(lowered, pattern):
+                return f"pattern:{pattern}"
+        return None
+
+    def route_pattern(self) -> Optional[Pattern[str]]:
+        """
+        URLs that might be blocked: blocked domains, block patterns and file
+        extensions of the blocked resource types. Only these are routed to
+        the handler; None when nothing can be blocked.
+        """
+        if not self.enabled:
+            return None
+        parts = []
+        if self.block_domains:
+            hosts = "|".join(_escape(d) for d in sorted(self.block_domains))
+            scheme = r"^[a-z][a-z0-9+.-]*://"
+            parts.append(rf"{scheme}([^/?#]*\.)?({hosts})(:\d+)?([/?#]|$)")
+        extensions = sorted(
+            {e for t in self.block_resource_types for e in _TYPE_EXTENSIONS.get(t, ())}
+        )
+        if extensions:
+            parts.append(rf"\.({'|'.join(extensions)})([?#]|$)")
+        parts.extend(_glob_regex(p) for p in self.block_patterns)
+        if not parts:
+            return None
+        return re.compile("|".join(parts), re.IGNORECASE)
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    blocked: int = 0
+    est_bytes_saved: int = 0
+    by_reason: Counter = field(default_factory=Counter)
+
+    def summary(self) -> str:
+        top = ", ".join(f"{reason}={n}" for reason, n in self.by_reason.most_common(5))
+        # the saving is estimated from typical sizes: blocked requests are
+        # never fetched, so their real size is unknown
+        saved = self.est_bytes_saved / 1e6
+        return (
+            f"🚧 Blocked {self.blocked}/{self.requests} routed requests "
+            f"(est. ~{saved:.1f} MB saved){': ' + top if top else ''}"
+        )
+
+
+# Process-wide rules/counters; CLIs set the profile's rules via configure_routing()
+_default_rules = RouteRules()
+_asset_cache: Optional[AssetCache] = None
+stats = RouteStats()
+
+
+def configure_routing(env: "EnvConfig") -> RouteRules:
+    """
+    Use `env`'s ROUTE_* rules for every context created from now on, and the
+    shared static asset cache when the profile opts in:
+      ASSET_CACHE=true                  serve CSS/JS (and unblocked fonts/images)
+                                        from disk
+      ASSET_CACHE_MAX_MB=200            evict least recently used assets beyond this
+      ASSET_CACHE_TTL_S=300             serve without revalidating for this long
+    """
+    global _default_rules, _asset_cache
+    _default_rules = RouteRules.from_env(env)
+    if env.get_bool("ASSET_CACHE", default=False):
+        _asset_cache = AssetCache(
+            max_bytes=int(float(env.get("ASSET_CACHE_MAX_MB") or 200) * 1024 * 1024),
+            ttl_s=float(env.get("ASSET_CACHE_TTL_S") or 300),
+        )
+    else:
+        _asset_cache = None
+    return _default_rules
+
+
+def default_route_rules() -> RouteRules:
+    return _default_rules
+
+
+def asset_cache() -> Optional[AssetCache]:
+    return _asset_cache
+
+
+def flush_routes() -> None:
+    """Write back what the route handlers keep in memory (asset cache last use)."""
+    if _asset_cache is not None:
+        _asset_cache.flush()
+
+
+def route_summary() -> str:
+    lines = [stats.summary()]
+    if _asset_cache is not None:
+        lines.append(_asset_cache.summary())
+    return "\n".join(lines)
+
+
+async def install_routes(
+    context: BrowserContext,
+    rules: Optional[RouteRules] = None,
+    counters: Optional[RouteStats] = None,
+) -> None:
+    """
+    Route the requests of `context` that `rules` might block (see
+    RouteRules.route_pattern) through them: blocked ones are aborted, the rest
+    fall through (route.fallback) to any handlers registered earlier or to the
+    network. Other requests never reach Python. The pattern is matched inside
+    the Playwright driver, but any route turns off the browser's HTTP cache
+    for the context, so enable ASSET_CACHE to keep CSS/JS cached.
+
+    Playwright runs the most recently registered handler first, so the asset
+    cache is registered before the blocking handler and only ever sees
+    requests that were let through.
+    """
+    rules = rules or _default_rules
+    counters = counters or stats
+    if _asset_cache is not None:
+        await _asset_cache.install(context)
+    pattern = rules.route_pattern()
+    if pattern is None:
+        return
+
+    async def handle(route: Route) -> None:
+        request = route.request
+        counters.requests += 1
+        reason = rules.block_reason(request.url, request.resource_type)
+        if reason is None:
+            await route.fallback()
+            return
+        counters.blocked += 1
+        counters.by_reason[reason] += 1
+        typical = _TYPICAL_BYTES.get(request.resource_type, _DEFAULT_BYTES)
+        counters.est_bytes_saved += typical
+        await route.abort("blockedbyclient")
+
+    await context.route(pattern, handle)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from playwright.async_api import BrowserContext
+
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+SESSIONS_DIR = OUTPUT_DIR / "sessions"
+
+# Replays each origin's saved localStorage (MSAL keeps its tokens there) the
+# first time a tab loads that origin; the sessionStorage flag stops later
+# navigations from overwriting tokens a fresh login has written since.
+_RESTORE_LOCAL_STORAGE = """
+(() => {
+    const origins = %s;
+    const saved = origins.find((o) => o.origin === location.origin);
+    const flag = "__eprda_session_restored";
+    if (!saved || sessionStorage.getItem(flag)) return;
+    for (const item of saved.localStorage || []) {
+        localStorage.setItem(item.name, item.value);
+    }
+    sessionStorage.setItem(flag, "1");
+})();
+"""
+
+
+class SessionCache:
+    """
+    File-backed cache of Playwright `storage_state` snapshots, keyed by
+    (profile, base URL, email).
+
+    A snapshot is written after a successful sign-in and replayed into later
+    contexts so they start already authenticated. Snapshots are plain JSON
+    files under `output/sessions/`; delete the folder to force fresh logins.
+    """
+
+    def __init__(self, profile: str, cache_dir: str | Path = SESSIONS_DIR):
+        self.profile = profile
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, base_url: str, email: str) -> Path:
+        key = f"{self.profile}|{base_url.rstrip('/')}|{email.strip().lower()}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+        return self.cache_dir / f"{self.profile}_{digest}.json"
+
+    def load(self, base_url: str, email: str) -> Optional[Dict[str, Any]]:
+        path = self.path_for(base_url, email)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # half-written or corrupt snapshot: treat as a miss
+            return None
+
+    async def save(self, context: BrowserContext, base_url: str, email: str) -> Path:
+        path = self.path_for(base_url, email)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = await context.storage_state()
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def invalidate(self, base_url: str, email: str) -> None:
+        self.path_for(base_url, email).unlink(missing_ok=True)
+
+
+async def restore_storage_state(
+    context: BrowserContext, state: Dict[str, Any]
+) -> None:
+    """
+    Replay a saved storage_state into an existing context: cookies straight
+    away, localStorage per origin on the first visit to it.
+    """
+    await context.add_cookies(state.get("cookies", []))
+    origins = [o for o in state.get("origins", []) if o.get("localStorage")]
+    if origins:
+        await context.add_init_script(_RESTORE_LOCAL_STORAGE % json.dumps(origins))
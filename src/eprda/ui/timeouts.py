@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from playwright.async_api import BrowserContext
+
+if TYPE_CHECKING:
+    from eprda.config.config import EnvConfig
+
+
+def _ms(env: "EnvConfig", key: str, default: int) -> int:
+    raw = env.get(key)
+    return int(float(raw)) if raw not in (None, "") else default
+
+
+@dataclass(frozen=True)
+class TimeoutBudget:
+    """
+    How long UI waits may take, in milliseconds, per environment profile.
+    - action: default for clicks, fills and other locator actions
+    - navigation: page loads and click-and-wait-for-URL/response helpers
+    - processing: server-side work the portal polls for (file upload checks)
+    - poll_initial / poll_max: backoff between status checks while processing
+    - verification_code: Notify delivering the account verification email
+    """
+    action: int = 30_000
+    navigation: int = 30_000
+    processing: int = 120_000
+    poll_initial: int = 250
+    poll_max: int = 5_000
+    verification_code: int = 120_000
+
+    @classmethod
+    def from_env(cls, env: "EnvConfig") -> "TimeoutBudget":
+        """
+        Every key is optional: TIMEOUT_ACTION_MS, TIMEOUT_NAVIGATION_MS,
+        TIMEOUT_PROCESSING_MS, TIMEOUT_POLL_INITIAL_MS, TIMEOUT_POLL_MAX_MS,
+        TIMEOUT_VERIFICATION_CODE_MS.
+        """
+        d = cls()
+        return cls(
+            action=_ms(env, "TIMEOUT_ACTION_MS", d.action),
+            navigation=_ms(env, "TIMEOUT_NAVIGATION_MS", d.navigation),
+            processing=_ms(env, "TIMEOUT_PROCESSING_MS", d.processing),
+            poll_initial=_ms(env, "TIMEOUT_POLL_INITIAL_MS", d.poll_initial),
+            poll_max=_ms(env, "TIMEOUT_POLL_MAX_MS", d.poll_max),
+            verification_code=_ms(
+                env, "TIMEOUT_VERIFICATION_CODE_MS", d.verification_code
+            ),
+        )
+
+
+# Process-wide budget; CLIs set the profile's budget via configure_timeouts()
+_budget = TimeoutBudget()
+
+
+def configure_timeouts(env: "EnvConfig") -> TimeoutBudget:
+    """Use `env`'s TIMEOUT_* budget for every context and page wait from now on."""
+    global _budget
+    _budget = TimeoutBudget.from_env(env)
+    return _budget
+
+
+def timeouts() -> TimeoutBudget:
+    return _budget
+
+
+def apply_timeouts(context: BrowserContext) -> None:
+    context.set_default_timeout(_budget.action)
+    context.set_default_navigation_timeout(_budget.navigation)
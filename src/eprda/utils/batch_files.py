@@ -0,0 +1,130 @@
+# utils/batch_files.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Sequence
+
+from eprda.utils.csv_factory import OUTPUT_DIR, TEMPLATES_DIR, create_csv_from_template
+
+TEMPLATES = {
+    "org": TEMPLATES_DIR / "org-file-template.csv",
+    "pom": TEMPLATES_DIR / "pom-file-template.csv",
+}
+
+
+@dataclass(frozen=True)
+class FileJob:
+    """One per-org file: `kind` picks the template, `rows` are the overrides."""
+    kind: str
+    organisation_id: str
+    rows: Sequence[Mapping[str, object]] = field(default_factory=tuple)
+
+    @property
+    def filename(self) -> str:
+        return f"{self.kind}_{self.organisation_id}.csv"
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    kind: str
+    organisation_id: str
+    path: str
+    rows: int
+    sha256: str
+    bytes: int
+
+
+def org_and_pom_jobs(
+    records: Iterable[Mapping[str, Any]],
+    kinds: Sequence[str] = ("org", "pom"),
+) -> List[FileJob]:
+    """
+    ORG/POM file jobs for enrolled orgs (records from a batch or data-setup
+    results file: organisation_id, company_name, company_number).
+    """
+    jobs: List[FileJob] = []
+    for r in records:
+        org_id = str(r["organisation_id"])
+        overrides = {
+            "org": [{
+                "organisation_id": org_id,
+                "organisation_name": r.get("company_name", ""),
+                "companies_house_number": r.get("company_number", ""),
+            }],
+            "pom": [{"organisation_id": org_id}],
+        }
+        jobs.extend(FileJob(kind, org_id, overrides[kind]) for kind in kinds)
+    return jobs
+
+
+def write_file_atomic(
+    job: FileJob,
+    output_dir: str | Path = OUTPUT_DIR,
+) -> ManifestEntry:
+    """
+    Write one job's CSV to a temp file beside the target and rename it into
+    place, so readers never see a half-written file. Runs in worker processes.
+    """
+    final = Path(output_dir) / job.filename
+    tmp = final.with_name(f".{final.name}.{os.getpid()}.tmp")
+    try:
+        create_csv_from_template(TEMPLATES[job.kind], tmp, job.rows)
+        digest = hashlib.sha256()
+        with tmp.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        size = tmp.stat().st_size
+        os.replace(tmp, final)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return ManifestEntry(
+        kind=job.kind,
+        organisation_id=job.organisation_id,
+        path=str(final),
+        rows=len(job.rows),
+        sha256=digest.hexdigest(),
+        bytes=size,
+    )
+
+
+def _write_many(jobs: Sequence[FileJob], output_dir: str) -> List[ManifestEntry]:
+    return [write_file_atomic(job, output_dir) for job in jobs]
+
+
+def generate_files(
+    jobs: Sequence[FileJob],
+    workers: Optional[int] = None,
+    output_dir: str | Path = OUTPUT_DIR,
+    batch_size: int = 64,
+) -> List[ManifestEntry]:
+    """
+    Generate per-org files across a ProcessPoolExecutor (`workers` defaults to
+    the CPU count). Jobs are shipped in batches so 10k small files are not
+    10k round trips; the manifest comes back in job order.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    if workers == 1 or len(jobs) <= batch_size:
+        return _write_many(jobs, str(output_dir))
+
+    batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+    manifest: List[ManifestEntry] = []
+    dirs = [str(output_dir)] * len(batches)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for entries in pool.map(_write_many, batches, dirs):
+            manifest.extend(entries)
+    return manifest
+
+
+def write_manifest(manifest: Sequence[ManifestEntry], path: str | Path) -> Path:
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.tmp")
+    payload = json.dumps([asdict(m) for m in manifest], indent=2)
+    tmp.write_text(payload, encoding="utf-8")
+    os.replace(tmp, out)
+    return out
@@ -1,8 +1,14 @@
 # utils/csv_factory.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Iterable, Mapping, Tuple, Dict, List
-import pandas as pd
+import csv
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping, Sequence, Tuple, Dict, List
 
 
 # ---------- path helpers (works no matter where you run from) ----------
@@ -21,6 +27,9 @@ def _find_project_root(start: Path | None = None) -> Path:
 PROJECT_ROOT = _find_project_root()
 TEMPLATES_DIR = PROJECT_ROOT / "templates"
 OUTPUT_DIR = PROJECT_ROOT / "output"
+# generated CSVs by content hash, in this directory next to each output file;
+# named outputs are hard links into it
+CACHE_DIRNAME = ".cache"
 
 
 # ---------- core factory ----------
@@ -33,68 +42,179 @@ def _load_template(template_csv: str | Path) -> Tuple[List[str], Dict[str, str]]
     if not tpl_path.exists():
         raise FileNotFoundError(f"Template not found: {tpl_path}")
 
-    df = pd.read_csv(tpl_path, dtype=str, keep_default_na=False, nrows=1)
-    columns = list(df.columns)
-
-    if df.empty:
-        base_row = {c: "" for c in columns}
-    else:
-        first = df.iloc[0].fillna("")
-        base_row = {c: str(first[c]) for c in columns}
+    with tpl_path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        # like pandas, skip blank lines before the defaults row
+        first = next((r for r in reader if any(v.strip() for v in r)), [])
 
+    base_row = {c: (first[i] if i < len(first) else "") for i, c in enumerate(columns)}
     return columns, base_row
 
 
-def _build_dataframe(
-    columns: List[str],
-    base_row: Mapping[str, str],
-    overrides_list: Iterable[Mapping[str, object]],
-) -> pd.DataFrame:
+@dataclass(frozen=True)
+class CompiledTemplate:
     """
-    Strictly build a DataFrame based on the template:
-      - Only template columns allowed (raise on unknown keys)
-      - Merge base_row with per-row overrides
-      - Preserve exact template column order
-      - Coerce all values to strings (None -> "")
+    A template parsed once into what row building needs: column order, a
+    column -> index map and the defaults row, with the strict field check.
     """
-    colset = set(columns)
-    rows: List[Dict[str, str]] = []
-
-    for i, overrides in enumerate(overrides_list, start=1):
-        unknown = set(overrides.keys()) - colset
-        if unknown:
+    columns: Tuple[str, ...]
+    defaults: Tuple[str, ...]
+    position: Mapping[str, int]
+    digest: str = ""  # hash of columns + defaults, part of the output cache key
+
+    def build_row(
+        self,
+        overrides: Mapping[str, object],
+        row_number: int = 1,
+    ) -> List[str]:
+        """
+        Merge one row of overrides onto the defaults, in template column order.
+        Unknown fields raise; values are coerced to strings (None -> "").
+        """
+        row = list(self.defaults)
+        position = self.position
+        try:
+            for k, v in overrides.items():
+                row[position[k]] = "" if v is None else str(v)
+        except KeyError:
+            unknown = overrides.keys() - position.keys()
             raise ValueError(
-                f"Row {i} contains unknown fields: {sorted(unknown)}. "
-                f"Allowed fields: {columns}"
-            )
+                f"Row {row_number} contains unknown fields: {sorted(unknown)}. "
+                f"Allowed fields: {list(self.columns)}"
+            ) from None
+        return row
+
+    def iter_rows(
+        self,
+        overrides_list: Iterable[Mapping[str, object]],
+    ) -> Iterator[List[str]]:
+        for i, overrides in enumerate(overrides_list, start=1):
+            yield self.build_row(overrides, i)
 
-        row = {c: "" if base_row.get(c) is None else str(base_row.get(c, "")) for c in columns}
-        for k, v in overrides.items():
-            row[k] = "" if v is None else str(v)
-        rows.append(row)
 
-    df = pd.DataFrame(rows, columns=columns).fillna("")
-    # ensure dtype=str for all columns
-    for c in columns:
-        df[c] = df[c].astype(str)
-    return df
+_compiled: Dict[Path, Tuple[int, int, CompiledTemplate]] = {}
+_compiled_lock = threading.Lock()
+
+
+def compile_template(template_csv: str | Path) -> CompiledTemplate:
+    """
+    Parsed template for `template_csv`, cached per path and re-parsed only
+    when the file's mtime (or size) changes.
+    """
+    tpl_path = Path(template_csv).resolve()
+    try:
+        st = tpl_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template not found: {template_csv}") from None
+
+    with _compiled_lock:
+        cached = _compiled.get(tpl_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+    columns, base_row = _load_template(tpl_path)
+    compiled = CompiledTemplate(
+        columns=tuple(columns),
+        defaults=tuple(
+            "" if base_row.get(c) is None else str(base_row.get(c, "")) for c in columns
+        ),
+        position={c: i for i, c in enumerate(columns)},
+        digest=hashlib.sha256(
+            json.dumps([columns, base_row]).encode("utf-8")
+        ).hexdigest(),
+    )
+    with _compiled_lock:
+        _compiled[tpl_path] = (st.st_mtime_ns, st.st_size, compiled)
+    return compiled
+
+
+def _cache_key(template: CompiledTemplate, rows: Sequence[Mapping[str, object]]) -> str:
+    h = hashlib.sha256(template.digest.encode("ascii"))
+    for row in rows:
+        canonical = sorted((k, "" if v is None else str(v)) for k, v in row.items())
+        h.update(json.dumps(canonical, ensure_ascii=False).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _link_into_place(source: Path, target: Path) -> None:
+    """
+    Point `target` at `source` (hard link, copy if linking is not possible),
+    replacing it atomically.
+    """
+    if target.exists() and os.path.samefile(source, target):
+        return
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.link")
+    try:
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_rows(
+    template: CompiledTemplate,
+    out_path: Path,
+    rows: Iterable[Mapping[str, object]],
+) -> None:
+    """
+    Stream rows into a temp file next to `out_path` and move it into place only
+    once every row was written: a bad row part-way through leaves no partial
+    CSV behind, and an existing `out_path` (possibly a hard link into the
+    cache) is replaced rather than written through.
+    """
+    suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp = out_path.with_name(f".{out_path.name}.{suffix}")
+    try:
+        with tmp.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(template.columns)
+            writer.writerows(template.iter_rows(rows))
+        os.replace(tmp, out_path)
+    finally:
+        tmp.unlink(missing_ok=True)
 
 
 def create_csv_from_template(
     template_csv: str | Path,
     output_csv: str | Path,
     rows: Iterable[Mapping[str, object]],
+    cache: bool = False,
 ) -> Path:
     """
     Generate a CSV by:
       - Loading the template header (column order) and default row (if any)
       - Applying per-row overrides (strict: unknown fields raise)
       - Writing CSV with preserved column order and string values
+
+    `rows` may be any iterable (including a generator); rows are written as
+    they are produced, so memory stays flat for multi-million-row POM files.
+
+    With `cache=True` and `rows` a list/tuple, the file is content addressed:
+    it is stored once in a `.cache` directory next to `output_csv` under a
+    hash of the template and the overrides, and `output_csv` is linked to it.
+    Identical requests reuse the stored file instead of regenerating it. Old
+    entries under OUTPUT_DIR are evicted by
+    eprda.utils.output_cache.prune_output_dir.
     """
-    columns, base_row = _load_template(template_csv)
-    df = _build_dataframe(columns, base_row, rows)
+    template = compile_template(template_csv)
 
     out_path = Path(output_csv)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False, encoding="utf-8")
+    if not cache or not isinstance(rows, (list, tuple)):
+        _write_rows(template, out_path, rows)
+        return out_path
+
+    cache_dir = out_path.parent / CACHE_DIRNAME
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached = cache_dir / f"{_cache_key(template, rows)}.csv"
+    if cached.exists():
+        os.utime(cached)  # mark as recently used for LRU eviction
+    else:
+        _write_rows(template, cached, rows)
+    _link_into_place(cached, out_path)
     return out_path
@@ -0,0 +1,51 @@
+# utils/file_executor.py
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Worker threads for CSV generation/validation called from async flows
+FILE_WORKERS = int(os.getenv("EPRDA_FILE_WORKERS", "4"))
+# Jobs allowed to wait for a worker before callers are held back
+FILE_QUEUE_SIZE = int(os.getenv("EPRDA_FILE_QUEUE_SIZE", str(FILE_WORKERS * 2)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=FILE_WORKERS, thread_name_prefix="eprda-files"
+            )
+        return _executor
+
+
+async def run_file_task(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run blocking file work (create_csv_from_template, validators, ...) on the
+    shared file executor so the event loop keeps driving other flows' pages.
+
+    At most FILE_WORKERS jobs run at once and at most FILE_QUEUE_SIZE are
+    in flight per event loop; further callers wait here (without blocking
+    the loop) until a slot frees up.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _slots.get(loop)
+    if slots is None:
+        slots = _slots[loop] = asyncio.Semaphore(FILE_QUEUE_SIZE)
+    async with slots:
+        call = functools.partial(fn, *args, **kwargs)
+        return await loop.run_in_executor(_get_executor(), call)
@@ -0,0 +1,188 @@
+# utils/org_generator.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from eprda.utils.csv_factory import TEMPLATES_DIR, create_csv_from_template
+
+ORG_TEMPLATE = TEMPLATES_DIR / "org-file-template.csv"
+
+_NAME_WORDS = np.array([
+    "ACORN", "ALPHA", "ATLAS", "BEACON", "BRAMBLE", "BRIDGE", "CEDAR", "CIRCLE",
+    "COBALT", "COPPER", "CREST", "DELTA", "EMBER", "FALCON", "FERN", "GRANITE",
+    "HARBOUR", "HAZEL", "HERON", "IRIS", "JUNIPER", "KESTREL", "LANTERN", "MAPLE",
+    "MERIDIAN", "NORTHGATE", "OAKLEY", "ORCHARD", "PEBBLE", "QUARRY", "RAVEN", "SUMMIT",
+])
+_NAME_TRADES = np.array([
+    "PACKAGING", "FOODS", "RETAIL", "DRINKS", "LOGISTICS", "SUPPLIES", "TRADING",
+    "BRANDS",
+])
+_STREETS = np.array([
+    "High Street", "Station Road", "Church Lane", "Mill Road", "Park Avenue",
+    "Victoria Road", "Green Lane", "Manor Road", "Kings Road", "Queens Street",
+    "London Road", "Bridge Street",
+])
+# (city, postcode area, home_nation_code)
+_TOWNS = np.array([
+    ("Leeds", "LS", "EN"), ("Bristol", "BS", "EN"), ("Norwich", "NR", "EN"),
+    ("York", "YO", "EN"), ("Cardiff", "CF", "WS"), ("Swansea", "SA", "WS"),
+    ("Glasgow", "G", "SC"), ("Aberdeen", "AB", "SC"), ("Belfast", "BT", "NI"),
+    ("Newry", "BT", "NI"),
+])
+_POSTCODE_LETTERS = np.array(list("ABDEFGHJLNPQRSTUWXYZ"))
+# The template uses nation codes for registered/principal addresses, names for audit
+_NATION_NAMES = {
+    "EN": "England", "WS": "Wales", "SC": "Scotland", "NI": "Northern Ireland",
+}
+_FIRST_NAMES = np.array([
+    "Alex", "Amira", "Ben", "Chloe", "Dev", "Ella", "Finn", "Grace", "Hamza", "Isla",
+    "Jack", "Kiran", "Leah", "Mohammed", "Niamh", "Owen", "Priya", "Rhys", "Sofia",
+    "Tom",
+])
+_LAST_NAMES = np.array([
+    "Ahmed", "Brown", "Campbell", "Davies", "Evans", "Fraser", "Green", "Hughes",
+    "Jones", "Kaur", "Lewis", "Murray", "O'Neill", "Patel", "Roberts", "Smith",
+    "Taylor", "Thomas", "Walker", "Wilson",
+])
+
+
+@dataclass(frozen=True)
+class ParentOrg:
+    organisation_id: str
+    organisation_name: str
+    # None keeps the template's company number
+    companies_house_number: Optional[str] = None
+
+
+def hierarchy_paths(width: int, depth: int) -> List[str]:
+    """
+    Subsidiary positions for a tree `width` wide and `depth` deep, e.g.
+    width=2, depth=2 -> 1, 1.1, 1.2, 2, 2.1, 2.2 (parent first, depth-first).
+    The ORG file has one level, so every node is reported under the top parent.
+    """
+    paths: List[str] = []
+
+    def walk(prefix: str, level: int) -> None:
+        for i in range(1, width + 1):
+            path = f"{prefix}.{i}" if prefix else str(i)
+            paths.append(path)
+            if level < depth:
+                walk(path, level + 1)
+
+    if width > 0 and depth > 0:
+        walk("", 1)
+    return paths
+
+
+def _unique_company_numbers(rng: np.random.Generator, count: int) -> np.ndarray:
+    # i -> (a*i + b) mod 10^8 is a bijection when gcd(a, 10^8) == 1,
+    # so numbers never repeat
+    a = int(rng.integers(1, 10**7)) * 10 + int(rng.choice([1, 3, 7, 9]))
+    b = int(rng.integers(0, 10**8))
+    i = np.arange(count, dtype=np.int64)
+    return np.char.zfill(((a * i + b) % 10**8).astype(str), 8)
+
+
+def generate_org_rows(
+    parents: Sequence[ParentOrg],
+    width: int,
+    depth: int = 1,
+    seed: int = 0,
+) -> Iterator[Dict[str, str]]:
+    """
+    Yield ORG file rows: each parent followed by its subsidiaries.
+
+    Subsidiary names, company numbers and addresses are drawn as numpy arrays
+    for the whole file up front (seeded, so the same seed gives the same
+    file). Company numbers and names are unique across the file. Each
+    subsidiary gets its own registered, principal and audit address (countries
+    follow its home nation) and primary contact; parents keep the template's.
+    """
+    paths = hierarchy_paths(width, depth)
+    total = len(parents) * len(paths)
+    rng = np.random.default_rng(seed)
+
+    names = np.char.add(
+        np.char.add(_NAME_WORDS[rng.integers(0, len(_NAME_WORDS), total)], " "),
+        _NAME_TRADES[rng.integers(0, len(_NAME_TRADES), total)],
+    )
+    numbers = _unique_company_numbers(rng, total)
+    towns = _TOWNS[rng.integers(0, len(_TOWNS), total)]
+    house = rng.integers(1, 300, total)
+    streets = _STREETS[rng.integers(0, len(_STREETS), total)]
+    district = rng.integers(1, 30, total)
+    inward = rng.integers(1, 10, total)
+    letters = _POSTCODE_LETTERS[rng.integers(0, len(_POSTCODE_LETTERS), (total, 2))]
+    first_names = _FIRST_NAMES[rng.integers(0, len(_FIRST_NAMES), total)]
+    last_names = _LAST_NAMES[rng.integers(0, len(_LAST_NAMES), total)]
+    # 07700 900000-900999 is Ofcom's drama range, so these never reach a real phone
+    phones = np.char.add(
+        "07700900", np.char.zfill(rng.integers(0, 1000, total).astype(str), 3)
+    )
+
+    n = 0
+    for parent in parents:
+        parent_row = {
+            "organisation_id": parent.organisation_id,
+            "subsidiary_id": "",
+            "organisation_name": parent.organisation_name,
+        }
+        if parent.companies_house_number is not None:
+            parent_row["companies_house_number"] = parent.companies_house_number
+        yield parent_row
+        for path in paths:
+            city, area, nation = towns[n]
+            line1 = f"{house[n]} {streets[n]}"
+            postcode = f"{area}{district[n]} {inward[n]}{letters[n, 0]}{letters[n, 1]}"
+            first, last = str(first_names[n]), str(last_names[n])
+            phone = str(phones[n])
+            email = f"{first}.{last}.{n + 1}@example.com".lower().replace("'", "")
+            yield {
+                "organisation_id": parent.organisation_id,
+                "subsidiary_id": f"{parent.organisation_id}-{n + 1:05d}",
+                "organisation_name": f"{names[n]} {parent.organisation_id}-{path} LTD",
+                "companies_house_number": numbers[n],
+                "home_nation_code": nation,
+                "registered_addr_line1": line1,
+                "registered_addr_line2": "",
+                "registered_city": city,
+                "registered_addr_county": "",
+                "registered_addr_postcode": postcode,
+                "registered_addr_country": nation,
+                "registered_addr_phone_number": phone,
+                "principal_addr_line1": line1,
+                "principal_addr_line2": "",
+                "principal_addr_city": city,
+                "principal_addr_county": "",
+                "principal_addr_postcode": postcode,
+                "principal_addr_country": nation,
+                "principal_addr_phone_number": phone,
+                "audit_addr_line1": line1,
+                "audit_addr_line2": "",
+                "audit_addr_city": city,
+                "audit_addr_county": "",
+                "audit_addr_postcode": postcode,
+                "audit_addr_country": _NATION_NAMES[nation],
+                "primary_contact_person_first_name": first,
+                "primary_contact_person_last_name": last,
+                "primary_contact_person_phone_number": phone,
+                "primary_contact_person_email": email,
+            }
+            n += 1
+
+
+def write_org_hierarchy(
+    output_csv: str | Path,
+    parents: Sequence[ParentOrg],
+    width: int,
+    depth: int = 1,
+    seed: int = 0,
+    template_csv: str | Path = ORG_TEMPLATE,
+) -> Path:
+    """ORG file for `parents` and their subsidiaries, written in one streaming pass."""
+    rows = generate_org_rows(parents, width, depth, seed)
+    return create_csv_from_template(template_csv, output_csv, rows)
@@ -0,0 +1,176 @@
+# utils/org_pom_consistency.py
+"""
+Cross-file checks between an ORG (registration) file and a POM (packaging
+data) file, so orphan subsidiaries and mismatched organisation details are
+caught before either file reaches the portal or the ETL.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from eprda.utils.pom_validator import (
+    DUPLICATE_KEY,
+    RowError,
+    duplicate_lines,
+    first_errors,
+    iter_csv_chunks,
+)
+
+_SEP = "\x1f"  # joins organisation_id and subsidiary_id into one hashable key
+
+
+@dataclass
+class ConsistencyReport:
+    org_rows: int = 0
+    pom_rows: int = 0
+    # first max_errors, POM lines unless noted
+    errors: List[RowError] = field(default_factory=list)
+    total: int = 0
+    # ORG organisations/subsidiaries with no POM rows (informational)
+    unreported: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.total == 0
+
+
+class OrgPomConsistencyError(ValueError):
+    def __init__(
+        self,
+        org_csv: str | Path,
+        pom_csv: str | Path,
+        report: ConsistencyReport,
+    ):
+        self.org_csv = str(org_csv)
+        self.pom_csv = str(pom_csv)
+        self.report = report
+        errors = report.errors
+        shown = "\n  ".join(str(e) for e in errors)
+        hidden = report.total - len(errors)
+        more = f"\n  ... and {hidden} more" if hidden > 0 else ""
+        super().__init__(
+            f"{pom_csv} vs {org_csv}: {report.total} ORG/POM consistency "
+            f"error(s)\n  {shown}{more}"
+        )
+
+
+def _keys(df: pd.DataFrame) -> pd.Series:
+    return df["organisation_id"].str.strip() + _SEP + df["subsidiary_id"].str.strip()
+
+
+def check_org_pom_consistency(
+    org_csv: str | Path,
+    pom_csv: str | Path,
+    submission_period: Optional[str] = None,
+    chunksize: int = 500_000,
+    max_errors: int = 50,
+) -> ConsistencyReport:
+    """
+    Index the ORG file's (organisation_id, subsidiary_id) keys, then stream
+    the POM file against that index in one pass, reporting:
+      - duplicate keys in the ORG file
+      - POM rows whose organisation/subsidiary is not in the ORG file
+      - POM rows whose organisation_size differs from the ORG file
+      - POM rows for another submission period (default: the file's first period)
+      - duplicate POM lines
+    """
+    report = ConsistencyReport()
+
+    def add(lines: np.ndarray, column: str, message: str) -> None:
+        report.total += len(lines)
+        report.errors = first_errors(
+            report.errors, lines, column, message, max_errors
+        )
+
+    # ---- ORG index: key -> organisation_size ----
+    org_frames = []
+    org_columns = ["organisation_id", "subsidiary_id", "organisation_size"]
+    for df, lines in iter_csv_chunks(org_csv, org_columns, chunksize):
+        org_frames.append(pd.DataFrame({
+            "key": _keys(df).to_numpy(),
+            "size": df["organisation_size"].str.strip().to_numpy(),
+            "line": lines,
+        }))
+    if org_frames:
+        org = pd.concat(org_frames, ignore_index=True)
+    else:
+        org = pd.DataFrame(columns=["key", "size", "line"])
+    report.org_rows = len(org)
+
+    dup = org["key"].duplicated()
+    if dup.any():
+        add(
+            org.loc[dup, "line"].to_numpy(),
+            "ORG organisation_id/subsidiary_id",
+            "duplicate organisation in the ORG file",
+        )
+    org_size = pd.Series(
+        org.loc[~dup, "size"].to_numpy(),
+        index=pd.Index(org.loc[~dup, "key"].to_numpy()),
+    )
+    reported = np.zeros(len(org_size), dtype=bool)
+
+    # ---- stream POM ----
+    key_hashes = []
+    key_lines = []
+    pom_columns = [*DUPLICATE_KEY, "organisation_size"]
+    for df, lines in iter_csv_chunks(pom_csv, pom_columns, chunksize):
+        keys = _keys(df)
+        positions = org_size.index.get_indexer(keys)
+        known = positions >= 0
+        reported[positions[known]] = True
+
+        if (~known).any():
+            add(lines[~known], "organisation_id/subsidiary_id", "not in the ORG file")
+        size_mismatch = known.copy()
+        pom_size = df["organisation_size"].str.strip().to_numpy()
+        size_mismatch[known] = (
+            org_size.to_numpy()[positions[known]] != pom_size[known]
+        )
+        if size_mismatch.any():
+            add(lines[size_mismatch], "organisation_size", "differs from the ORG file")
+
+        periods = df["submission_period"].str.strip()
+        if submission_period is None and len(periods):
+            submission_period = periods.iloc[0]
+        wrong_period = (periods != submission_period).to_numpy()
+        if wrong_period.any():
+            expected = f"expected {submission_period}"
+            add(lines[wrong_period], "submission_period", expected)
+
+        dup_keys = df[list(DUPLICATE_KEY)]
+        key_hashes.append(
+            pd.util.hash_pandas_object(dup_keys, index=False).to_numpy()
+        )
+        key_lines.append(lines)
+        report.pom_rows += len(df)
+
+    dup_lines = duplicate_lines(key_hashes, key_lines)
+    if len(dup_lines):
+        add(dup_lines, "row", "duplicate POM line")
+
+    report.unreported = int((~reported).sum())
+    return report
+
+
+def ensure_org_pom_consistent(
+    org_csv: str | Path,
+    pom_csv: str | Path,
+    submission_period: Optional[str] = None,
+    max_errors: int = 50,
+) -> ConsistencyReport:
+    """
+    Raise OrgPomConsistencyError listing the problems if the POM file does not
+    match its ORG file; returns the report otherwise.
+    """
+    report = check_org_pom_consistency(
+        org_csv, pom_csv, submission_period=submission_period, max_errors=max_errors
+    )
+    if not report.ok:
+        raise OrgPomConsistencyError(org_csv, pom_csv, report)
+    return report
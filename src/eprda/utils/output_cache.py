@@ -0,0 +1,100 @@
+# utils/output_cache.py
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+# Only regenerable CSVs (named outputs and .cache entries) and failure
+# screenshots are evicted. Results/manifest/spans files (.jsonl/.json) are
+# inputs to later commands (--from, --resume) and run state (runs.sqlite, the
+# company pool, cached sessions, the snapshot index, the self-bounded asset
+# cache) is never touched.
+EVICTABLE_SUFFIXES = {".csv", ".png"}
+PROTECTED_DIRS = {"sessions", "companies_snapshot", "asset_cache"}
+
+
+@dataclass
+class PruneResult:
+    removed: int = 0
+    freed_bytes: int = 0
+    kept: int = 0
+    kept_bytes: int = 0
+
+
+def _budget_from_env(name: str) -> Optional[float]:
+    raw = os.getenv(name)
+    return float(raw) if raw else None
+
+
+def prune_output_dir(
+    output_dir: str | Path = OUTPUT_DIR,
+    max_bytes: Optional[int] = None,
+    max_age_s: Optional[float] = None,
+    dry_run: bool = False,
+) -> PruneResult:
+    """
+    Evict generated artifacts (CSVs, content-addressed cache entries,
+    failure screenshots) least recently used first.
+
+    - max_age_s: remove anything not written or reused for this long
+    - max_bytes: then remove the oldest until the rest fits the budget
+
+    Budgets default to EPRDA_OUTPUT_MAX_MB / EPRDA_OUTPUT_MAX_AGE_DAYS; with
+    neither set nothing is removed. Cache hits refresh mtime, so files still
+    in use survive. A cached file and the named outputs linked to it are
+    counted and evicted together.
+    """
+    if max_bytes is None:
+        mb = _budget_from_env("EPRDA_OUTPUT_MAX_MB")
+        max_bytes = None if mb is None else int(mb * 1024 * 1024)
+    if max_age_s is None:
+        days = _budget_from_env("EPRDA_OUTPUT_MAX_AGE_DAYS")
+        max_age_s = None if days is None else days * 86400
+
+    result = PruneResult()
+    root = Path(output_dir)
+    if not root.exists() or (max_bytes is None and max_age_s is None):
+        return result
+
+    # group hard links (cache entry + named outputs) so a file is only counted
+    # and evicted once
+    groups: Dict[tuple[int, int], tuple[float, int, List[Path]]] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        if Path(dirpath) == root:
+            dirnames[:] = [d for d in dirnames if d not in PROTECTED_DIRS]
+        for name in filenames:
+            path = Path(dirpath) / name
+            if path.suffix not in EVICTABLE_SUFFIXES:
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if key in groups:
+                groups[key][2].append(path)
+            else:
+                groups[key] = (st.st_mtime, st.st_size, [path])
+
+    ordered = sorted(groups.values(), key=lambda g: g[0])  # least recently used first
+    total = sum(size for _, size, _ in ordered)
+    cutoff = time.time() - max_age_s if max_age_s is not None else None
+    for mtime, size, paths in ordered:
+        expired = cutoff is not None and mtime < cutoff
+        over_budget = max_bytes is not None and total > max_bytes
+        if not (expired or over_budget):
+            result.kept += len(paths)
+            result.kept_bytes += size
+            continue
+        if not dry_run:
+            for path in paths:
+                path.unlink(missing_ok=True)
+        total -= size
+        result.removed += len(paths)
+        result.freed_bytes += size
+    return result
@@ -0,0 +1,83 @@
+# utils/pom_codes.py
+"""
+Reference codes for packaging (POM) data files and the combinations of them
+the upload validation accepts. Used by the synthetic POM generator.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+ORGANISATION_SIZES = ("L", "S")
+SUBMISSION_PERIODS = ("2025-H1",)
+
+# packaging_activity: brand owner, packer/filler, importer, seller
+PACKAGING_ACTIVITIES = ("SO", "PF", "IM", "SE")
+
+# packaging_material -> typical weight per row in kg (median for the lognormal draw)
+PACKAGING_MATERIALS: Dict[str, float] = {
+    "AL": 1_500,   # aluminium
+    "FC": 2_000,   # fibre composite
+    "GL": 12_000,  # glass
+    "PC": 8_000,   # paper / card
+    "PL": 5_000,   # plastic
+    "ST": 3_000,   # steel
+    "WD": 4_000,   # wood
+}
+
+# "other" material; rows using it must name a packaging_material_subtype.
+# Generated OT rows use these subtypes (subtype -> typical weight in kg)
+OTHER_MATERIAL = "OT"
+OTHER_MATERIAL_SUBTYPES: Dict[str, float] = {
+    "Cork": 500,
+    "Rubber": 800,
+}
+
+NATIONS = ("EN", "NI", "SC", "WS")
+
+# packaging_type -> allowed packaging_class values
+PACKAGING_CLASSES: Dict[str, Tuple[str, ...]] = {
+    "HH": ("P1", "P2", "P3", "P6"),        # household
+    "NH": ("P1", "P2", "P3", "P4", "P6"),  # non-household
+    "RU": ("P1", "P2", "P3", "P4"),        # reusable
+    "CW": ("O1",),                         # self-managed consumer waste
+    "OW": ("O2",),                         # self-managed organisation waste
+    "PB": ("B1",),                         # public binned
+}
+
+# Self-managed waste rows name the nation the waste came from and carry no
+# activity
+SELF_MANAGED_TYPES = ("CW", "OW")
+NO_ACTIVITY_TYPES = ("CW", "OW", "PB")
+
+# (packaging_activity, packaging_type, packaging_class, packaging_material,
+#  packaging_material_subtype, from_country)
+Combination = Tuple[str, str, str, str, str, str]
+
+
+def material_weights() -> Dict[Tuple[str, str], float]:
+    """(packaging_material, packaging_material_subtype) -> typical weight in kg."""
+    weights = {(material, ""): kg for material, kg in PACKAGING_MATERIALS.items()}
+    for subtype, kg in OTHER_MATERIAL_SUBTYPES.items():
+        weights[(OTHER_MATERIAL, subtype)] = kg
+    return weights
+
+
+def valid_combinations() -> List[Combination]:
+    """
+    Every activity x type x class x material (and subtype) x from_country
+    combination a large producer may report.
+    """
+    materials = list(material_weights())
+    combos: List[Combination] = []
+    for packaging_type, classes in PACKAGING_CLASSES.items():
+        no_activity = packaging_type in NO_ACTIVITY_TYPES
+        activities = ("",) if no_activity else PACKAGING_ACTIVITIES
+        countries = NATIONS if packaging_type in SELF_MANAGED_TYPES else ("",)
+        for activity in activities:
+            for cls in classes:
+                for material, subtype in materials:
+                    combos.extend(
+                        (activity, packaging_type, cls, material, subtype, country)
+                        for country in countries
+                    )
+    return combos
@@ -0,0 +1,146 @@
+# utils/pom_generator.py
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Sequence
+
+import numpy as np
+
+from eprda.utils.csv_factory import TEMPLATES_DIR, CompiledTemplate, compile_template
+from eprda.utils.pom_codes import material_weights, valid_combinations
+
+POM_TEMPLATE = TEMPLATES_DIR / "pom-file-template.csv"
+
+_COMBO_COLUMNS = (
+    "packaging_activity",
+    "packaging_type",
+    "packaging_class",
+    "packaging_material",
+    "packaging_material_subtype",
+    "from_country",
+)
+
+
+def generate_pom_columns(
+    org_ids: Sequence[str],
+    rows_per_org: int,
+    seed: int = 0,
+    weight_sigma: float = 1.0,
+    orgs_per_chunk: int = 10_000,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield synthetic POM data as column arrays, one chunk of orgs at a time.
+
+    Each org gets `rows_per_org` distinct valid code combinations (see
+    pom_codes.valid_combinations), so no org reports the same line twice.
+    packaging_material_weight is drawn from a lognormal around each
+    material's (or OT subtype's) typical weight; "combo" holds each row's index into
+    valid_combinations(). Everything comes from one seeded Generator
+    consumed in a fixed order, so the same seed gives the same rows.
+    """
+    combos = np.array(valid_combinations(), dtype=object)
+    if not 0 < rows_per_org <= len(combos):
+        raise ValueError(f"rows_per_org must be between 1 and {len(combos)}")
+    weights_kg = material_weights()
+    medians = np.array([weights_kg[(m, s)] for m, s in combos[:, 3:5]], dtype=float)
+    rng = np.random.default_rng(seed)
+    org_array = np.asarray(org_ids, dtype=object)
+
+    for start in range(0, len(org_array), orgs_per_chunk):
+        orgs = org_array[start:start + orgs_per_chunk]
+        # distinct combinations per org: first k of a random permutation per row
+        keys = rng.random((len(orgs), len(combos)))
+        k = rows_per_org
+        picks = np.argpartition(keys, k - 1, axis=1)[:, :k].ravel()
+        spread = rng.lognormal(0.0, weight_sigma, size=picks.size)
+        weights = np.maximum(1, np.rint(medians[picks] * spread))
+
+        columns = {"organisation_id": np.repeat(orgs, rows_per_org)}
+        for i, name in enumerate(_COMBO_COLUMNS):
+            columns[name] = combos[picks, i]
+        columns["packaging_material_weight"] = weights.astype(np.int64)
+        columns["combo"] = picks
+        yield columns
+
+
+def _cell(value: str) -> str:
+    """One CSV field as csv.writer (QUOTE_MINIMAL) would render it."""
+    if any(ch in value for ch in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_pom_dataset(
+    output_csv: str | Path,
+    org_ids: Sequence[str],
+    rows_per_org: int,
+    seed: int = 0,
+    template_csv: str | Path = POM_TEMPLATE,
+    weight_sigma: float = 1.0,
+) -> int:
+    """
+    Write a POM file for `org_ids` following the template's column order and
+    defaults (organisation_size, submission_period, ...), overriding the
+    generated columns. Returns the number of data rows written.
+
+    Only organisation_id and the weight differ per row; everything else is
+    fixed per code combination, so each combination is rendered once into
+    literal CSV segments and rows are joined from those. Rows go to a temp
+    file that replaces `output_csv` only once every row was written.
+    """
+    template: CompiledTemplate = compile_template(template_csv)
+    generated = {"organisation_id", *_COMBO_COLUMNS, "packaging_material_weight"}
+    unknown = generated - template.position.keys()
+    if unknown:
+        raise ValueError(f"Template {template_csv} has no columns {sorted(unknown)}")
+
+    # per-row columns in template order; the literal text between them depends
+    # only on the combination
+    per_row_columns = ("organisation_id", "packaging_material_weight")
+    dynamic = [c for c in template.columns if c in per_row_columns]
+    segments = []
+    for combo in valid_combinations():
+        values = dict(zip(_COMBO_COLUMNS, combo))
+        line = ",".join(
+            "\0" if c in dynamic else _cell(values.get(c, d))
+            for c, d in zip(template.columns, template.defaults)
+        )
+        segments.append(tuple((line + "\n").split("\0")))
+
+    rows = 0
+    out_path = Path(output_csv)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp = out_path.with_name(f".{out_path.name}.{suffix}")
+    try:
+        with tmp.open("w", newline="", encoding="utf-8") as f:
+            f.write(",".join(_cell(c) for c in template.columns) + "\n")
+            chunks = generate_pom_columns(
+                org_ids, rows_per_org, seed=seed, weight_sigma=weight_sigma
+            )
+            for chunk in chunks:
+                weights = chunk["packaging_material_weight"].astype(str).tolist()
+                org_cells = [_cell(str(o)) for o in chunk["organisation_id"]]
+                per_row = {
+                    "organisation_id": org_cells,
+                    "packaging_material_weight": weights,
+                }
+                first, second = (per_row[c] for c in dynamic)
+                row_segments = map(segments.__getitem__, chunk["combo"].tolist())
+                lines = [
+                    seg[0] + a + seg[1] + b + seg[2]
+                    for seg, a, b in zip(row_segments, first, second)
+                ]
+                f.writelines(lines)
+                rows += len(lines)
+        os.replace(tmp, out_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return rows
+
+
+def sequential_org_ids(count: int, start: int = 100000) -> list[str]:
+    """`count` six-digit style organisation ids starting at `start`."""
+    return [str(i) for i in range(start, start + count)]
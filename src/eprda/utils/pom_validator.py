@@ -0,0 +1,262 @@
+# utils/pom_validator.py
+"""
+Local checks for POM (packaging data) CSVs, run before a file is uploaded so
+mistakes show up in milliseconds with row numbers instead of after a browser
+round trip to the portal's warnings page.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from eprda.utils.pom_codes import (
+    NATIONS,
+    NO_ACTIVITY_TYPES,
+    ORGANISATION_SIZES,
+    OTHER_MATERIAL,
+    PACKAGING_ACTIVITIES,
+    PACKAGING_CLASSES,
+    PACKAGING_MATERIALS,
+    SELF_MANAGED_TYPES,
+)
+
+REQUIRED_COLUMNS = (
+    "organisation_id", "subsidiary_id", "organisation_size", "submission_period",
+    "packaging_activity", "packaging_type", "packaging_class", "packaging_material",
+    "packaging_material_subtype", "from_country", "to_country",
+    "packaging_material_weight",
+)
+# one row per combination of these per organisation and period
+DUPLICATE_KEY = (
+    "organisation_id", "subsidiary_id", "submission_period", "packaging_activity",
+    "packaging_type", "packaging_class", "packaging_material",
+    "packaging_material_subtype", "from_country", "to_country",
+)
+MAX_WEIGHT_KG = 99_999_999
+
+
+def _fails(values: pd.Series, pattern: str) -> pd.Series:
+    # regex only over the distinct values (a chunk has few periods / org ids),
+    # then a hash lookup per row
+    bad = [v for v in values.unique() if not re.fullmatch(pattern, v)]
+    return values.isin(bad)
+
+
+@dataclass(frozen=True)
+class RowError:
+    row: int        # line number in the CSV (header is line 1)
+    column: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.row}: {self.column}: {self.message}"
+
+
+class PomValidationError(ValueError):
+    def __init__(self, path: str | Path, errors: List[RowError], total: int):
+        self.path = str(path)
+        self.errors = errors
+        self.total = total
+        shown = "\n  ".join(str(e) for e in errors)
+        more = f"\n  ... and {total - len(errors)} more" if total > len(errors) else ""
+        super().__init__(f"{path}: {total} POM validation error(s)\n  {shown}{more}")
+
+
+def first_errors(
+    errors: List[RowError],
+    lines: np.ndarray,
+    column: str,
+    message: str,
+    max_errors: int,
+) -> List[RowError]:
+    """
+    Merge the errors for ascending `lines` into `errors`, keeping the
+    `max_errors` lowest lines whichever rule flagged them.
+    """
+    new = [RowError(int(line), column, message) for line in lines[:max_errors]]
+    return sorted(errors + new, key=lambda e: e.row)[:max_errors]
+
+
+def iter_csv_chunks(
+    path: str | Path,
+    columns: Iterable[str],
+    chunksize: int,
+    **read_csv_kwargs,
+) -> Iterator[tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Read `columns` of a CSV in chunks of strings, yielding each chunk without
+    its blank lines together with the CSV line number of every row (header
+    is line 1). Blank lines are kept by the reader so line numbers do not
+    drift past them.
+    """
+    wanted = set(columns)
+    reader = pd.read_csv(
+        path,
+        dtype=str,
+        keep_default_na=False,
+        skip_blank_lines=False,
+        usecols=lambda c: c in wanted,
+        chunksize=chunksize,
+        **read_csv_kwargs,
+    )
+    for df in reader:
+        blank = (df == "").all(axis=1).to_numpy()
+        lines = df.index.to_numpy() + 2
+        if blank.any():
+            df, lines = df[~blank], lines[~blank]
+        yield df, lines
+
+
+def _check_chunk(df: pd.DataFrame) -> Iterable[tuple[pd.Series, str, str]]:
+    """(failing-row mask, column, message) for every rule, evaluated column-wise."""
+    ptype = df["packaging_type"]
+    activity = df["packaging_activity"]
+    material = df["packaging_material"]
+    from_country = df["from_country"]
+    weight = pd.to_numeric(df["packaging_material_weight"], errors="coerce")
+
+    yield (
+        _fails(df["organisation_id"], r"\d+"),
+        "organisation_id",
+        "must be a numeric organisation id",
+    )
+    yield (
+        ~df["organisation_size"].isin(ORGANISATION_SIZES),
+        "organisation_size",
+        f"must be one of {list(ORGANISATION_SIZES)}",
+    )
+    yield (
+        _fails(df["submission_period"], r"\d{4}-H[12]"),
+        "submission_period",
+        "must look like YYYY-H1 or YYYY-H2",
+    )
+    yield (
+        ~ptype.isin(PACKAGING_CLASSES),
+        "packaging_type",
+        f"must be one of {list(PACKAGING_CLASSES)}",
+    )
+    bad_class = pd.Series(False, index=df.index)
+    for packaging_type, classes in PACKAGING_CLASSES.items():
+        bad_class |= (ptype == packaging_type) & ~df["packaging_class"].isin(classes)
+    yield bad_class, "packaging_class", "not allowed for this packaging_type"
+    materials = [*PACKAGING_MATERIALS, OTHER_MATERIAL]
+    yield (
+        ~material.isin(materials),
+        "packaging_material",
+        f"must be one of {materials}",
+    )
+    yield (
+        (material == OTHER_MATERIAL) & (df["packaging_material_subtype"] == ""),
+        "packaging_material_subtype",
+        f"required when packaging_material is {OTHER_MATERIAL}",
+    )
+    needs_activity = ~ptype.isin(NO_ACTIVITY_TYPES)
+    yield (
+        needs_activity & ~activity.isin(PACKAGING_ACTIVITIES),
+        "packaging_activity",
+        f"must be one of {list(PACKAGING_ACTIVITIES)}",
+    )
+    yield (
+        ~needs_activity & (activity != ""),
+        "packaging_activity",
+        "must be blank for this packaging_type",
+    )
+    self_managed = ptype.isin(SELF_MANAGED_TYPES)
+    yield (
+        self_managed & ~from_country.isin(NATIONS),
+        "from_country",
+        f"must be one of {list(NATIONS)} for self-managed waste",
+    )
+    yield (
+        ~self_managed & (from_country != ""),
+        "from_country",
+        "must be blank unless packaging_type is self-managed waste",
+    )
+    yield (
+        ~df["to_country"].isin(["", *NATIONS]),
+        "to_country",
+        f"must be blank or one of {list(NATIONS)}",
+    )
+    yield (
+        weight.isna()
+        | (weight != np.floor(weight))
+        | (weight < 1)
+        | (weight > MAX_WEIGHT_KG),
+        "packaging_material_weight",
+        f"must be a whole number of kg between 1 and {MAX_WEIGHT_KG:,}",
+    )
+
+
+def duplicate_lines(
+    key_hashes: List[np.ndarray],
+    lines: List[np.ndarray],
+) -> np.ndarray:
+    """
+    CSV line numbers of rows whose key hash repeats an earlier row, given the
+    per-chunk hashes of the data rows and their line numbers.
+    """
+    if not key_hashes:
+        return np.array([], dtype=np.int64)
+    hashes = np.concatenate(key_hashes)
+    order = np.argsort(hashes, kind="stable")
+    repeated = np.flatnonzero(hashes[order][1:] == hashes[order][:-1]) + 1
+    return np.sort(np.concatenate(lines)[order[repeated]])
+
+
+def validate_pom_file(
+    path: str | Path,
+    chunksize: int = 500_000,
+    max_errors: int = 50,
+) -> tuple[List[RowError], int]:
+    """
+    Validate a POM CSV in chunks (constant memory for multi-million-row files).
+    Returns the `max_errors` row-level errors with the lowest line numbers and
+    the total error count.
+    """
+    path = Path(path)
+    errors: List[RowError] = []
+    total = 0
+    key_hashes: List[np.ndarray] = []
+    key_lines: List[np.ndarray] = []
+
+    def add(lines: np.ndarray, column: str, message: str) -> None:
+        nonlocal errors, total
+        total += len(lines)
+        errors = first_errors(errors, lines, column, message, max_errors)
+
+    chunks = iter_csv_chunks(
+        path, REQUIRED_COLUMNS, chunksize, skipinitialspace=True
+    )
+    for df, lines in chunks:
+        missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+        if missing:
+            add(np.array([1]), "header", f"missing columns {missing}")
+            return errors, total
+        for mask, column, message in _check_chunk(df):
+            if mask.any():
+                add(lines[mask.to_numpy()], column, message)
+        keys = df[list(DUPLICATE_KEY)]
+        key_hashes.append(pd.util.hash_pandas_object(keys, index=False).to_numpy())
+        key_lines.append(lines)
+
+    dup_lines = duplicate_lines(key_hashes, key_lines)
+    if len(dup_lines):
+        key = ", ".join(DUPLICATE_KEY)
+        add(dup_lines, "row", f"duplicate of an earlier row with the same {key}")
+
+    return errors, total
+
+
+def ensure_valid_pom_file(path: str | Path, max_errors: int = 50) -> None:
+    """
+    Raise PomValidationError listing row-level problems if the POM file is
+    invalid.
+    """
+    errors, total = validate_pom_file(path, max_errors=max_errors)
+    if total:
+        raise PomValidationError(path, errors, total)
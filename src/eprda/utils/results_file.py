@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping
+
+
+def append_jsonl(path: str | Path, record: Any) -> None:
+    """
+    Append one record (dict or dataclass) as a single JSON line.
+    The file is opened per call so partial runs still leave every finished
+    record on disk.
+    """
+    if is_dataclass(record) and not isinstance(record, type):
+        record = asdict(record)
+    out_path = Path(path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record, default=str) + "\n")
+
+
+def upsert_jsonl(path: str | Path, record: Any, key: str = "key") -> None:
+    """
+    Write `record` to a JSONL file, replacing any earlier line with the same
+    `record[key]` (e.g. when a resumed run finishes an org again) instead of
+    appending a duplicate. The file is rewritten atomically.
+    """
+    if is_dataclass(record) and not isinstance(record, type):
+        record = asdict(record)
+    out_path = Path(path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = []
+    if out_path.exists():
+        lines = [
+            line
+            for line in out_path.read_text(encoding="utf-8").splitlines()
+            if line.strip() and json.loads(line).get(key) != record[key]
+        ]
+    lines.append(json.dumps(record, default=str))
+    tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, out_path)
+
+
+def read_jsonl(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Yield each non-empty line of a JSONL results file as a dict."""
+    with Path(path).open("r", encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{line_no}: invalid JSON line") from exc
+
+
+def successful_records(path: str | Path) -> Iterator[Mapping[str, Any]]:
+    """Records from a batch results file whose status is 'ok'."""
+    for record in read_jsonl(path):
+        if record.get("status", "ok") == "ok":
+            yield record
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+
+from eprda.utils.csv_factory import OUTPUT_DIR
+
+
+def failure_screenshot_path(name: str, key: str) -> Path:
+    """
+    output/<name>_<key>_<timestamp>.png, so concurrent or batched failures
+    (keyed by email or company) don't overwrite each other's screenshots.
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", key).strip("_")[:60]
+    stamp = time.strftime("%Y%m%dT%H%M%S") + f"{time.time() % 1:.3f}"[1:]
+    return OUTPUT_DIR / f"{name}_{slug}_{stamp}.png"
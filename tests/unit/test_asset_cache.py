@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from eprda.ui.asset_cache import AssetCache
+
+URL = "https://portal.test/css/app.css"
+
+
+class FakeRequest:
+    method = "GET"
+    resource_type = "stylesheet"
+    url = URL
+    headers = {"accept": "text/css"}
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=b"body{}", headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {"content-type": "text/css", "etag": '"v1"'}
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, response=None, error=None, closed=False):
+        self.request = FakeRequest()
+        self.response = response
+        self.error = error
+        self.closed = closed
+        self.fulfilled = None
+        self.continued = False
+
+    async def fetch(self, headers=None):
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+    async def fulfill(self, **kwargs):
+        if self.closed:
+            raise RuntimeError("Target page, context or browser has been closed")
+        self.fulfilled = kwargs
+
+    async def continue_(self):
+        if self.closed:
+            raise RuntimeError("Target page, context or browser has been closed")
+        self.continued = True
+
+    async def fallback(self):
+        self.continued = True
+
+
+def _meta(cache):
+    (meta,) = cache.cache_dir.glob("*.json")
+    return json.loads(meta.read_text(encoding="utf-8"))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_miss_then_hit_serves_from_disk(tmp_path):
+    cache = AssetCache(tmp_path)
+    await cache.handle(FakeRoute(FakeResponse()))
+
+    hit = FakeRoute(error=AssertionError("must not touch the network"))
+    await cache.handle(hit)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert hit.fulfilled["body"] == b"body{}"
+    assert hit.fulfilled["headers"]["etag"] == '"v1"'
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hits_update_metadata_only_on_flush(tmp_path):
+    cache = AssetCache(tmp_path)
+    await cache.handle(FakeRoute(FakeResponse()))
+    stored = _meta(cache)["last_used"]
+
+    await cache.handle(FakeRoute())
+    assert _meta(cache)["last_used"] == stored
+
+    cache.flush()
+    assert _meta(cache)["last_used"] > stored
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_fetch_without_entry_continues_request(tmp_path):
+    cache = AssetCache(tmp_path)
+    route = FakeRoute(error=OSError("connection reset"))
+
+    await cache.handle(route)
+
+    assert route.continued
+    assert route.fulfilled is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_revalidation_serves_stale_copy(tmp_path):
+    cache = AssetCache(tmp_path, ttl_s=0)
+    await cache.handle(FakeRoute(FakeResponse()))
+    route = FakeRoute(error=OSError("connection reset"))
+
+    await cache.handle(route)
+
+    assert cache.stale == 1
+    assert route.fulfilled["body"] == b"body{}"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_closed_page_does_not_raise(tmp_path):
+    cache = AssetCache(tmp_path)
+    route = FakeRoute(error=RuntimeError("closed"), closed=True)
+
+    await cache.handle(route)
+
+    assert not route.continued
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_not_modified_reuses_body(tmp_path):
+    cache = AssetCache(tmp_path, ttl_s=0)
+    await cache.handle(FakeRoute(FakeResponse()))
+    route = FakeRoute(FakeResponse(status=304, body=b""))
+
+    await cache.handle(route)
+
+    assert cache.revalidated == 1
+    assert route.fulfilled["body"] == b"body{}"
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from eprda.ui.browser import BrowserPool
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.connected = False
+
+
+def _started_pool(size, max_contexts=2):
+    pool = BrowserPool(size=size, max_contexts_per_browser=max_contexts)
+    # stand in for the Playwright driver; launches are faked per test
+    pool._playwright = object()
+    pool._browsers = [FakeBrowser() for _ in range(size)]
+    pool._active = [0] * size
+    pool._uses = [0] * size
+    return pool
+
+
+async def _acquire(pool, timeout=1.0):
+    return await asyncio.wait_for(pool._acquire_slot(), timeout=timeout)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_draining_browser_does_not_block_healthy_slots():
+    pool = _started_pool(size=2, max_contexts=2)
+    pool._uses = [2, 1]
+    pool._active = [1, 3]  # slot 0 is due for recycling but still busy
+
+    assert await _acquire(pool) == 1
+    assert pool._active == [1, 4]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_launch_runs_outside_the_lock():
+    pool = _started_pool(size=2)
+    pool._browsers[0] = None  # slot 0 has to launch a browser
+    pool._uses = [0, 1]
+    pool._active = [0, 1]
+    launching = asyncio.Event()
+    launched = asyncio.Event()
+
+    async def slow_launch():
+        launching.set()
+        await launched.wait()
+        return FakeBrowser()
+
+    pool._launch = slow_launch
+    first = asyncio.create_task(pool._acquire_slot())
+    await asyncio.wait_for(launching.wait(), timeout=1.0)
+
+    # another caller gets the healthy slot while slot 0 is still launching
+    assert await _acquire(pool) == 1
+    launched.set()
+    assert await first == 0
+    assert pool._browsers[0] is not None
+    assert pool._active == [1, 2]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_waits_only_when_no_slot_is_usable():
+    pool = _started_pool(size=1, max_contexts=1)
+    old = pool._browsers[0]
+    pool._uses = [1]
+    pool._active = [1]
+    pool._launch = lambda: asyncio.sleep(0, result=FakeBrowser())
+
+    waiter = asyncio.create_task(pool._acquire_slot())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await pool._release_slot(0)
+    assert await asyncio.wait_for(waiter, timeout=1.0) == 0
+    assert not old.is_connected()
+    assert pool._browsers[0] is not old
+    assert pool._uses == [1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_launch_frees_the_slot():
+    pool = _started_pool(size=1)
+    pool._browsers[0] = None
+
+    async def broken_launch():
+        raise RuntimeError("no browser")
+
+    pool._launch = broken_launch
+    with pytest.raises(RuntimeError, match="no browser"):
+        await _acquire(pool)
+
+    assert pool._active == [0]
+    pool._launch = lambda: asyncio.sleep(0, result=FakeBrowser())
+    assert await _acquire(pool) == 0
@@ -0,0 +1,206 @@
+import asyncio
+import multiprocessing
+
+import pytest
+
+from eprda.clients.company_pool import CompanyNumberPool, settle_companies
+
+PROFILE = "dev15"
+
+
+def _companies(count, start=0):
+    return [
+        {"company_number": f"{i:08d}", "company_name": f"COMPANY {i} LTD"}
+        for i in range(start, start + count)
+    ]
+
+
+def _lease_until_empty(path, batch):
+    # runs in a child process: its own connection to the shared pool file
+    pool = CompanyNumberPool(PROFILE, path=path)
+    leased = []
+    try:
+        while True:
+            got = pool.lease(batch, owner=f"worker-{batch}")
+            if not got:
+                return leased
+            leased.extend(c["company_number"] for c in got)
+    finally:
+        pool.close()
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = CompanyNumberPool(PROFILE, path=tmp_path / "pool.sqlite")
+    yield pool
+    pool.close()
+
+
+@pytest.mark.unit
+def test_leases_are_unique_across_processes(pool):
+    pool.add(_companies(400))
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(4) as workers:
+        results = workers.starmap(
+            _lease_until_empty, [(pool.path, batch) for batch in (1, 3, 7, 11)]
+        )
+
+    leased = [n for result in results for n in result]
+    assert len(leased) == len(set(leased)) == 400
+    assert pool.available() == 0
+
+
+@pytest.mark.unit
+def test_lease_skips_leased_and_used_numbers(pool):
+    pool.add(_companies(5))
+
+    first = pool.lease(2)
+    pool.mark_used([c["company_number"] for c in first])
+    second = pool.lease(2)
+
+    numbers = {c["company_number"] for c in first + second}
+    assert len(numbers) == 4
+    assert pool.available() == 1
+
+
+@pytest.mark.unit
+def test_release_returns_leased_numbers(pool):
+    pool.add(_companies(3))
+    leased = pool.lease(3)
+    assert pool.available() == 0
+
+    pool.release(c["company_number"] for c in leased)
+
+    assert pool.available() == 3
+    assert pool.lease(3) == leased
+
+
+@pytest.mark.unit
+def test_release_does_not_return_used_numbers(pool):
+    pool.add(_companies(2))
+    leased = [c["company_number"] for c in pool.lease(2)]
+    pool.mark_used(leased[:1])
+
+    pool.release(leased)
+
+    assert [c["company_number"] for c in pool.lease(2)] == leased[1:]
+
+
+@pytest.mark.unit
+def test_release_only_frees_the_owners_leases(pool):
+    pool.add(_companies(2))
+    mine = [c["company_number"] for c in pool.lease(1)]
+    theirs = [c["company_number"] for c in pool.lease(1, owner="pid:other")]
+
+    pool.release(mine + theirs)
+
+    assert [c["company_number"] for c in pool.lease(2)] == mine
+
+
+@pytest.mark.unit
+def test_expired_lease_taken_over_is_not_released_by_old_owner(tmp_path):
+    path = tmp_path / "pool.sqlite"
+    first = CompanyNumberPool(PROFILE, path=path, lease_ttl_s=0, owner="pid:1")
+    second = CompanyNumberPool(PROFILE, path=path, lease_ttl_s=0, owner="pid:2")
+    try:
+        first.add(_companies(1))
+        numbers = [c["company_number"] for c in first.lease(1)]
+        assert second.lease(1)
+
+        first.release(numbers)
+
+        owners = second._conn.execute("SELECT owner FROM company_usage").fetchall()
+        assert [row["owner"] for row in owners] == ["pid:2"]
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.unit
+def test_usage_is_per_profile(pool):
+    pool.add(_companies(2))
+    pool.mark_used(c["company_number"] for c in pool.lease(2))
+
+    other = CompanyNumberPool("tst1", path=pool.path)
+    try:
+        assert other.available() == 2
+        assert len(other.lease(2)) == 2
+    finally:
+        other.close()
+
+
+@pytest.mark.unit
+def test_expired_leases_are_handed_out_again(tmp_path):
+    pool = CompanyNumberPool(PROFILE, path=tmp_path / "pool.sqlite", lease_ttl_s=0)
+    try:
+        pool.add(_companies(1))
+        first = pool.lease(1)
+
+        assert pool.lease(1) == first
+    finally:
+        pool.close()
+
+
+@pytest.mark.unit
+def test_add_ignores_known_numbers(pool):
+    assert pool.add(_companies(3)) == 3
+    assert pool.add(_companies(3, start=2)) == 2
+    assert pool.available() == 5
+
+
+@pytest.mark.unit
+def test_fetch_companies_without_enough_releases_and_raises(pool):
+    pool.add(_companies(2))
+
+    with pytest.raises(RuntimeError, match="only 2 unused companies"):
+        pool.fetch_companies(max_records=3)
+
+    assert pool.available() == 2
+
+
+@pytest.mark.unit
+def test_fetch_companies_refills_from_source(tmp_path):
+    class Source:
+        def fetch_companies(self, max_records=10):
+            return _companies(max_records, start=100)
+
+    pool = CompanyNumberPool(
+        PROFILE, ch=Source(), path=tmp_path / "pool.sqlite", refill=5
+    )
+    try:
+        pool.add(_companies(1))
+
+        got = pool.fetch_companies(max_records=3)
+
+        assert len(got) == 3
+        assert pool.available() == 3
+    finally:
+        pool.close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("used, available", [(True, 0), (False, 2)])
+def test_settle_companies(pool, used, available):
+    pool.add(_companies(2))
+    numbers = [c["company_number"] for c in pool.fetch_companies(max_records=2)]
+
+    settle_companies(pool, numbers, used=used)
+
+    assert pool.available() == available
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_settle_companies_from_worker_threads(pool):
+    pool.add(_companies(20))
+    numbers = [c["company_number"] for c in pool.fetch_companies(max_records=20)]
+
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(settle_companies, pool, [n], i % 2 == 0)
+            for i, n in enumerate(numbers)
+        )
+    )
+
+    assert pool.available() == 10
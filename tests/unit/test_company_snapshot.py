@@ -0,0 +1,124 @@
+import csv
+
+import pandas as pd
+import pytest
+
+from eprda.clients.company_snapshot import (
+    CompanySnapshotSource,
+    _encode_codes,
+    build_snapshot_index,
+)
+
+# the bulk file's headers carry stray spaces
+HEADER = [
+    "CompanyName",
+    " CompanyNumber",
+    "RegAddress.PostTown",
+    "CompanyCategory",
+    "CompanyStatus",
+    "SICCode.SicText_1",
+    "SICCode.SicText_2",
+    "SICCode.SicText_3",
+    "SICCode.SicText_4",
+]
+LTD = "Private Limited Company"
+PLC = "Public Limited Company"
+ROWS = [
+    ("ACME LTD", "00000003", "LEEDS", LTD, "Active",
+     "62020 - Information technology consultancy activities", "", "", ""),
+    ("BETA PLC", "SC000002", "EDINBURGH", PLC, "Active", "None Supplied", "", "", ""),
+    ("CAFÉ ÉTOILE LTD", "00000001", "LONDON", LTD, "Dissolved",
+     "56101 - Licensed restaurants", "", "", ""),
+    ("DELTA LTD", "00000004", "YORK", LTD, "Active",
+     "41100 - Development of building projects",
+     "62020 - Information technology consultancy activities", "", ""),
+    ("ECHO LTD", "00000005", "BATH", LTD, "Liquidation", "", "", "", ""),
+]
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    csv_path = tmp_path / "BasicCompanyDataAsOneFile.csv"
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(ROWS)
+    # a tiny chunksize so vocabularies and name offsets span chunks
+    return build_snapshot_index(csv_path, tmp_path / "index", chunksize=2)
+
+
+def _numbers(companies):
+    return sorted(c["company_number"] for c in companies)
+
+
+@pytest.mark.unit
+def test_lookup_round_trips_every_row(index_dir):
+    source = CompanySnapshotSource(index_dir, status=None, company_type=None)
+
+    assert len(source) == len(ROWS)
+    for name, number, *_ in ROWS:
+        assert source.lookup(number.lower()) == {
+            "company_number": number,
+            "company_name": name,
+        }
+    assert source.lookup("99999999") is None
+
+
+@pytest.mark.unit
+def test_default_filters_keep_active_private_companies(index_dir):
+    source = CompanySnapshotSource(index_dir, seed=1)
+
+    assert len(source) == 2
+    assert _numbers(source.fetch_companies(max_records=10)) == [
+        "00000003",
+        "00000004",
+    ]
+
+
+@pytest.mark.unit
+def test_sic_filter_matches_any_of_the_four_codes(index_dir):
+    source = CompanySnapshotSource(index_dir, sic=[62020], seed=1)
+
+    assert _numbers(source.fetch_companies()) == ["00000003", "00000004"]
+
+
+@pytest.mark.unit
+def test_unknown_filter_value_is_rejected(index_dir):
+    with pytest.raises(ValueError, match="Unknown status"):
+        CompanySnapshotSource(index_dir, status=["Open"])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(5))
+def test_pick_hands_out_each_candidate_once_then_raises(index_dir, seed):
+    source = CompanySnapshotSource(
+        index_dir, status=None, company_type=[LTD], seed=seed
+    )
+
+    picked = [source.pick() for _ in range(len(source))]
+
+    assert _numbers(picked) == ["00000001", "00000003", "00000004", "00000005"]
+    assert source.fetch_companies() == []
+    with pytest.raises(RuntimeError, match="exhausted"):
+        source.pick()
+
+
+@pytest.mark.unit
+def test_encode_codes_extends_the_vocabulary_in_first_seen_order():
+    vocab = ["Active"]
+
+    codes = _encode_codes(
+        pd.Series([" Dissolved", "Active", None, "Dissolved"]), vocab
+    )
+
+    assert vocab == ["Active", "Dissolved", ""]
+    assert codes.tolist() == [1, 0, 2, 1]
+    assert codes.dtype == "u1"
+
+
+@pytest.mark.unit
+def test_encode_codes_rejects_more_than_255_values():
+    vocab = [str(i) for i in range(254)]
+
+    with pytest.raises(ValueError, match="at 'b'"):
+        _encode_codes(pd.Series(["a", "b"]), vocab)
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from eprda.utils.csv_factory import TEMPLATES_DIR, create_csv_from_template
+
+POM_TEMPLATE = TEMPLATES_DIR / "pom-file-template.csv"
+ORG_TEMPLATE = TEMPLATES_DIR / "org-file-template.csv"
+
+
+def _write_with_pandas(template_csv, output_csv, rows):
+    # the DataFrame path create_csv_from_template used before rows were streamed
+    df = pd.read_csv(template_csv, dtype=str, keep_default_na=False, nrows=1)
+    columns = list(df.columns)
+    if df.empty:
+        base_row = {c: "" for c in columns}
+    else:
+        first = df.iloc[0].fillna("")
+        base_row = {c: str(first[c]) for c in columns}
+    built = []
+    for overrides in rows:
+        row = dict(base_row)
+        row.update({k: "" if v is None else str(v) for k, v in overrides.items()})
+        built.append(row)
+    out = pd.DataFrame(built, columns=columns).fillna("")
+    out.to_csv(output_csv, index=False, encoding="utf-8", lineterminator="\n")
+
+
+ROWS = [
+    {},
+    {"organisation_id": 100001, "packaging_material_weight": 12.5},
+    {"subsidiary_id": None, "packaging_type": "HH", "packaging_class": "P1"},
+    {"organisation_id": "1,2", "ram_rag_rating": 'say "hi"'},
+    {"to_country": "line\nbreak", "from_country": "Cymru – ŵ"},
+    {"packaging_material_units": "", "transitional_packaging_units": " 7 "},
+]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cache", [False, True])
+def test_streamed_output_matches_pandas(tmp_path, cache):
+    expected = tmp_path / "expected.csv"
+    _write_with_pandas(POM_TEMPLATE, expected, ROWS)
+
+    out = create_csv_from_template(
+        POM_TEMPLATE, tmp_path / "out" / "pom.csv", ROWS, cache=cache
+    )
+
+    assert out.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.unit
+def test_generator_rows_match_pandas(tmp_path):
+    rows = [{"organisation_id": 100000 + i, "subsidiary_id": i} for i in range(50)]
+    expected = tmp_path / "expected.csv"
+    _write_with_pandas(ORG_TEMPLATE, expected, rows)
+
+    out = create_csv_from_template(
+        ORG_TEMPLATE, tmp_path / "org.csv", (dict(r) for r in rows)
+    )
+
+    assert out.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.unit
+def test_blank_template_defaults_match_pandas(tmp_path):
+    template = tmp_path / "template.csv"
+    template.write_text("a,b,c\n", encoding="utf-8")
+    rows = [{"a": 1}, {"c": "x"}]
+    expected = tmp_path / "expected.csv"
+    _write_with_pandas(template, expected, rows)
+
+    out = create_csv_from_template(template, tmp_path / "out.csv", rows)
+
+    assert out.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.unit
+def test_unknown_field_leaves_no_partial_file(tmp_path):
+    out = tmp_path / "pom.csv"
+
+    def bad_rows():
+        for i in range(3):
+            yield {"organisation_id": i}
+        yield {"not_a_column": "x"}
+
+    with pytest.raises(ValueError, match="Row 4 contains unknown fields"):
+        create_csv_from_template(POM_TEMPLATE, out, bad_rows())
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+def test_unknown_field_keeps_existing_file(tmp_path):
+    out = create_csv_from_template(POM_TEMPLATE, tmp_path / "pom.csv", [{}])
+    before = out.read_bytes()
+
+    with pytest.raises(ValueError):
+        create_csv_from_template(POM_TEMPLATE, out, [{}, {"bogus": 1}])
+
+    assert out.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["pom.csv"]
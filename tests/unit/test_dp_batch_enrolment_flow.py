@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from eprda.clients.company_pool import CompanyNumberPool
+from eprda.flows import dp_batch_enrolment_flow
+from eprda.flows.dp_batch_enrolment_flow import (
+    fetch_unique_companies,
+    run_dp_batch_enrolment,
+)
+
+
+class FlakyPool(CompanyNumberPool):
+    """Leases one company per call, then the upstream read breaks."""
+
+    calls = 0
+
+    def fetch_companies(self, max_records=10):
+        self.calls += 1
+        if self.calls > 1:
+            raise ConnectionError("stream dropped")
+        return self.lease(1)
+
+
+class FakeBrowserPool:
+    @asynccontextmanager
+    async def page(self):
+        yield object()
+
+
+def _fill(pool, count):
+    pool.add(
+        {"company_number": f"{i:08d}", "company_name": f"COMPANY {i} LTD"}
+        for i in range(count)
+    )
+
+
+@pytest.mark.unit
+def test_failed_fetch_releases_companies_already_leased(tmp_path):
+    pool = FlakyPool("dev15", path=tmp_path / "pool.sqlite")
+    try:
+        _fill(pool, 3)
+
+        with pytest.raises(ConnectionError):
+            fetch_unique_companies(pool, 3)
+
+        assert pool.available() == 3
+    finally:
+        pool.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancelled_batch_releases_companies_never_started(
+    tmp_path, monkeypatch
+):
+    pool = CompanyNumberPool("dev15", path=tmp_path / "pool.sqlite")
+    _fill(pool, 3)
+    started = asyncio.Event()
+
+    async def stuck_enrolment(**kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(
+        dp_batch_enrolment_flow, "create_dp_enrolment_flow", stuck_enrolment
+    )
+    batch = asyncio.create_task(
+        run_dp_batch_enrolment(
+            producer_base_url="https://portal.test",
+            ch=pool,
+            notifications=None,
+            pool=FakeBrowserPool(),
+            count=3,
+            concurrency=1,
+            results_path=tmp_path / "results.jsonl",
+        )
+    )
+    try:
+        await asyncio.wait_for(started.wait(), timeout=2)
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batch
+
+        # the in-flight company may be on the portal already: still leased
+        assert pool.available() == 2
+    finally:
+        pool.close()
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+
+from eprda.clients.company_pool import CompanyNumberPool
+from eprda.flows import dp_data_setup_flow
+from eprda.flows.pipeline import OrgJob
+
+COMPANY = {"company_number": "00000001", "company_name": "COMPANY 1 LTD"}
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = CompanyNumberPool("dev15", path=tmp_path / "pool.sqlite")
+    pool.add([COMPANY])
+    yield pool
+    pool.close()
+
+
+def _enrol_stage(pool):
+    config = SimpleNamespace(env=SimpleNamespace(PRODUCER_BASE_URL="https://portal.test"))
+    (stage,) = dp_data_setup_flow.dp_data_setup_stages(
+        config, pool, notifications=None, sessions=None, names=["enrol"]
+    )
+    return stage
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_enrol_releases_and_forgets_the_company(pool, monkeypatch):
+    async def broken_enrolment(**kwargs):
+        raise RuntimeError("portal down")
+
+    monkeypatch.setattr(
+        dp_data_setup_flow, "create_dp_enrolment_flow", broken_enrolment
+    )
+    company = pool.lease(1)[0]
+    job = OrgJob(key="org-1", data={"email": "a@example.com", "company": company})
+
+    with pytest.raises(RuntimeError):
+        await _enrol_stage(pool).run(job, page=None)
+
+    assert "company" not in job.data
+    assert pool.available() == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_enrolled_company_is_marked_used(pool, monkeypatch):
+    async def enrolment(**kwargs):
+        return kwargs["company"]["company_name"]
+
+    monkeypatch.setattr(dp_data_setup_flow, "create_dp_enrolment_flow", enrolment)
+    company = pool.lease(1)[0]
+    job = OrgJob(key="org-1", data={"email": "a@example.com", "company": company})
+
+    assert await _enrol_stage(pool).run(job, page=None) == "COMPANY 1 LTD"
+    assert job.data["company"] == COMPANY
+    assert pool.available() == 0
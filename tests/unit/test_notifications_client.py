@@ -0,0 +1,125 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from eprda.clients.notifications_client import NotificationsClient, NotificationsConfig
+
+CONFIG = NotificationsConfig(
+    issuer="issuer", secret="s" * 32, poll_initial_s=0.01, poll_max_s=0.05
+)
+
+
+def _email(email, body, seconds_ago=0):
+    created = datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)
+    return {
+        "id": f"{email}-{seconds_ago}",
+        "email_address": email,
+        "created_at": created.isoformat(),
+        "body": body,
+    }
+
+
+def _code_body(code):
+    return (
+        f"Your 6-digit verification code: #{code}\n"
+        "This code will expire in 10 minutes"
+    )
+
+
+def _client(handler):
+    http = httpx.AsyncClient(
+        base_url=CONFIG.api_base_url, transport=httpx.MockTransport(handler)
+    )
+    return NotificationsClient(CONFIG, http=http)
+
+
+def _feed(*notifications):
+    def handler(request):
+        if request.url.params.get("older_than"):
+            return httpx.Response(200, json={"notifications": []})
+        return httpx.Response(200, json={"notifications": list(notifications)})
+
+    return handler
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_code_found_behind_a_newer_email_without_one():
+    client = _client(
+        _feed(
+            _email("a@example.com", "Welcome to the service", seconds_ago=1),
+            _email("a@example.com", _code_body("123456"), seconds_ago=5),
+        )
+    )
+    since = datetime.now(timezone.utc) - timedelta(seconds=30)
+
+    try:
+        code = await client.wait_for_verification_code(
+            "A@example.com", time.monotonic() + 2, since=since
+        )
+    finally:
+        await client.aclose()
+
+    assert code == "123456"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_codes_are_fanned_out_per_email():
+    client = _client(
+        _feed(
+            _email("b@example.com", _code_body("222222"), seconds_ago=1),
+            _email("a@example.com", _code_body("111111"), seconds_ago=2),
+        )
+    )
+    deadline = time.monotonic() + 2
+
+    try:
+        a = await client.wait_for_verification_code("a@example.com", deadline)
+        b = await client.wait_for_verification_code("b@example.com", deadline)
+    finally:
+        await client.aclose()
+
+    assert (a, b) == ("111111", "222222")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_malformed_payload_fails_waiters_and_poller_restarts():
+    responses = [
+        httpx.Response(200, content=b"not json"),
+        httpx.Response(
+            200,
+            json={"notifications": [_email("a@example.com", _code_body("654321"))]},
+        ),
+    ]
+    client = _client(lambda request: responses.pop(0))
+
+    try:
+        with pytest.raises(ValueError):
+            await client.wait_for_verification_code(
+                "a@example.com", time.monotonic() + 2
+            )
+        code = await client.wait_for_verification_code(
+            "a@example.com", time.monotonic() + 2
+        )
+    finally:
+        await client.aclose()
+
+    assert code == "654321"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_missing_code_times_out():
+    client = _client(_feed(_email("a@example.com", "no code here")))
+
+    try:
+        with pytest.raises(TimeoutError, match="a@example.com"):
+            await client.wait_for_verification_code(
+                "a@example.com", time.monotonic() + 0.1
+            )
+    finally:
+        await client.aclose()
@@ -0,0 +1,60 @@
+import pytest
+
+from eprda.utils.csv_factory import TEMPLATES_DIR, create_csv_from_template
+from eprda.utils.org_pom_consistency import (
+    OrgPomConsistencyError,
+    check_org_pom_consistency,
+    ensure_org_pom_consistent,
+)
+
+ORG_TEMPLATE = TEMPLATES_DIR / "org-file-template.csv"
+POM_TEMPLATE = TEMPLATES_DIR / "pom-file-template.csv"
+
+
+def _files(tmp_path, org_rows, pom_rows):
+    org = create_csv_from_template(ORG_TEMPLATE, tmp_path / "org.csv", org_rows)
+    pom = create_csv_from_template(POM_TEMPLATE, tmp_path / "pom.csv", pom_rows)
+    return org, pom
+
+
+@pytest.mark.unit
+def test_files_built_from_the_templates_are_consistent(tmp_path):
+    org, pom = _files(
+        tmp_path, [{"organisation_id": "100001"}], [{"organisation_id": "100001"}]
+    )
+
+    report = ensure_org_pom_consistent(org, pom)
+
+    assert (report.org_rows, report.pom_rows, report.total) == (1, 1, 0)
+
+
+@pytest.mark.unit
+def test_mismatches_are_reported_by_pom_line(tmp_path):
+    org, pom = _files(
+        tmp_path,
+        [{"organisation_id": "100001"}],
+        [
+            {"organisation_id": "100001"},
+            {"organisation_id": "100002"},
+            {"organisation_id": "100001", "organisation_size": "S", "to_country": "EN"},
+        ],
+    )
+
+    report = check_org_pom_consistency(org, pom)
+
+    assert [(e.row, e.column) for e in report.errors] == [
+        (3, "organisation_id/subsidiary_id"),
+        (4, "organisation_size"),
+    ]
+
+
+@pytest.mark.unit
+def test_ensure_raises_with_the_errors(tmp_path):
+    org, pom = _files(
+        tmp_path, [{"organisation_id": "100001"}], [{"organisation_id": "100002"}]
+    )
+
+    with pytest.raises(OrgPomConsistencyError, match="line 2: organisation_id") as info:
+        ensure_org_pom_consistent(org, pom)
+
+    assert info.value.report.total == 1
@@ -0,0 +1,152 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import pytest
+
+from eprda.flows.pipeline import OrgJob, Pipeline, Stage
+from eprda.flows.run_store import RunStore
+
+
+class FakePool:
+    """Stands in for BrowserPool: hands out placeholder pages."""
+
+    @asynccontextmanager
+    async def page(self):
+        yield object()
+
+
+@dataclass
+class Enrolment:
+    reference: str
+
+
+class Calls:
+    def __init__(self):
+        self.counts = {}
+
+    def stage(self, name, result=None, fail_for=()):
+        async def run(job, page):
+            self.counts[(job.key, name)] = self.counts.get((job.key, name), 0) + 1
+            await asyncio.sleep(0)
+            if job.key in fail_for:
+                raise RuntimeError(f"{name} broke")
+            return result(job) if result else f"{name}:{job.key}"
+
+        return run
+
+
+def _jobs(*keys):
+    return [OrgJob(key=k, data={"email": f"{k}@example.com"}) for k in keys]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite")
+    store.create_run("run-1", "dev15", {"orgs": 2})
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_stage_skips_its_dependants_only():
+    calls = Calls()
+    stages = [
+        Stage("enrol", calls.stage("enrol", fail_for={"org-1"})),
+        Stage("approve", calls.stage("approve"), depends_on=("enrol",)),
+        Stage("upload", calls.stage("upload")),
+    ]
+
+    jobs = await Pipeline(stages, FakePool()).run(_jobs("org-1", "org-2"))
+
+    failed, passed = jobs
+    assert failed.status == {"enrol": "failed", "approve": "skipped", "upload": "ok"}
+    assert failed.errors["enrol"] == "RuntimeError: enrol broke"
+    assert "enrol" in failed.errors["approve"]
+    assert ("org-1", "approve") not in calls.counts
+    assert passed.ok
+    assert passed.outputs["approve"] == "approve:org-2"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_resume_skips_completed_stages(store):
+    calls = Calls()
+    enrol = calls.stage("enrol", result=lambda job: Enrolment(f"REF-{job.key}"))
+    first = [
+        Stage("enrol", enrol, decode=lambda d: Enrolment(**d)),
+        Stage(
+            "approve",
+            calls.stage("approve", fail_for={"org-1"}),
+            depends_on=("enrol",),
+        ),
+    ]
+    await Pipeline(first, FakePool(), store=store, run_id="run-1").run(
+        _jobs("org-1", "org-2")
+    )
+
+    decoders = {s.name: s.decode for s in first if s.decode}
+    jobs = store.load_jobs("run-1", decoders=decoders)
+    assert [j.key for j in jobs] == ["org-1", "org-2"]
+    assert jobs[0].status == {"enrol": "ok"}
+    assert jobs[0].data == {"email": "org-1@example.com"}
+    assert jobs[0].outputs["enrol"] == Enrolment("REF-org-1")
+
+    retry = [
+        Stage("enrol", enrol, decode=lambda d: Enrolment(**d)),
+        Stage("approve", calls.stage("approve"), depends_on=("enrol",)),
+    ]
+    resumed = await Pipeline(retry, FakePool(), store=store, run_id="run-1").run(jobs)
+
+    assert all(job.ok for job in resumed)
+    assert calls.counts[("org-1", "enrol")] == 1
+    assert calls.counts[("org-2", "enrol")] == 1
+    assert calls.counts[("org-1", "approve")] == 2
+    assert calls.counts[("org-2", "approve")] == 1
+    reloaded = store.load_jobs("run-1")
+    assert all(set(j.status) == {"enrol", "approve"} for j in reloaded)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stage_concurrency_is_limited():
+    running = 0
+    peak = 0
+
+    async def slow(job, page):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    stages = [Stage("enrol", slow, concurrency=2)]
+
+    jobs = await Pipeline(stages, FakePool()).run(_jobs(*"abcdef"))
+
+    assert all(job.ok for job in jobs)
+    assert peak == 2
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "stages, message",
+    [
+        (
+            [Stage("a", None, depends_on=("b",)), Stage("b", None, depends_on=("a",))],
+            "cycle",
+        ),
+        ([Stage("a", None, depends_on=("missing",))], "unknown stages"),
+        ([Stage("a", None), Stage("a", None)], "unique"),
+    ],
+)
+def test_invalid_stage_graph_raises(stages, message):
+    with pytest.raises(ValueError, match=message):
+        Pipeline(stages, FakePool())
+
+
+@pytest.mark.unit
+def test_store_requires_run_id(store):
+    with pytest.raises(ValueError, match="run_id"):
+        Pipeline([], FakePool(), store=store)
@@ -0,0 +1,136 @@
+import csv
+
+import numpy as np
+import pytest
+
+from eprda.utils.csv_factory import create_csv_from_template
+from eprda.utils.pom_codes import (
+    OTHER_MATERIAL,
+    OTHER_MATERIAL_SUBTYPES,
+    valid_combinations,
+)
+from eprda.utils.pom_generator import (
+    POM_TEMPLATE,
+    generate_pom_columns,
+    sequential_org_ids,
+    write_pom_dataset,
+)
+
+ORG_IDS = sequential_org_ids(25)
+
+
+@pytest.mark.unit
+def test_same_seed_gives_same_file(tmp_path):
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    write_pom_dataset(first, ORG_IDS, rows_per_org=8, seed=42)
+    write_pom_dataset(second, ORG_IDS, rows_per_org=8, seed=42)
+
+    assert first.read_bytes() == second.read_bytes()
+
+
+@pytest.mark.unit
+def test_different_seed_gives_different_file(tmp_path):
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    write_pom_dataset(first, ORG_IDS, rows_per_org=8, seed=1)
+    write_pom_dataset(second, ORG_IDS, rows_per_org=8, seed=2)
+
+    assert first.read_bytes() != second.read_bytes()
+
+
+@pytest.mark.unit
+def test_row_count_is_orgs_times_rows_per_org(tmp_path):
+    out = tmp_path / "pom.csv"
+
+    written = write_pom_dataset(out, ORG_IDS, rows_per_org=6, seed=3)
+
+    with out.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert written == len(rows) == len(ORG_IDS) * 6
+    for org in ORG_IDS:
+        assert sum(r["organisation_id"] == org for r in rows) == 6
+
+
+@pytest.mark.unit
+def test_combinations_are_distinct_per_org():
+    chunks = generate_pom_columns(ORG_IDS, rows_per_org=20, seed=5, orgs_per_chunk=7)
+
+    for chunk in chunks:
+        picks = chunk["combo"].reshape(-1, 20)
+        for org_picks in picks:
+            assert len(set(org_picks.tolist())) == 20
+        assert (chunk["packaging_material_weight"] >= 1).all()
+
+
+@pytest.mark.unit
+def test_every_combination_can_be_used_once():
+    total = len(valid_combinations())
+
+    (chunk,) = generate_pom_columns(["100000"], rows_per_org=total, seed=0)
+
+    assert sorted(chunk["combo"].tolist()) == list(range(total))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("rows_per_org", [0, -1, len(valid_combinations()) + 1])
+def test_rows_per_org_out_of_range_raises(rows_per_org):
+    with pytest.raises(ValueError, match="rows_per_org"):
+        next(generate_pom_columns(ORG_IDS, rows_per_org=rows_per_org))
+
+
+@pytest.mark.unit
+def test_output_matches_template_factory(tmp_path):
+    out = tmp_path / "pom.csv"
+    write_pom_dataset(out, ORG_IDS, rows_per_org=4, seed=9)
+
+    rows = []
+    for chunk in generate_pom_columns(ORG_IDS, rows_per_org=4, seed=9):
+        del chunk["combo"]
+        names = list(chunk)
+        for values in zip(*(chunk[n] for n in names)):
+            rows.append({n: v for n, v in zip(names, values)})
+    expected = create_csv_from_template(POM_TEMPLATE, tmp_path / "expected.csv", rows)
+
+    assert out.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.unit
+def test_generated_columns_have_one_entry_per_row():
+    (chunk,) = generate_pom_columns(ORG_IDS, rows_per_org=3, seed=0)
+
+    lengths = {name: len(values) for name, values in chunk.items()}
+    assert set(lengths.values()) == {len(ORG_IDS) * 3}
+    assert chunk["packaging_material_weight"].dtype == np.int64
+
+
+@pytest.mark.unit
+def test_other_material_rows_name_a_subtype(tmp_path):
+    out = tmp_path / "pom.csv"
+    total = len(valid_combinations())
+    write_pom_dataset(out, ["100000"], rows_per_org=total, seed=0)
+
+    with out.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    other = [r for r in rows if r["packaging_material"] == OTHER_MATERIAL]
+    assert other
+    assert {r["packaging_material_subtype"] for r in other} == set(
+        OTHER_MATERIAL_SUBTYPES
+    )
+    assert all(
+        r["packaging_material_subtype"] == ""
+        for r in rows
+        if r["packaging_material"] != OTHER_MATERIAL
+    )
+
+
+@pytest.mark.unit
+def test_failed_write_keeps_the_previous_file(tmp_path):
+    out = tmp_path / "pom.csv"
+    out.write_text("previous\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="rows_per_org"):
+        write_pom_dataset(out, ORG_IDS, rows_per_org=0)
+
+    assert out.read_text(encoding="utf-8") == "previous\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["pom.csv"]
@@ -0,0 +1,193 @@
+import csv
+
+import pytest
+
+from eprda.utils.pom_generator import sequential_org_ids, write_pom_dataset
+from eprda.utils.pom_validator import (
+    REQUIRED_COLUMNS,
+    PomValidationError,
+    ensure_valid_pom_file,
+    validate_pom_file,
+)
+
+VALID_ROW = {
+    "organisation_id": "100001",
+    "subsidiary_id": "",
+    "organisation_size": "L",
+    "submission_period": "2025-H1",
+    "packaging_activity": "SO",
+    "packaging_type": "HH",
+    "packaging_class": "P1",
+    "packaging_material": "PL",
+    "packaging_material_subtype": "",
+    "from_country": "",
+    "to_country": "",
+    "packaging_material_weight": "250",
+}
+
+
+def _write_pom(path, rows, columns=REQUIRED_COLUMNS):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+@pytest.mark.unit
+def test_generated_file_is_valid(tmp_path):
+    out = tmp_path / "pom.csv"
+    write_pom_dataset(out, sequential_org_ids(30), rows_per_org=40, seed=11)
+
+    assert validate_pom_file(out) == ([], 0)
+
+
+@pytest.mark.unit
+def test_hand_written_row_is_valid(tmp_path):
+    path = _write_pom(tmp_path / "pom.csv", [VALID_ROW])
+
+    assert validate_pom_file(path) == ([], 0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "overrides, column",
+    [
+        ({"organisation_id": "ABC123"}, "organisation_id"),
+        ({"organisation_size": "M"}, "organisation_size"),
+        ({"submission_period": "2025-H3"}, "submission_period"),
+        ({"packaging_type": "XX"}, "packaging_type"),
+        ({"packaging_class": "O1"}, "packaging_class"),
+        ({"packaging_material": "ZZ"}, "packaging_material"),
+        ({"packaging_material": "OT"}, "packaging_material_subtype"),
+        ({"packaging_activity": ""}, "packaging_activity"),
+        (
+            {"packaging_type": "PB", "packaging_class": "B1"},
+            "packaging_activity",
+        ),
+        (
+            {
+                "packaging_activity": "",
+                "packaging_type": "CW",
+                "packaging_class": "O1",
+            },
+            "from_country",
+        ),
+        ({"from_country": "EN"}, "from_country"),
+        ({"to_country": "FR"}, "to_country"),
+        ({"packaging_material_weight": "heavy"}, "packaging_material_weight"),
+        ({"packaging_material_weight": "12.5"}, "packaging_material_weight"),
+        ({"packaging_material_weight": "0"}, "packaging_material_weight"),
+        ({"packaging_material_weight": "100000000"}, "packaging_material_weight"),
+    ],
+)
+def test_rule_flags_bad_value(tmp_path, overrides, column):
+    # a different organisation, so the row is not also a duplicate of the first
+    bad = {**VALID_ROW, "organisation_id": "100002", **overrides}
+    path = _write_pom(tmp_path / "pom.csv", [VALID_ROW, bad])
+
+    errors, total = validate_pom_file(path)
+
+    assert total == 1
+    assert (errors[0].row, errors[0].column) == (3, column)
+
+
+@pytest.mark.unit
+def test_other_material_with_subtype_is_valid(tmp_path):
+    row = {
+        **VALID_ROW,
+        "packaging_material": "OT",
+        "packaging_material_subtype": "Cork",
+    }
+    path = _write_pom(tmp_path / "pom.csv", [row])
+
+    assert validate_pom_file(path) == ([], 0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("chunksize", [1, 2, 500_000])
+def test_duplicates_are_flagged_across_chunks(tmp_path, chunksize):
+    other = {**VALID_ROW, "packaging_material": "GL"}
+    path = _write_pom(tmp_path / "pom.csv", [VALID_ROW, other, VALID_ROW])
+
+    errors, total = validate_pom_file(path, chunksize=chunksize)
+
+    assert total == 1
+    assert (errors[0].row, errors[0].column) == (4, "row")
+
+
+@pytest.mark.unit
+def test_missing_column_is_reported_against_the_header(tmp_path):
+    columns = [c for c in REQUIRED_COLUMNS if c != "to_country"]
+    path = _write_pom(tmp_path / "pom.csv", [VALID_ROW], columns=columns)
+
+    errors, total = validate_pom_file(path)
+
+    assert total == 1
+    assert (errors[0].row, errors[0].column) == (1, "header")
+    assert "to_country" in errors[0].message
+
+
+@pytest.mark.unit
+def test_errors_are_capped_but_counted(tmp_path):
+    bad = {**VALID_ROW, "organisation_size": "M"}
+    rows = [{**bad, "organisation_id": str(100000 + i)} for i in range(10)]
+    path = _write_pom(tmp_path / "pom.csv", rows)
+
+    errors, total = validate_pom_file(path, max_errors=3)
+
+    assert total == 10
+    assert [e.row for e in errors] == [2, 3, 4]
+
+
+@pytest.mark.unit
+def test_small_producer_is_valid(tmp_path):
+    path = _write_pom(tmp_path / "pom.csv", [{**VALID_ROW, "organisation_size": "S"}])
+
+    assert validate_pom_file(path) == ([], 0)
+
+
+@pytest.mark.unit
+def test_capped_errors_are_the_lowest_lines(tmp_path):
+    # an early rule fails the last rows, a later rule the first ones
+    rows = [{**VALID_ROW, "organisation_id": str(100000 + i)} for i in range(4)]
+    rows[0]["to_country"] = rows[1]["to_country"] = "FR"
+    rows[2]["organisation_id"] = rows[3]["organisation_id"] = "ABC"
+    rows[3]["subsidiary_id"] = "1"
+    path = _write_pom(tmp_path / "pom.csv", rows)
+
+    errors, total = validate_pom_file(path, max_errors=2)
+
+    assert total == 4
+    assert [(e.row, e.column) for e in errors] == [
+        (2, "to_country"),
+        (3, "to_country"),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("chunksize", [1, 500_000])
+def test_line_numbers_count_blank_lines(tmp_path, chunksize):
+    path = _write_pom(tmp_path / "pom.csv", [VALID_ROW])
+    bad = {**VALID_ROW, "to_country": "FR"}
+    with path.open("a", newline="", encoding="utf-8") as f:
+        f.write("\n\n")
+        csv.DictWriter(f, fieldnames=REQUIRED_COLUMNS).writerows([bad])
+        f.write("\n")
+        csv.DictWriter(f, fieldnames=REQUIRED_COLUMNS).writerows([VALID_ROW])
+
+    errors, total = validate_pom_file(path, chunksize=chunksize)
+
+    assert total == 2
+    assert [(e.row, e.column) for e in errors] == [(5, "to_country"), (7, "row")]
+
+
+@pytest.mark.unit
+def test_ensure_valid_raises_with_row_numbers(tmp_path):
+    bad = {**VALID_ROW, "to_country": "FR"}
+    path = _write_pom(tmp_path / "pom.csv", [VALID_ROW, bad])
+
+    with pytest.raises(PomValidationError, match="line 3: to_country") as info:
+        ensure_valid_pom_file(path)
+
+    assert info.value.total == 1
@@ -0,0 +1,58 @@
+import pytest
+
+from eprda.ui.routing import RouteRules, RouteStats
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "url, routed",
+    [
+        ("https://www.google-analytics.com/g/collect?v=2", True),
+        ("https://googletagmanager.com/gtm.js", True),
+        ("https://notgoogle-analytics.com/collect", False),
+        ("https://portal.test/assets/images/logo.PNG?v=3", True),
+        ("https://portal.test/assets/fonts/bold.woff2", True),
+        ("https://portal.test/assets/app.css", False),
+        ("https://portal.test/assets/app.js", False),
+        ("https://portal.test/report/upload", False),
+        ("https://portal.test/track/beacon?id=1", True),
+    ],
+)
+def test_route_pattern_selects_blockable_urls(url, routed):
+    rules = RouteRules(block_patterns=("*/beacon*",))
+
+    assert bool(rules.route_pattern().search(url)) is routed
+
+
+@pytest.mark.unit
+def test_route_pattern_covers_blocked_script_types():
+    rules = RouteRules(block_resource_types=frozenset({"script"}))
+
+    assert rules.route_pattern().search("https://portal.test/app.mjs?x=1")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "rules",
+    [
+        RouteRules(enabled=False),
+        RouteRules(block_resource_types=frozenset(), block_domains=frozenset()),
+    ],
+)
+def test_nothing_to_block_installs_no_route(rules):
+    assert rules.route_pattern() is None
+
+
+@pytest.mark.unit
+def test_allowlist_wins_over_block_lists():
+    rules = RouteRules(allow_domains=frozenset({"cdn.portal.test"}))
+
+    assert rules.block_reason("https://cdn.portal.test/logo.png", "image") is None
+    assert rules.block_reason("https://portal.test/logo.png", "image") == "type:image"
+
+
+@pytest.mark.unit
+def test_summary_labels_the_saving_as_an_estimate():
+    stats = RouteStats(requests=4, blocked=2, est_bytes_saved=2_500_000)
+
+    assert "est. ~2.5 MB saved" in stats.summary()
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from eprda.tracing import SpanStats, stats, step
+
+
+@pytest.fixture(autouse=True)
+def clear_stats():
+    stats.clear()
+    yield
+    stats.clear()
+
+
+def _row(name):
+    return next(r for r in stats.rows() if r["step"] == name)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_nested_spans_count_once_in_self_time():
+    async with step("stage"):
+        await asyncio.sleep(0.05)
+        async with step("page.action"):
+            await asyncio.sleep(0.1)
+
+    stage, action = _row("stage"), _row("page.action")
+    assert stage["total_s"] >= 0.15
+    assert 0.04 <= stage["self_s"] < 0.1
+    assert action["self_s"] == action["total_s"] >= 0.1
+    assert stage["self_s"] + action["self_s"] == pytest.approx(
+        stage["total_s"], abs=0.01
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_overlapping_children_never_make_self_time_negative():
+    async def child():
+        async with step("child"):
+            await asyncio.sleep(0.05)
+
+    async with step("parent"):
+        await asyncio.gather(child(), child(), child())
+
+    assert _row("parent")["self_s"] == 0.0
+    assert _row("child")["count"] == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rows_are_ordered_by_self_time():
+    async with step("outer"):
+        async with step("inner"):
+            await asyncio.sleep(0.05)
+
+    assert [r["step"] for r in stats.rows()] == ["inner", "outer"]
+    assert "self" in stats.table().splitlines()[1]
+
+
+@pytest.mark.unit
+def test_empty_stats_table():
+    assert SpanStats().table() == "⏱️  No steps recorded"